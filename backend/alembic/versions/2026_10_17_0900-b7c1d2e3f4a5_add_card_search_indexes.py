@@ -0,0 +1,50 @@
+"""add trigram and full-text search indexes for cards
+
+Revision ID: b7c1d2e3f4a5
+Revises: f92044a75bae
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1d2e3f4a5'
+down_revision: Union[str, None] = 'f92044a75bae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('cards', sa.Column(
+        'text_search',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', coalesce(text, ''))", persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_cards_text_search', 'cards', ['text_search'],
+                    unique=False, postgresql_using='gin')
+
+    op.create_index('ix_cards_name_trgm', 'cards', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_cards_category_trgm', 'cards', ['category'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'category': 'gin_trgm_ops'})
+    op.create_index('ix_leaders_name_trgm', 'leaders', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_leaders_category_trgm', 'leaders', ['category'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'category': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leaders_category_trgm', table_name='leaders')
+    op.drop_index('ix_leaders_name_trgm', table_name='leaders')
+    op.drop_index('ix_cards_category_trgm', table_name='cards')
+    op.drop_index('ix_cards_name_trgm', table_name='cards')
+    op.drop_index('ix_cards_text_search', table_name='cards')
+    op.drop_column('cards', 'text_search')
+    # pg_trgm is left installed; other objects may depend on it
@@ -0,0 +1,54 @@
+"""add color_mask bitmask columns to cards and leaders
+
+Revision ID: c2d3e4f5a6b7
+Revises: b7c1d2e3f4a5
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d3e4f5a6b7'
+down_revision: Union[str, None] = 'b7c1d2e3f4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.services.colors.COLOR_BITS
+COLOR_BITS = {
+    "Red": 1,
+    "Green": 2,
+    "Blue": 4,
+    "Purple": 8,
+    "Black": 16,
+    "Yellow": 32,
+}
+
+
+def upgrade() -> None:
+    op.add_column('cards', sa.Column('color_mask', sa.SmallInteger(),
+                                     server_default='0', nullable=False))
+    op.add_column('leaders', sa.Column('color_mask', sa.SmallInteger(),
+                                       server_default='0', nullable=False))
+
+    # Backfill from the existing free-form color columns. Card colors are
+    # space- or comma-separated tokens; leader colors are already an array.
+    card_terms = " | ".join(
+        f"(CASE WHEN '{color}' = ANY(regexp_split_to_array(color, '[ ,]+')) "
+        f"THEN {bit} ELSE 0 END)"
+        for color, bit in COLOR_BITS.items()
+    )
+    leader_terms = " | ".join(
+        f"(CASE WHEN '{color}' = ANY(colors) THEN {bit} ELSE 0 END)"
+        for color, bit in COLOR_BITS.items()
+    )
+    op.execute(f"UPDATE cards SET color_mask = {card_terms} WHERE color IS NOT NULL")
+    op.execute(f"UPDATE leaders SET color_mask = {leader_terms} WHERE colors IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('leaders', 'color_mask')
+    op.drop_column('cards', 'color_mask')
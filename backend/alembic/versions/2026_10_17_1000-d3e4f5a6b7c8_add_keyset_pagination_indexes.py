@@ -0,0 +1,31 @@
+"""add composite indexes for keyset pagination
+
+Revision ID: d3e4f5a6b7c8
+Revises: c2d3e4f5a6b7
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3e4f5a6b7c8'
+down_revision: Union[str, None] = 'c2d3e4f5a6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # cards/leaders page on their primary key, which is already indexed
+    op.create_index('ix_decks_created_at_id', 'decks', ['created_at', 'id'], unique=False)
+    op.create_index('ix_conversations_updated_at_id', 'conversations',
+                    ['updated_at', 'id'], unique=False)
+    op.create_index('ix_messages_conversation_created_at_id', 'messages',
+                    ['conversation_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_conversation_created_at_id', table_name='messages')
+    op.drop_index('ix_conversations_updated_at_id', table_name='conversations')
+    op.drop_index('ix_decks_created_at_id', table_name='decks')
@@ -0,0 +1,29 @@
+"""add content_hash to cards and leaders for diff sync
+
+Revision ID: f5a6b7c8d9e0
+Revises: e4f5a6b7c8d9
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a6b7c8d9e0'
+down_revision: Union[str, None] = 'e4f5a6b7c8d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows start with NULL and are rewritten once by the next sync
+    op.add_column('cards', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('leaders', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('leaders', 'content_hash')
+    op.drop_column('cards', 'content_hash')
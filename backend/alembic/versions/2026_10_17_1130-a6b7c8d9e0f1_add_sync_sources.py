@@ -0,0 +1,32 @@
+"""add sync_sources table for conditional upstream fetches
+
+Revision ID: a6b7c8d9e0f1
+Revises: f5a6b7c8d9e0
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6b7c8d9e0f1'
+down_revision: Union[str, None] = 'f5a6b7c8d9e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('sync_sources',
+    sa.Column('url', sa.String(length=255), nullable=False),
+    sa.Column('etag', sa.String(length=255), nullable=True),
+    sa.Column('last_modified', sa.String(length=64), nullable=True),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('url')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sync_sources')
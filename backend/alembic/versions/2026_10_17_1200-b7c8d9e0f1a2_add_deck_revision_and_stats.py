@@ -0,0 +1,30 @@
+"""add revision and running stats to decks
+
+Revision ID: b7c8d9e0f1a2
+Revises: a6b7c8d9e0f1
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c8d9e0f1a2'
+down_revision: Union[str, None] = 'a6b7c8d9e0f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('decks', sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+    # Existing decks start with NULL stats, rebuilt on their next mutation
+    op.add_column('decks', sa.Column('stats', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('decks', 'stats')
+    op.drop_column('decks', 'revision')
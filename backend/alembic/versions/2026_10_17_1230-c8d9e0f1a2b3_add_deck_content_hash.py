@@ -0,0 +1,62 @@
+"""add content_hash to decks for canonical deck identity
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d9e0f1a2b3'
+down_revision: Union[str, None] = 'b7c8d9e0f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('decks', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # Backfill with the same canonical text as app.services.deck_code:
+    # "leader|card*qty,card*qty" with quantities summed and IDs in byte order
+    op.execute("""
+        UPDATE decks AS d
+        SET content_hash = encode(sha256(convert_to(
+            coalesce(d.leader_id, '') || '|' || coalesce((
+                SELECT string_agg(card_id || '*' || qty, ',' ORDER BY card_id COLLATE "C")
+                FROM (
+                    SELECT card_id, sum(quantity) AS qty
+                    FROM deck_cards
+                    WHERE deck_id = d.id
+                    GROUP BY card_id
+                ) AS lines
+                WHERE qty > 0
+            ), ''),
+            'UTF8')), 'hex')
+    """)
+    # Existing public duplicates keep only the oldest hash; the others are
+    # rehashed (and rejected if still identical) on their next save
+    op.execute("""
+        UPDATE decks AS d
+        SET content_hash = NULL
+        FROM decks AS older
+        WHERE d.is_public AND older.is_public
+          AND d.content_hash = older.content_hash
+          AND (older.created_at, older.id) < (d.created_at, d.id)
+    """)
+
+    op.create_index('ix_decks_content_hash', 'decks', ['content_hash'], unique=False)
+    op.create_index(
+        'uq_decks_public_content_hash', 'decks', ['content_hash'],
+        unique=True, postgresql_where=sa.text('is_public'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_decks_public_content_hash', table_name='decks')
+    op.drop_index('ix_decks_content_hash', table_name='decks')
+    op.drop_column('decks', 'content_hash')
@@ -20,7 +20,15 @@ HISTORY_WINDOW = 20  # messages kept in the loop
 
 # Main agent tools — search and manage_deck are instant (no LLM sub-agents),
 # analyze_strategy invokes a strategy agent for complex deck building.
-MAIN_AGENT_TOOLS = ["search_cards", "manage_deck", "analyze_strategy", "search_knowledge", "response"]
+MAIN_AGENT_TOOLS = [
+    "search_cards",
+    "manage_deck",
+    "analyze_strategy",
+    "search_knowledge",
+    "simulate_draws",
+    "analyze_consistency",
+    "response",
+]
 
 
 class OPTCGAgent:
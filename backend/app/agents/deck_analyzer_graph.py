@@ -1,6 +1,12 @@
 from typing import TypedDict, List, Dict, Any
 from langgraph.graph import StateGraph, END
+from app.config import settings
 from app.services.ai_provider import AIProviderFactory, AIProvider
+from app.services.card_catalog import get_catalog
+from app.services.cooccurrence import get_cooccurrence
+from app.services.draw_simulator import DeckEncoding
+from app.services.goldfish import describe_goldfish, simulate_goldfish_parallel
+from app.services.legal_pools import get_legal_pool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -75,50 +81,28 @@ async def synergy_analyzer_node(state: DeckAnalysisState):
 
 
 async def cost_analyzer_node(state: DeckAnalysisState):
-    """Analyze DON!! cost curve"""
+    """Measure how well the cost curve uses DON!! by goldfishing the deck"""
     logger.info("Running cost analyzer node")
 
     deck_data = state["deck_data"]
-    llm = state["llm"]
+    deck_cards = deck_data.get("deck_cards", [])
 
     # Calculate cost curve
     cost_curve = {}
-    for deck_card in deck_data.get("deck_cards", []):
+    for deck_card in deck_cards:
         card = deck_card["card"]
         cost = card.get("cost", 0)
         quantity = deck_card.get("quantity", 0)
         cost_curve[cost] = cost_curve.get(cost, 0) + quantity
 
-    prompt = f"""
-    Analyze this One Piece TCG deck's DON!! cost curve:
-
-    Cost Curve: {cost_curve}
-    Total Cards: {deck_data.get('total_cards', 0)}
-    Average Cost: {deck_data.get('avg_cost', 0)}
-
-    Consider DON!! progression:
-    - Turn 1: 1 DON available
-    - Turn 2: 3 DON available (2 new + 1 from turn 1)
-    - Turn 3: 5 DON available
-    - Turn 4: 7 DON available
-    - Turn 5: 9 DON available
-
-    Guidelines:
-    - Early game (1-3 cost): Should have ~40% of cards
-    - Mid game (4-6 cost): Should have ~40% of cards
-    - Late game (7+ cost): Should have ~20% of cards
-
-    Provide insights on:
-    1. Whether the curve is balanced
-    2. Potential dead turns (not enough cards to play)
-    3. Recommendations for improvement
-    """
-
     try:
-        response = await llm.ainvoke(prompt)
+        goldfish = await simulate_goldfish_parallel(
+            DeckEncoding.from_deck_cards(deck_cards), games=settings.goldfish_games
+        )
         state["cost_analysis"] = {
             "curve": cost_curve,
-            "analysis": response.content,
+            "goldfish": goldfish,
+            "analysis": describe_goldfish(goldfish, cost_curve),
         }
     except Exception as e:
         logger.error(f"Error in cost analysis: {e}")
@@ -135,17 +119,41 @@ async def recommendation_node(state: DeckAnalysisState):
     llm = state["llm"]
     synergies = state.get("card_synergies", [])
     cost_analysis = state.get("cost_analysis", {})
+    try:
+        played_with = _played_with(deck_data)
+    except Exception as e:
+        logger.error(f"Error scoring co-occurring cards: {e}")
+        played_with = []
+
+    if played_with:
+        lines = [
+            f"- {rec['name']} ({rec['card_id']}), cost {rec['cost']}: in "
+            f"{rec['play_rate']:.0%} of decks, score {rec['score']}"
+            for rec in played_with
+        ]
+        scope = "this leader's" if played_with[0]["leader_id"] else "all stored"
+        add_section = (
+            f"Cards most often played with this deck's cards in {scope} decks "
+            f"({played_with[0]['deck_count']} decks; score is play rate lifted by PMI):\n"
+            + "\n".join(lines)
+        )
+        add_task = "Top 5 cards to ADD, chosen from the co-occurrence list above (with reasoning)"
+    else:
+        add_section = "No stored decks to compare against yet."
+        add_task = "Top 5 cards to ADD (with reasoning)"
 
     prompt = f"""
     Based on the deck analysis, provide specific card recommendations:
 
-    Leader: {deck_data.get('leader', {}).get('name')}
+    Leader: {(deck_data.get('leader') or {}).get('name')}
     Colors: {deck_data.get('color_distribution', {})}
     Identified Synergies: {synergies}
     Cost Analysis: {cost_analysis.get('analysis', '')}
 
+    {add_section}
+
     Provide:
-    1. Top 5 cards to ADD (with reasoning)
+    1. {add_task}
     2. Top 5 cards to REMOVE (with reasoning)
     3. General strategy tips
 
@@ -166,10 +174,29 @@ async def recommendation_node(state: DeckAnalysisState):
     except Exception as e:
         logger.error(f"Error generating recommendations: {e}")
         state["recommendations"] = []
+    if played_with:
+        state["recommendations"].insert(0, {"type": "played_with", "cards": played_with})
 
     return state
 
 
+def _played_with(deck_data: dict, k: int = 10) -> list[dict]:
+    """Cards stored decks most often run alongside this deck's cards"""
+    index = get_cooccurrence()
+    if index is None:
+        return []
+    leader_id = (deck_data.get("leader") or {}).get("id")
+    card_ids = [dc["card"]["id"] for dc in deck_data.get("deck_cards", [])]
+    catalog = get_catalog()
+    allowed = get_legal_pool(catalog, leader_id) if catalog and leader_id else None
+    recs = index.recommend(card_ids, leader_id=leader_id, k=k, allowed=allowed)
+    for rec in recs:
+        card = (catalog.get_card(rec["card_id"]) if catalog else None) or {}
+        rec["name"] = card.get("name", rec["card_id"])
+        rec["cost"] = card.get("cost")
+    return recs
+
+
 async def synthesizer_node(state: DeckAnalysisState):
     """Synthesize final report"""
     logger.info("Running synthesizer node")
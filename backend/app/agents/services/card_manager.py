@@ -8,6 +8,7 @@ from dataclasses import dataclass, field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.services.search_service import SearchService
+from app.services.colors import color_mask, is_color_legal
 
 logger = logging.getLogger(__name__)
 
@@ -99,16 +100,15 @@ class CardManager:
 
         # Validate color identity
         if leader_colors:
-            leader_color_set = {c.strip() for c in leader_colors}
+            leader_mask = color_mask(leader_colors)
             violations = []
             for cid, card in found_cards.items():
-                if card.get("color"):
-                    card_colors = {c.strip() for c in card["color"].split(",")}
-                    if not card_colors.issubset(leader_color_set):
-                        violations.append(
-                            f"{card['name']} ({card['id']}) is {card['color']} — "
-                            f"not in leader colors {leader_colors}"
-                        )
+                if not is_color_legal(color_mask(card.get("color")), leader_mask):
+                    violations.append(
+                        f"{card['name']} ({card['id']}) is "
+                        f"{card.get('color') or 'colorless'} — "
+                        f"not in leader colors {leader_colors}"
+                    )
             if violations:
                 return DeckModificationResult(
                     errors=[
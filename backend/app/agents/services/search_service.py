@@ -1,4 +1,8 @@
-"""SearchService — pure DB queries for cards and leaders (no LLM)."""
+"""SearchService — card and leader lookups (no LLM).
+
+Served from the in-memory CardCatalog when it is loaded; the DB is the fallback,
+and also serves effect-text searches (full-text, via the tsvector index).
+"""
 
 from __future__ import annotations
 
@@ -6,13 +10,22 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Card, Leader
+from app.services.card_catalog import (
+    CardCatalog,
+    card_to_dict as _card_to_dict,
+    get_catalog,
+    leader_to_dict as _leader_to_dict,
+)
+from app.services.colors import ALL_COLORS, color_bit
+from app.services.legal_pools import get_legal_pool
 
 
 class SearchService:
     """Search the OPTCG card database. Returns structured dicts, not formatted text."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, catalog: CardCatalog | None = None):
         self.db = db
+        self.catalog = catalog or get_catalog()
 
     async def search_cards(
         self,
@@ -26,15 +39,58 @@ class SearchService:
         power_min: int | None = None,
         set_code: str | None = None,
         text_contains: str | None = None,
+        leader_id: str | None = None,
         limit: int = 15,
     ) -> list[dict]:
-        """Search the Card table with filters. Returns list of card dicts."""
+        """Search the Card table with filters. Returns list of card dicts.
+
+        With ``leader_id`` only cards legal for that leader are returned.
+        """
+        limit = min(limit, 25)
+        # Effect-text search is stemmed, ranked full-text search, which only
+        # the database index provides; the catalog would answer a different
+        # (substring) question, so those searches always go to the DB
+        if self.catalog is not None and not text_contains:
+            within = None
+            if leader_id:
+                pool = get_legal_pool(self.catalog, leader_id)
+                if pool is None:
+                    return []
+                within = pool.rows
+            return self.catalog.search_cards(
+                name=name,
+                color=color,
+                cost_min=cost_min,
+                cost_max=cost_max,
+                card_type=card_type,
+                category=category,
+                power_min=power_min,
+                set_code=set_code,
+                within=within,
+                limit=limit,
+            )
+
         query = select(Card)
 
+        if leader_id:
+            leader = await self.db.get(Leader, leader_id)
+            if leader is None:
+                return []
+            query = query.where(
+                Card.color_mask != 0,
+                Card.color_mask.op("&")(ALL_COLORS & ~leader.color_mask) == 0,
+            )
+
         if name:
-            query = query.where(func.lower(Card.name).contains(name.lower()))
+            query = query.where(Card.name.ilike(_like_pattern(name), escape="\\"))
         if color:
-            query = query.where(Card.color.ilike(f"%{color}%"))
+            bit = color_bit(color)
+            if bit is not None:
+                query = query.where(Card.color_mask.op("&")(bit) != 0)
+            else:
+                query = query.where(
+                    Card.color.ilike(_like_pattern(color), escape="\\")
+                )
         if cost_min is not None:
             query = query.where(Card.cost >= cost_min)
         if cost_max is not None:
@@ -42,15 +98,21 @@ class SearchService:
         if card_type:
             query = query.where(func.lower(Card.type) == card_type.lower())
         if category:
-            query = query.where(Card.category.ilike(f"%{category}%"))
+            query = query.where(
+                Card.category.ilike(_like_pattern(category), escape="\\")
+            )
         if power_min is not None:
             query = query.where(Card.power >= power_min)
         if set_code:
             query = query.where(Card.set_code == set_code)
         if text_contains:
-            query = query.where(Card.text.ilike(f"%{text_contains}%"))
+            # Full-text match on the GIN-indexed tsvector, best matches first
+            ts_query = func.websearch_to_tsquery("english", text_contains)
+            query = query.where(Card.text_search.op("@@")(ts_query)).order_by(
+                func.ts_rank(Card.text_search, ts_query).desc()
+            )
 
-        query = query.limit(min(limit, 25))
+        query = query.order_by(Card.id).limit(limit)
 
         result = await self.db.execute(query)
         return [_card_to_dict(c) for c in result.scalars().all()]
@@ -66,77 +128,73 @@ class SearchService:
         limit: int = 15,
     ) -> list[dict]:
         """Search the Leader table with filters. Returns list of leader dicts."""
+        limit = min(limit, 25)
+        if self.catalog is not None:
+            return self.catalog.search_leaders(
+                name=name,
+                color=color,
+                category=category,
+                set_code=set_code,
+                power_min=power_min,
+                limit=limit,
+            )
+
         query = select(Leader)
 
         if name:
-            query = query.where(func.lower(Leader.name).contains(name.lower()))
+            query = query.where(Leader.name.ilike(_like_pattern(name), escape="\\"))
         if color:
-            query = query.where(Leader.colors.any(color))
+            bit = color_bit(color)
+            if bit is not None:
+                query = query.where(Leader.color_mask.op("&")(bit) != 0)
+            else:
+                query = query.where(Leader.colors.any(color))
         if category:
-            query = query.where(Leader.category.ilike(f"%{category}%"))
+            query = query.where(
+                Leader.category.ilike(_like_pattern(category), escape="\\")
+            )
         if set_code:
             query = query.where(Leader.set_code == set_code)
         if power_min is not None:
             query = query.where(Leader.power >= power_min)
 
-        query = query.limit(min(limit, 25))
+        query = query.order_by(Leader.id).limit(limit)
 
         result = await self.db.execute(query)
         return [_leader_to_dict(l) for l in result.scalars().all()]
 
     async def get_card_by_id(self, card_id: str) -> dict | None:
         """Fetch a single card by ID."""
+        if self.catalog is not None:
+            return self.catalog.get_card(card_id)
         result = await self.db.execute(select(Card).where(Card.id == card_id))
         card = result.scalar_one_or_none()
         return _card_to_dict(card) if card else None
 
     async def get_leader_by_id(self, leader_id: str) -> dict | None:
         """Fetch a single leader by ID."""
+        if self.catalog is not None:
+            return self.catalog.get_leader(leader_id)
         result = await self.db.execute(select(Leader).where(Leader.id == leader_id))
         leader = result.scalar_one_or_none()
         return _leader_to_dict(leader) if leader else None
 
     async def get_cards_by_ids(self, card_ids: list[str]) -> dict[str, dict]:
         """Fetch multiple cards by ID. Returns {card_id: card_dict}."""
+        if self.catalog is not None:
+            return self.catalog.get_cards(card_ids)
         result = await self.db.execute(select(Card).where(Card.id.in_(card_ids)))
         return {c.id: _card_to_dict(c) for c in result.scalars().all()}
 
 
-# ── Serializers ──
-
-
-def _card_to_dict(card: Card) -> dict:
-    return {
-        "id": card.id,
-        "name": card.name,
-        "type": card.type,
-        "color": card.color,
-        "cost": card.cost,
-        "power": card.power,
-        "counter": card.counter,
-        "attribute": card.attribute,
-        "text": card.text,
-        "trigger": card.trigger,
-        "rarity": card.rarity,
-        "category": card.category,
-        "set_code": card.set_code,
-        "image_url": card.image_url,
-    }
-
-
-def _leader_to_dict(leader: Leader) -> dict:
-    return {
-        "id": leader.id,
-        "name": leader.name,
-        "life": leader.life,
-        "power": leader.power,
-        "colors": leader.colors or [],
-        "attribute": leader.attribute,
-        "text": leader.text,
-        "category": leader.category,
-        "set_code": leader.set_code,
-        "image_url": leader.image_url,
-    }
+def _like_pattern(value: str) -> str:
+    """Build a '%value%' pattern with LIKE wildcards in the input escaped.
+
+    Unanchored ILIKE patterns are served by the pg_trgm GIN indexes on
+    name/category.
+    """
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
 
 
 def format_card_results(results: list[dict], result_type: str = "card") -> str:
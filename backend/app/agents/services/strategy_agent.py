@@ -11,6 +11,9 @@ from typing import Any
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
 
 from app.agents.services.search_service import SearchService
+from app.services.deck_optimizer import DeckObjective, optimize_deck
+from app.services.legal_pools import get_legal_pool
+from app.services.synergy_graph import get_synergy_graph
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +52,10 @@ _STRATEGY_TOOLS = [
                     "category": {"type": "string", "description": "Card category/trait."},
                     "power_min": {"type": "integer", "description": "Minimum power."},
                     "text_contains": {"type": "string", "description": "Search card effect text."},
+                    "legal_only": {
+                        "type": "boolean",
+                        "description": "Only cards legal for the current leader (default true when a leader is set).",
+                    },
                     "limit": {"type": "integer", "description": "Max results (default 15)."},
                 },
                 "required": [],
@@ -71,6 +78,48 @@ _STRATEGY_TOOLS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "optimize_deck",
+            "description": (
+                "Fill the deck's open slots with a legal set of cards in one step. "
+                "Keeps the current cards and picks the rest from the leader's colors "
+                "(max 4 copies, exactly 50 cards), scoring synergy, trait focus, "
+                "counter density and the cost curve. Returns card IDs and quantities "
+                "ready for submit_plan."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "leader_id": {
+                        "type": "string",
+                        "description": "Leader to build for (defaults to the current leader).",
+                    },
+                    "curve": {
+                        "type": "string",
+                        "enum": ["aggro", "midrange", "control"],
+                        "description": "Cost curve shape (default midrange).",
+                    },
+                    "traits": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Traits to focus on (defaults to the leader's traits).",
+                    },
+                    "min_counters": {
+                        "type": "integer",
+                        "description": "Minimum cards with a counter value (default 20).",
+                    },
+                    "exclude": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Card IDs never to add.",
+                    },
+                },
+                "required": [],
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
@@ -179,7 +228,7 @@ class StrategyAgent:
                 if tool_name == "submit_plan":
                     return self._parse_plan(tool_args, deck_state)
 
-                result_text = await self._execute_tool(tool_name, tool_args)
+                result_text = await self._execute_tool(tool_name, tool_args, deck_state)
 
                 # Add to messages for next iteration
                 call_id = f"strategy_{iteration}"
@@ -198,11 +247,14 @@ class StrategyAgent:
         logger.warning("Strategy agent hit max iterations")
         return StrategyPlan(reasoning="Strategy analysis reached iteration limit. Please try a more specific request.")
 
-    async def _execute_tool(self, name: str, args: dict) -> str:
-        """Execute a strategy agent tool (search_cards or search_leaders)."""
+    async def _execute_tool(self, name: str, args: dict, deck_state: dict | None = None) -> str:
+        """Execute a strategy agent tool (search_cards, search_leaders or optimize_deck)."""
         from app.agents.services.search_service import format_card_results
 
         if name == "search_cards":
+            leader_id = None
+            if args.get("legal_only", True):
+                leader_id = ((deck_state or {}).get("leader") or {}).get("id")
             results = await self.search.search_cards(
                 name=args.get("name"),
                 color=args.get("color"),
@@ -212,6 +264,7 @@ class StrategyAgent:
                 category=args.get("category"),
                 power_min=args.get("power_min"),
                 text_contains=args.get("text_contains"),
+                leader_id=leader_id,
                 limit=int(args.get("limit", 15)),
             )
             return format_card_results(results, "card")
@@ -224,8 +277,55 @@ class StrategyAgent:
             )
             return format_card_results(results, "leader")
 
+        elif name == "optimize_deck":
+            return self._optimize_deck(args, deck_state or {})
+
         return f"Unknown tool: {name}"
 
+    def _optimize_deck(self, args: dict, deck_state: dict) -> str:
+        """Run the deck optimizer on the current deck and format its plan."""
+        catalog = self.search.catalog
+        if catalog is None:
+            return "The card catalog is not loaded; use search_cards to pick cards instead."
+
+        leader_id = args.get("leader_id") or (deck_state.get("leader") or {}).get("id")
+        if not leader_id:
+            return "No leader set. Pass leader_id (search_leaders finds one)."
+
+        current = [
+            (c["id"], int(c.get("quantity", 1)))
+            for c in deck_state.get("cards", [])
+            if c.get("id")
+        ]
+        try:
+            result = optimize_deck(
+                catalog,
+                leader_id,
+                current,
+                DeckObjective.from_spec(args),
+                get_synergy_graph(),
+            )
+        except ValueError as e:
+            return f"Optimizer error: {e}"
+
+        if not result["slots"]:
+            return "The deck already has 50 cards; nothing to add."
+
+        lines = [
+            f"Optimized fill for {result['slots']} open slots "
+            f"({result['total_cards']}/50 cards, {result['counter_cards']} with counters):"
+        ]
+        for card in result["cards_to_add"]:
+            lines.append(
+                f"- {card['quantity']}x {card['name']} ({card['card_id']}) — {card['reason']}"
+            )
+        curve = ", ".join(f"{cost}: {n}" for cost, n in result["curve"].items())
+        lines.append(f"\nCost curve: {curve}")
+        if result["errors"]:
+            lines.append("\nDeck is not legal yet:")
+            lines.extend(f"- {error['message']}" for error in result["errors"])
+        return "\n".join(lines)
+
     def _parse_plan(self, args: dict, deck_state: dict | None) -> StrategyPlan:
         """Parse the submit_plan tool call args into a StrategyPlan."""
         cards_to_add = []
@@ -268,6 +368,18 @@ class StrategyAgent:
                     f"- Leader: {leader.get('name', '?')} ({leader.get('id', '?')}) — "
                     f"Colors: {', '.join(leader.get('colors', []))}"
                 )
+                pool = (
+                    get_legal_pool(self.search.catalog, leader["id"])
+                    if self.search.catalog is not None and leader.get("id")
+                    else None
+                )
+                if pool is not None:
+                    stats = pool.stats
+                    curve = ", ".join(f"{cost}: {n}" for cost, n in stats["by_cost"].items())
+                    parts.append(
+                        f"- Legal card pool: {stats['total']} cards "
+                        f"({stats['counter_cards']} with counters); by cost: {curve}"
+                    )
             else:
                 parts.append("- Leader: Not set")
 
@@ -5,6 +5,8 @@ from app.agents.tools.get_deck_info import GetDeckInfoTool
 from app.agents.tools.validate_deck import ValidateDeckTool
 from app.agents.tools.search_knowledge import SearchKnowledgeTool
 from app.agents.tools.calculate_stats import CalculateStatsTool
+from app.agents.tools.simulate_draws import SimulateDrawsTool
+from app.agents.tools.analyze_consistency import AnalyzeConsistencyTool
 from app.agents.tools.set_deck_leader import SetDeckLeaderTool
 from app.agents.tools.add_cards_to_deck import AddCardsToDeckTool
 from app.agents.tools.remove_cards_from_deck import RemoveCardsFromDeckTool
@@ -18,6 +20,8 @@ __all__ = [
     "ValidateDeckTool",
     "SearchKnowledgeTool",
     "CalculateStatsTool",
+    "SimulateDrawsTool",
+    "AnalyzeConsistencyTool",
     "SetDeckLeaderTool",
     "AddCardsToDeckTool",
     "RemoveCardsFromDeckTool",
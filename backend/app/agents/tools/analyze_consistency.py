@@ -0,0 +1,116 @@
+from uuid import UUID
+
+from app.models import Deck
+from app.services.consistency import CardGroup, analyze_consistency
+from app.services.deck_stats import load_deck_lines
+from app.agents.core.tool import BaseTool, ToolResponse, register_tool
+
+
+@register_tool
+class AnalyzeConsistencyTool(BaseTool):
+    """Exact draw odds for groups of cards in a deck."""
+
+    @classmethod
+    def name(cls) -> str:
+        return "analyze_consistency"
+
+    @classmethod
+    def description(cls) -> str:
+        return (
+            "Exact probabilities (hypergeometric, no sampling) of drawing at least N cards "
+            "from a group by each turn. Groups can be a cost range, trait, effect keyword, "
+            "card type or specific card IDs. With no groups, reports each cost in the deck. "
+            "With several groups, also reports the odds of satisfying all of them at once."
+        )
+
+    @classmethod
+    def parameters(cls) -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "deck_id": {
+                    "type": "string",
+                    "description": "UUID of the deck to analyze.",
+                },
+                "groups": {
+                    "type": "array",
+                    "description": "Card groups; a card belongs to a group if it matches every given field.",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "label": {"type": "string", "description": "Name to show for the group."},
+                            "card_ids": {"type": "array", "items": {"type": "string"}},
+                            "cost_min": {"type": "integer"},
+                            "cost_max": {"type": "integer"},
+                            "trait": {"type": "string", "description": "e.g. 'Straw Hat Crew'."},
+                            "keyword": {"type": "string", "description": "Effect text phrase, e.g. 'blocker'."},
+                            "type": {"type": "string", "description": "CHARACTER, EVENT or STAGE."},
+                            "min_copies": {"type": "integer", "description": "Copies needed (default 1)."},
+                        },
+                    },
+                },
+                "turns": {
+                    "type": "integer",
+                    "description": "Number of turns to report (default 5).",
+                },
+                "going_first": {
+                    "type": "boolean",
+                    "description": "Whether the player goes first (default true).",
+                },
+            },
+            "required": ["deck_id"],
+        }
+
+    async def execute(self) -> ToolResponse:
+        deck_id_str = self.args.get("deck_id") or self.agent.context.get("deck_id")
+        if not deck_id_str:
+            return ToolResponse(message="No deck_id provided.")
+
+        try:
+            deck_id = UUID(deck_id_str)
+        except ValueError:
+            return ToolResponse(message=f"Invalid deck_id: {deck_id_str}")
+
+        db = self.agent.db
+        deck = await db.get(Deck, deck_id)
+        if not deck:
+            return ToolResponse(message=f"Deck not found: {deck_id_str}")
+
+        groups = [CardGroup.from_spec(spec) for spec in self.args.get("groups") or []]
+        result = analyze_consistency(
+            await load_deck_lines(db, deck_id),
+            groups,
+            turns=max(1, min(int(self.args.get("turns") or 5), 10)),
+            going_first=self.args.get("going_first", True),
+        )
+        if not result["deck_size"]:
+            return ToolResponse(message=f"{deck.name} has no cards yet.")
+
+        # Format output
+        order = "first" if result["going_first"] else "second"
+        turns = result["groups"][0]["by_turn"] if result["groups"] else []
+        lines = [f"# Consistency: {deck.name}\n"]
+        lines.append(f"**Deck size:** {result['deck_size']}, going {order}")
+        lines.append("")
+
+        header = " | ".join(f"T{t['turn']} ({t['cards_seen']})" for t in turns)
+        lines.append(f"| Group | Copies | Need | Opening hand | {header} |")
+        lines.append("|---|---|---|---|" + "---|" * len(turns))
+        for group in result["groups"]:
+            odds = " | ".join(f"{t['probability']:.1%}" for t in group["by_turn"])
+            lines.append(
+                f"| {group['label']} | {group['copies']} | {group['min_copies']}+ | "
+                f"{group['opening_hand']:.1%} | {odds} |"
+            )
+
+        if result["all_groups"]:
+            lines.append("")
+            odds = " → ".join(f"{p:.1%}" for p in result["all_groups"])
+            lines.append(f"**All groups at once:** {odds}")
+
+        empty = [g["label"] for g in result["groups"] if not g["copies"]]
+        if empty:
+            lines.append("")
+            lines.append(f"No cards in the deck match: {', '.join(empty)}")
+
+        return ToolResponse(message="\n".join(lines))
@@ -1,10 +1,7 @@
 from uuid import UUID
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-
-from app.models import Deck, DeckCard
-from app.services.deck_validator import DeckValidator
+from app.models import Deck
+from app.services.deck_stats import POWER_BUCKETS, load_deck_stats
 from app.agents.core.tool import BaseTool, ToolResponse, register_tool
 
 
@@ -47,57 +44,17 @@ class CalculateStatsTool(BaseTool):
             return ToolResponse(message=f"Invalid deck_id: {deck_id_str}")
 
         db = self.agent.db
-        result = await db.execute(
-            select(Deck)
-            .where(Deck.id == deck_id)
-            .options(
-                selectinload(Deck.deck_cards).selectinload(DeckCard.card),
-                selectinload(Deck.leader),
-            )
-        )
-        deck = result.scalar_one_or_none()
+        deck = await db.get(Deck, deck_id)
         if not deck:
             return ToolResponse(message=f"Deck not found: {deck_id_str}")
 
-        validator = DeckValidator()
-        base_stats = validator.calculate_deck_stats(deck)
-
-        # Additional stats
-        type_counts: dict[str, int] = {}
-        counter_counts: dict[int, int] = {}
-        power_dist: dict[str, int] = {}
-        keyword_counts: dict[str, int] = {}
-
-        for dc in deck.deck_cards:
-            card = dc.card
-            qty = dc.quantity
-
-            # Type breakdown
-            t = card.type or "Unknown"
-            type_counts[t] = type_counts.get(t, 0) + qty
-
-            # Counter distribution
-            if card.counter is not None:
-                counter_counts[card.counter] = counter_counts.get(card.counter, 0) + qty
-
-            # Power distribution (buckets)
-            if card.power is not None:
-                if card.power <= 3000:
-                    bucket = "0-3000"
-                elif card.power <= 5000:
-                    bucket = "4000-5000"
-                elif card.power <= 7000:
-                    bucket = "6000-7000"
-                else:
-                    bucket = "8000+"
-                power_dist[bucket] = power_dist.get(bucket, 0) + qty
-
-            # Simple keyword detection
-            if card.text:
-                text_lower = card.text.lower()
-                for kw in ["blocker", "rush", "double attack", "banish", "on play", "on k.o."]:
-                    if kw in text_lower:
-                        keyword_counts[kw] = keyword_counts.get(kw, 0) + qty
+        # Stored stats: one row fetch; rebuilt from the lines only if missing
+        stats = await load_deck_stats(db, deck)
+        base_stats = stats.summary()
+        type_counts = stats.type_counts
+        counter_counts = stats.counter_counts
+        power_dist = stats.power_distribution
+        keyword_counts = stats.keyword_counts
 
         # Format output
         lines = [f"# Deck Statistics: {deck.name}\n"]
@@ -125,7 +82,7 @@ class CalculateStatsTool(BaseTool):
 
         if power_dist:
             lines.append("## Power Distribution")
-            for bucket in ["0-3000", "4000-5000", "6000-7000", "8000+"]:
+            for bucket in POWER_BUCKETS:
                 if bucket in power_dist:
                     lines.append(f"  {bucket}: {power_dist[bucket]}")
             lines.append("")
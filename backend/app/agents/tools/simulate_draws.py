@@ -0,0 +1,129 @@
+import asyncio
+from uuid import UUID
+
+from app.models import Deck
+from app.services.deck_stats import load_deck_lines
+from app.services.draw_simulator import DeckEncoding, simulate_draws
+from app.agents.core.tool import BaseTool, ToolResponse, register_tool
+
+# Enough for ~0.3% precision; the API endpoint allows larger runs
+MAX_ITERATIONS = 200_000
+
+
+@register_tool
+class SimulateDrawsTool(BaseTool):
+    """Monte Carlo opening-hand and draw simulation."""
+
+    @classmethod
+    def name(cls) -> str:
+        return "simulate_draws"
+
+    @classmethod
+    def description(cls) -> str:
+        return (
+            "Simulate thousands of games' opening hands, mulligans and draws for a deck. "
+            "Returns per-turn probabilities of having an on-curve play, of drawing each "
+            "cost, of drawing specific cards, and the expected counter value in hand."
+        )
+
+    @classmethod
+    def parameters(cls) -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "deck_id": {
+                    "type": "string",
+                    "description": "UUID of the deck to simulate.",
+                },
+                "targets": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Card IDs in the deck to report draw odds for, e.g. ['OP01-016'].",
+                },
+                "turns": {
+                    "type": "integer",
+                    "description": "Number of turns to report (default 5).",
+                },
+                "going_first": {
+                    "type": "boolean",
+                    "description": "Whether the player goes first (default true).",
+                },
+                "iterations": {
+                    "type": "integer",
+                    "description": f"Games to simulate (default 50000, max {MAX_ITERATIONS}).",
+                },
+                "seed": {
+                    "type": "integer",
+                    "description": "Seed to reproduce a previous run.",
+                },
+            },
+            "required": ["deck_id"],
+        }
+
+    async def execute(self) -> ToolResponse:
+        deck_id_str = self.args.get("deck_id") or self.agent.context.get("deck_id")
+        if not deck_id_str:
+            return ToolResponse(message="No deck_id provided.")
+
+        try:
+            deck_id = UUID(deck_id_str)
+        except ValueError:
+            return ToolResponse(message=f"Invalid deck_id: {deck_id_str}")
+
+        db = self.agent.db
+        deck = await db.get(Deck, deck_id)
+        if not deck:
+            return ToolResponse(message=f"Deck not found: {deck_id_str}")
+
+        encoding = DeckEncoding.from_lines(await load_deck_lines(db, deck_id))
+        targets = list(dict.fromkeys(self.args.get("targets") or []))
+        try:
+            result = await asyncio.to_thread(
+                simulate_draws,
+                encoding,
+                iterations=min(int(self.args.get("iterations") or 50_000), MAX_ITERATIONS),
+                turns=max(1, min(int(self.args.get("turns") or 5), 10)),
+                going_first=self.args.get("going_first", True),
+                targets=targets,
+                seed=self.args.get("seed"),
+            )
+        except ValueError as e:
+            return ToolResponse(message=f"Cannot simulate {deck.name}: {e}")
+
+        # Format output
+        order = "first" if result["going_first"] else "second"
+        lines = [f"# Draw Simulation: {deck.name}\n"]
+        lines.append(
+            f"**Games:** {result['iterations']:,} going {order} "
+            f"(seed {result['seed']})"
+        )
+        lines.append(
+            f"**Mulligan rate:** {result['mulligan_rate']:.1%} "
+            f"(hands with no card costing {result['mulligan_cost']} or less)"
+        )
+        lines.append("")
+
+        lines.append("## By Turn")
+        lines.append("| Turn | DON!! | Cards seen | On-curve play | Any play | Counter in hand |")
+        lines.append("|---|---|---|---|---|---|")
+        for turn in result["turns"]:
+            lines.append(
+                f"| {turn['turn']} | {turn['don']} | {turn['cards_seen']} | "
+                f"{turn['on_curve']:.1%} | {turn['playable']:.1%} | "
+                f"{turn['expected_counter']:,.0f} |"
+            )
+        lines.append("")
+
+        lines.append("## Cost Drawn By Turn")
+        for cost in result["turns"][0]["cost_hits"]:
+            odds = " → ".join(f"{t['cost_hits'][cost]:.0%}" for t in result["turns"])
+            lines.append(f"  {cost}-cost: {odds}")
+
+        if targets:
+            lines.append("")
+            lines.append("## Specific Cards By Turn")
+            for card_id in targets:
+                odds = " → ".join(f"{t['targets'][card_id]:.0%}" for t in result["turns"])
+                lines.append(f"  {card_id}: {odds}")
+
+        return ToolResponse(message="\n".join(lines), data=result)
@@ -61,7 +61,7 @@ class ValidateDeckTool(BaseTool):
             return ToolResponse(message=f"Deck not found: {deck_id_str}")
 
         validator = DeckValidator()
-        is_valid, errors = await validator.validate_deck(deck, db)
+        is_valid, errors = validator.validate_deck(deck)
 
         if is_valid:
             return ToolResponse(message="Deck is **valid** and meets all OPTCG construction rules.")
@@ -0,0 +1,71 @@
+"""HTTP caching for catalog endpoints.
+
+Card data only changes when a sync bumps the catalog version, so the version
+plus the request URL is a strong validator for any catalog response. Matching
+If-None-Match requests are answered with 304 before the data is read.
+
+The version is the in-process snapshot's, which a sync through the API
+advances, so a 304 costs no query. Only while no snapshot is loaded is it
+read from the database (for endpoints that pass their session).
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import CatalogSync
+from app.services.card_catalog import get_catalog
+
+
+async def catalog_version(db: AsyncSession | None = None) -> int | None:
+    """The snapshot's catalog version, or the latest one in ``db`` before the
+    snapshot is loaded.
+
+    None if neither is available, or no sync has run.
+    """
+    catalog = get_catalog()
+    if catalog is not None:
+        return catalog.version
+    if db is not None:
+        return (await db.execute(select(func.max(CatalogSync.id)))).scalar()
+    return None
+
+
+def catalog_etag(request: Request, version: int) -> str:
+    """Strong ETag for this URL at catalog ``version``."""
+    url_hash = hashlib.sha1(str(request.url).encode()).hexdigest()[:16]
+    return f'"v{version}-{url_hash}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def catalog_not_modified(
+    request: Request, response: Response, db: AsyncSession | None = None
+) -> Response | None:
+    """Set catalog cache headers; return a 304 response if the client is current.
+
+    Endpoints call this first and return the result when it is not None.
+    Pass ``db`` when the response is read from the database, so it can be
+    cached even before the snapshot is loaded.
+    """
+    version = await catalog_version(db)
+    if version is None:
+        return None
+    etag = catalog_etag(request, version)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.catalog_cache_max_age}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
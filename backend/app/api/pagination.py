@@ -0,0 +1,43 @@
+"""Keyset (cursor) pagination helpers shared by the listing endpoints.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and wrapped in
+urlsafe base64 so clients treat it as opaque. The next page is fetched with a
+row-value comparison on that key, which an index on the same columns serves
+without scanning the skipped rows the way OFFSET does.
+"""
+
+import base64
+import json
+from typing import Any, Callable, Sequence
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps([str(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> tuple:
+    """Decode a cursor, converting each key part with the matching parser."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor has the wrong shape")
+        return tuple(parse(v) for parse, v in zip(parsers, values))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+
+def set_next_cursor(
+    response: Response,
+    rows: Sequence[Any],
+    limit: int,
+    key: Callable[[Any], tuple],
+) -> None:
+    """Expose the cursor for the following page when this page was full."""
+    if rows and len(rows) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
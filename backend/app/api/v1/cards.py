@@ -1,27 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_, union_all
 from app.models import Card, Leader
-from app.schemas.card import CardResponse, LeaderResponse
+from app.schemas.card import (
+    CardReference,
+    CardCooccurrence,
+    CardReferences,
+    CardResponse,
+    CardSynergy,
+    LeaderResponse,
+    LegalPoolResponse,
+)
 from app.database import get_db
+from app.api.caching import catalog_not_modified
+from app.api.pagination import decode_cursor, set_next_cursor
 from app.services.card_sync import OPTCGAPIClient
+from app.services.card_catalog import get_catalog, refresh_catalog
+from app.services.colors import color_bit, color_mask
+from app.services.cooccurrence import get_cooccurrence
+from app.services.legal_pools import get_legal_pool, get_legal_pools, refresh_legal_pools
+from app.services.synergy_graph import get_synergy_graph, refresh_synergy_graph
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _references(text: str | None, card_id: str) -> CardReferences | None:
+    """Cards and traits named in an effect text, from the catalog's index"""
+    catalog = get_catalog()
+    if catalog is None:
+        return None
+    refs = catalog.references.find(text, exclude=card_id)
+    names = {}
+    for cid in refs.card_ids:
+        record = catalog.get_card(cid) or catalog.get_leader(cid)
+        names[cid] = record["name"] if record else cid
+    return CardReferences(
+        cards=[CardReference(id=cid, name=name) for cid, name in names.items()],
+        traits=refs.traits,
+    )
+
+
 @router.get("/", response_model=list[CardResponse])
 async def list_cards(
+    request: Request,
+    response: Response,
     search: str | None = Query(None, description="Search by card name"),
     color: str | None = Query(None, description="Filter by color"),
     type: str | None = Query(None, description="Filter by type"),
     set_code: str | None = Query(None, description="Filter by set"),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
 ):
-    """List cards with optional filtering"""
+    """List cards with optional filtering.
+
+    Pass the X-Next-Cursor header of a full page as ``cursor`` to fetch the
+    next page by keyset; ``offset`` keeps working for older clients.
+    """
+    if (not_modified := await catalog_not_modified(request, response, db)) is not None:
+        return not_modified
+
     query = select(Card)
 
     # Apply filters
@@ -29,7 +70,11 @@ async def list_cards(
         query = query.where(Card.name.ilike(f"%{search}%"))
 
     if color:
-        query = query.where(Card.color.ilike(f"%{color}%"))
+        bit = color_bit(color)
+        if bit is not None:
+            query = query.where(Card.color_mask.op("&")(bit) != 0)
+        else:
+            query = query.where(Card.color.ilike(f"%{color}%"))
 
     if type:
         query = query.where(Card.type == type)
@@ -37,18 +82,28 @@ async def list_cards(
     if set_code:
         query = query.where(Card.set_code == set_code)
 
+    if cursor:
+        (after_id,) = decode_cursor(cursor, str)
+        query = query.where(Card.id > after_id)
+
     # Apply pagination
     query = query.limit(limit).offset(offset).order_by(Card.id)
 
     result = await db.execute(query)
     cards = result.scalars().all()
 
+    set_next_cursor(response, cards, limit, key=lambda c: (c.id,))
     return cards
 
 
 @router.get("/sets/", response_model=list[str])
-async def list_sets(db: AsyncSession = Depends(get_db)):
+async def list_sets(
+    request: Request, response: Response, db: AsyncSession = Depends(get_db)
+):
     """List all distinct set codes from cards and leaders"""
+    if (not_modified := await catalog_not_modified(request, response, db)) is not None:
+        return not_modified
+
     card_sets = select(Card.set_code).where(Card.set_code.isnot(None)).distinct()
     leader_sets = select(Leader.set_code).where(Leader.set_code.isnot(None)).distinct()
     combined = union_all(card_sets, leader_sets).subquery()
@@ -57,27 +112,121 @@ async def list_sets(db: AsyncSession = Depends(get_db)):
     return [row[0] for row in result.all()]
 
 
+@router.get("/synergies/", response_model=list[CardSynergy])
+async def get_synergies(
+    card_ids: list[str] = Query(..., description="Cards (e.g. a deck) to find partners for"),
+    leader_id: str | None = Query(None, description="Only cards legal for this leader"),
+    k: int = Query(20, ge=1, le=100),
+):
+    """Top-k cards with the most synergy to a set of cards.
+
+    Served from the synergy graph precomputed after each card sync.
+    """
+    graph = get_synergy_graph()
+    catalog = get_catalog()
+    if graph is None or catalog is None:
+        raise HTTPException(status_code=503, detail="Synergy graph not built yet")
+
+    seeds = list(card_ids)
+    leader_mask = None
+    if leader_id:
+        leader = catalog.get_leader(leader_id)
+        if not leader:
+            raise HTTPException(status_code=404, detail="Leader not found")
+        seeds.append(leader_id)
+        leader_mask = color_mask(leader["colors"])
+
+    results = []
+    for card_id, score, reasons in graph.top_k(seeds, k=k, leader_mask=leader_mask):
+        card = catalog.get_card(card_id) or {"name": card_id}
+        results.append(
+            CardSynergy(
+                card_id=card_id,
+                name=card["name"],
+                type=card.get("type"),
+                color=card.get("color"),
+                cost=card.get("cost"),
+                score=score,
+                reasons=reasons,
+            )
+        )
+    return results
+
+
+@router.get("/played-with/", response_model=list[CardCooccurrence])
+async def get_played_with(
+    card_ids: list[str] = Query(..., description="Cards (e.g. a deck) to find partners for"),
+    leader_id: str | None = Query(None, description="Prefer this leader's decks; only legal cards"),
+    k: int = Query(20, ge=1, le=100),
+):
+    """Top-k cards most often played with a set of cards in stored decks.
+
+    Served from the co-occurrence index, which is kept up to date as decks
+    are saved.
+    """
+    index = get_cooccurrence()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Co-occurrence index not built yet")
+
+    catalog = get_catalog()
+    allowed = None
+    if leader_id and catalog is not None:
+        allowed = get_legal_pool(catalog, leader_id)
+        if allowed is None:
+            raise HTTPException(status_code=404, detail="Leader not found")
+
+    results = []
+    for rec in index.recommend(card_ids, leader_id=leader_id, k=k, allowed=allowed):
+        card = (catalog.get_card(rec["card_id"]) if catalog else None) or {"name": rec["card_id"]}
+        results.append(
+            CardCooccurrence(
+                name=card["name"],
+                type=card.get("type"),
+                color=card.get("color"),
+                cost=card.get("cost"),
+                **rec,
+            )
+        )
+    return results
+
+
 @router.get("/{card_id}", response_model=CardResponse)
-async def get_card(card_id: str, db: AsyncSession = Depends(get_db)):
+async def get_card(
+    card_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
     """Get a specific card by ID"""
+    if (not_modified := await catalog_not_modified(request, response, db)) is not None:
+        return not_modified
+
     card = await db.get(Card, card_id)
 
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    return card
+    return CardResponse.model_validate(card).model_copy(
+        update={"references": _references(card.text, card.id)}
+    )
 
 
 @router.get("/leaders/", response_model=list[LeaderResponse])
 async def list_leaders(
+    request: Request,
+    response: Response,
     search: str | None = Query(None, description="Search by leader name"),
     color: str | None = Query(None, description="Filter by color"),
     set_code: str | None = Query(None, description="Filter by set"),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
 ):
     """List leader cards"""
+    if (not_modified := await catalog_not_modified(request, response, db)) is not None:
+        return not_modified
+
     query = select(Leader)
 
     # Apply filters
@@ -85,29 +234,72 @@ async def list_leaders(
         query = query.where(Leader.name.ilike(f"%{search}%"))
 
     if color:
-        query = query.where(Leader.colors.contains([color]))
+        bit = color_bit(color)
+        if bit is not None:
+            query = query.where(Leader.color_mask.op("&")(bit) != 0)
+        else:
+            query = query.where(Leader.colors.contains([color]))
 
     if set_code:
         query = query.where(Leader.set_code == set_code)
 
+    if cursor:
+        (after_id,) = decode_cursor(cursor, str)
+        query = query.where(Leader.id > after_id)
+
     # Apply pagination
     query = query.limit(limit).offset(offset).order_by(Leader.id)
 
     result = await db.execute(query)
     leaders = result.scalars().all()
 
+    set_next_cursor(response, leaders, limit, key=lambda l: (l.id,))
     return leaders
 
 
 @router.get("/leaders/{leader_id}", response_model=LeaderResponse)
-async def get_leader(leader_id: str, db: AsyncSession = Depends(get_db)):
+async def get_leader(
+    leader_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
     """Get a specific leader by ID"""
+    if (not_modified := await catalog_not_modified(request, response, db)) is not None:
+        return not_modified
+
     leader = await db.get(Leader, leader_id)
 
     if not leader:
         raise HTTPException(status_code=404, detail="Leader not found")
 
-    return leader
+    return LeaderResponse.model_validate(leader).model_copy(
+        update={"references": _references(leader.text, leader.id)}
+    )
+
+
+@router.get("/leaders/{leader_id}/pool", response_model=LegalPoolResponse)
+async def get_leader_pool(leader_id: str, request: Request, response: Response):
+    """Every card legal for a leader (sorted IDs) with summary stats.
+
+    Served from the pools precomputed after each card sync.
+    """
+    if (not_modified := await catalog_not_modified(request, response)) is not None:
+        return not_modified
+
+    pools = get_legal_pools()
+    if pools is None:
+        raise HTTPException(status_code=503, detail="Legal pools not built yet")
+    pool = pools.get(leader_id)
+    if pool is None:
+        raise HTTPException(status_code=404, detail="Leader not found")
+
+    return LegalPoolResponse(
+        leader_id=leader_id,
+        colors=pool.colors,
+        card_ids=pool.card_ids.tolist(),
+        **pool.stats,
+    )
 
 
 @router.post("/sync")
@@ -117,6 +309,10 @@ async def sync_cards(db: AsyncSession = Depends(get_db)):
 
     try:
         result = await client.sync_to_database(db)
+        if result.get("catalog_changed"):
+            catalog = await refresh_catalog(db)
+            refresh_legal_pools(catalog)
+            await refresh_synergy_graph(catalog)
         return {
             "success": True,
             "message": "Cards synced successfully",
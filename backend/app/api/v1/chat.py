@@ -1,8 +1,9 @@
 import json
 import logging
+from datetime import datetime
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +13,7 @@ from ag_ui.encoder import EventEncoder
 
 from app.config import settings
 from app.database import get_db
+from app.api.pagination import decode_cursor, set_next_cursor
 from app.schemas.chat import (
     ConversationCreate,
     ConversationResponse,
@@ -59,12 +61,21 @@ async def create_conversation(
 
 @router.get("/conversations", response_model=list[ConversationResponse])
 async def list_conversations(
+    response: Response,
     limit: int = Query(default=20, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
 ):
     """List all conversations."""
-    return await _conversation_service.list_conversations(db, limit, offset)
+    after = decode_cursor(cursor, datetime.fromisoformat, UUID) if cursor else None
+    conversations = await _conversation_service.list_conversations(
+        db, limit, offset, after=after
+    )
+    set_next_cursor(
+        response, conversations, limit, key=lambda c: (c.updated_at, c.id)
+    )
+    return conversations
 
 
 @router.get("/conversations/by-deck/{deck_id}", response_model=ConversationWithMessages | None)
@@ -121,14 +132,19 @@ async def delete_conversation(
 )
 async def get_messages(
     conversation_id: UUID,
+    response: Response,
     limit: int = Query(default=50, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
 ):
     """Get messages for a conversation."""
-    return await _conversation_service.get_messages(
-        db, conversation_id, limit, offset
+    after = decode_cursor(cursor, datetime.fromisoformat, UUID) if cursor else None
+    messages = await _conversation_service.get_messages(
+        db, conversation_id, limit, offset, after=after
     )
+    set_next_cursor(response, messages, limit, key=lambda m: (m.created_at, m.id))
+    return messages
 
 
 @router.post("/conversations/{conversation_id}/messages")
@@ -1,17 +1,180 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from pydantic import ValidationError
+from sqlalchemy import Select, select, delete, func, insert, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
 from app.models import Deck, DeckCard, Card, Leader
-from app.schemas.deck import DeckCreate, DeckResponse, DeckUpdate
+from app.schemas.deck import (
+    DeckBatchValidation,
+    DeckCardCreate,
+    DeckCodeResponse,
+    DeckCreate,
+    DeckImport,
+    DeckLine,
+    Decklist,
+    DecklistBatch,
+    DeckOpsRequest,
+    DeckOpsResponse,
+    DeckResponse,
+    DeckSummary,
+    DeckUpdate,
+    DeckValidation,
+    ConsistencyRequest,
+    ConsistencyResponse,
+    SimulationRequest,
+    SimulationResponse,
+)
+from app.config import settings
 from app.database import get_db
+from app.api.pagination import decode_cursor, set_next_cursor
+from app.services.card_catalog import get_catalog, load_catalog_subset
+from app.services import deck_batch
+from app.services.consistency import CardGroup, analyze_consistency
+from app.services.cooccurrence import forget_deck, record_deck
+from app.services.deck_code import (
+    DeckCodeError,
+    canonical_lines,
+    decode_deck_code,
+    deck_content_hash,
+    encode_deck_code,
+)
+from app.services.deck_stats import DeckStats, load_deck_lines, load_deck_stats
+from app.services.draw_simulator import (
+    DeckEncoding,
+    simulate_draws,
+    simulate_draws_parallel,
+)
 from app.services.deck_validator import DeckValidator
-from uuid import UUID
+from contextlib import asynccontextmanager
+from datetime import datetime
+from uuid import UUID, uuid4
+import asyncio
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Deck columns read by the summary listing (everything except the cards)
+_SUMMARY_COLUMNS = (
+    Deck.id,
+    Deck.user_id,
+    Deck.name,
+    Deck.description,
+    Deck.leader_id,
+    Deck.is_public,
+    Deck.total_cards,
+    Deck.avg_cost,
+    Deck.color_distribution,
+    Deck.stats,
+    Deck.revision,
+    Deck.content_hash,
+    Deck.created_at,
+    Deck.updated_at,
+)
+
+
+async def _load_deck(db: AsyncSession, deck_id: UUID) -> Deck | None:
+    """Fetch a deck with everything DeckResponse serializes"""
+    result = await db.execute(
+        select(Deck)
+        .where(Deck.id == deck_id)
+        .options(
+            selectinload(Deck.deck_cards).selectinload(DeckCard.card),
+            selectinload(Deck.leader),
+        )
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _fetch_cards(db: AsyncSession, card_ids: list[str]) -> dict[str, Card]:
+    """Load every referenced card in one IN query (404 on unknown IDs)"""
+    if not card_ids:
+        return {}
+    result = await db.execute(select(Card).where(Card.id.in_(set(card_ids))))
+    cards = {card.id: card for card in result.scalars()}
+    for card_id in card_ids:
+        if card_id not in cards:
+            raise HTTPException(status_code=404, detail=f"Card {card_id} not found")
+    return cards
+
+
+async def _insert_cards(
+    db: AsyncSession, deck_id: UUID, card_items: list[DeckCardCreate]
+) -> None:
+    """Bulk insert a deck's card lines in one statement"""
+    if card_items:
+        await db.execute(
+            insert(DeckCard),
+            [
+                {"deck_id": deck_id, "card_id": item.card_id, "quantity": item.quantity}
+                for item in card_items
+            ],
+        )
+
+
+async def _deck_lines(db: AsyncSession, deck_id: UUID) -> list[tuple[str, int]]:
+    """(card_id, quantity) pairs of a deck, without loading the cards"""
+    result = await db.execute(
+        select(DeckCard.card_id, DeckCard.quantity).where(DeckCard.deck_id == deck_id)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+@asynccontextmanager
+async def _deck_write(db: AsyncSession):
+    """Stage a deck write in the block and commit it, turning constraint
+    races into 409s.
+
+    The deck UPDATE/INSERT can be sent by any flush inside the block (an
+    autoflush before a query, too), so the whole block is covered, not just
+    the commit. Do the reads that can fail with 404 before entering it.
+    """
+    try:
+        yield
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Deck was modified concurrently, refetch it"
+        )
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409, detail="An identical public deck already exists"
+        )
+
+
+def _deck_page(
+    query: Select,
+    is_public: bool | None,
+    content_hash: str | None,
+    cursor: str | None,
+    limit: int,
+    offset: int,
+) -> Select:
+    """Apply the listing filters and newest-first keyset pagination"""
+    # Filter by public
+    if is_public is not None:
+        query = query.where(Deck.is_public == is_public)
+    if content_hash:
+        query = query.where(Deck.content_hash == content_hash)
+
+    if cursor:
+        after = decode_cursor(cursor, datetime.fromisoformat, UUID)
+        query = query.where(tuple_(Deck.created_at, Deck.id) < after)
+
+    # Apply pagination
+    return (
+        query.limit(limit)
+        .offset(offset)
+        .order_by(Deck.created_at.desc(), Deck.id.desc())
+    )
+
 
 @router.post("/", response_model=DeckResponse, status_code=201)
 async def create_deck(
@@ -24,110 +187,268 @@ async def create_deck(
     if not leader:
         raise HTTPException(status_code=404, detail="Leader not found")
 
-    # Create deck (no user_id for MVP - no auth yet)
+    # Verify all cards exist
+    cards = await _fetch_cards(db, [item.card_id for item in deck_data.cards])
+
+    # Create deck (no user_id for MVP - no auth yet); the id is set here so
+    # the lines can reference it before anything is flushed
     deck = Deck(
+        id=uuid4(),
         user_id=None,
         name=deck_data.name,
         description=deck_data.description,
         leader_id=deck_data.leader_id,
         is_public=deck_data.is_public,
     )
+    DeckStats.from_lines(
+        (cards[item.card_id], item.quantity) for item in deck_data.cards
+    ).apply_to(deck)
+    deck.content_hash = deck_content_hash(
+        deck.leader_id, [(item.card_id, item.quantity) for item in deck_data.cards]
+    )
 
-    db.add(deck)
-    await db.flush()  # Get deck.id
+    async with _deck_write(db):
+        db.add(deck)
+        await _insert_cards(db, deck.id, deck_data.cards)
+    record_deck(deck.id, deck.leader_id, [item.card_id for item in deck_data.cards])
 
-    # Add cards to deck
-    for card_item in deck_data.cards:
-        # Verify card exists
-        card = await db.get(Card, card_item.card_id)
-        if not card:
-            raise HTTPException(
-                status_code=404, detail=f"Card {card_item.card_id} not found"
-            )
+    return await _load_deck(db, deck.id)
 
-        deck_card = DeckCard(
-            deck_id=deck.id, card_id=card_item.card_id, quantity=card_item.quantity
-        )
-        db.add(deck_card)
-
-    await db.commit()
 
-    # Reload deck with relationships
-    result = await db.execute(
-        select(Deck)
-        .where(Deck.id == deck.id)
-        .options(
-            selectinload(Deck.deck_cards).selectinload(DeckCard.card),
-            selectinload(Deck.leader),
+@router.post("/validate", response_model=DeckBatchValidation | DeckValidation)
+async def validate_decklists(
+    body: DecklistBatch | Decklist, db: AsyncSession = Depends(get_db)
+):
+    """Validate unsaved decklists against the construction rules.
+
+    Takes one decklist, or ``{"decks": [...]}`` for a batch. Cards are looked
+    up in the in-memory catalog, so nothing is read from the database unless
+    the catalog is not loaded yet.
+    """
+    decklists = body.decks if isinstance(body, DecklistBatch) else [body]
+
+    catalog = get_catalog()
+    if catalog is None:
+        catalog = await load_catalog_subset(
+            db,
+            {line.card_id for d in decklists for line in d.cards},
+            {d.leader_id for d in decklists},
         )
-    )
-    deck = result.scalar_one()
 
-    # Calculate and update deck stats
     validator = DeckValidator()
-    stats = validator.calculate_deck_stats(deck)
+    results = []
+    for decklist in decklists:
+        lines = [(line.card_id, line.quantity) for line in decklist.cards]
+        errors = validator.validate_decklist(catalog, decklist.leader_id, lines)
+        results.append(
+            DeckValidation(
+                is_valid=not errors,
+                total_cards=sum(qty for _, qty in lines),
+                errors=errors,
+            )
+        )
 
-    deck.total_cards = stats["total_cards"]
-    deck.avg_cost = stats["avg_cost"]
-    deck.color_distribution = stats["color_distribution"]
+    if isinstance(body, Decklist):
+        return results[0]
+    return DeckBatchValidation(
+        valid_count=sum(r.is_valid for r in results), results=results
+    )
 
-    await db.commit()
 
-    # Reload with all relationships for response serialization
-    result = await db.execute(
-        select(Deck)
-        .where(Deck.id == deck.id)
-        .options(
-            selectinload(Deck.deck_cards).selectinload(DeckCard.card),
-            selectinload(Deck.leader),
+@router.post("/batch")
+async def validate_deck_batch(
+    request: Request,
+    stats: bool = Query(True, description="Include each deck's stats"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Validate and profile many decklists sent as NDJSON.
+
+    Each body line is ``{"ref": ..., "leader_id": ..., "cards": [{"card_id",
+    "quantity"}]}``. Results stream back as NDJSON in input order, one line per
+    decklist; a malformed line yields ``{"line", "error"}`` instead of failing
+    the batch.
+    """
+    items = list(deck_batch.parse_decklists((await request.body()).splitlines()))
+    decklists = [item for item in items if isinstance(item, deck_batch.Decklist)]
+    if len(decklists) > settings.deck_batch_max_decks:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.deck_batch_max_decks} decklists per batch",
         )
+
+    catalog = get_catalog()
+    if catalog is None:
+        catalog = await load_catalog_subset(db, *deck_batch.referenced_ids(decklists))
+
+    results = deck_batch.run_batch(
+        catalog, items, settings.deck_batch_chunk_size, with_stats=stats
+    )
+    return StreamingResponse(
+        (json.dumps(result) + "\n" for result in results),
+        media_type="application/x-ndjson",
     )
-    return result.scalar_one()
+
+
+@router.post("/import", response_model=DeckResponse, status_code=201)
+async def import_deck(deck_import: DeckImport, db: AsyncSession = Depends(get_db)):
+    """Create a deck from a deck code"""
+    try:
+        leader_id, lines = decode_deck_code(deck_import.code)
+        deck_data = DeckCreate(
+            name=deck_import.name,
+            description=deck_import.description,
+            leader_id=leader_id,
+            is_public=deck_import.is_public,
+            cards=[DeckCardCreate(card_id=cid, quantity=qty) for cid, qty in lines],
+        )
+    except (DeckCodeError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid deck code: {e}")
+
+    return await create_deck(deck_data, db)
 
 
 @router.get("/", response_model=list[DeckResponse])
 async def list_decks(
+    response: Response,
     is_public: bool | None = Query(None, description="Filter by public/private"),
+    content_hash: str | None = Query(None, description="Only decks with these contents"),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
 ):
-    """List decks"""
+    """List decks, newest first"""
     query = select(Deck).options(
         selectinload(Deck.deck_cards).selectinload(DeckCard.card),
         selectinload(Deck.leader),
     )
-
-    # Filter by public
-    if is_public is not None:
-        query = query.where(Deck.is_public == is_public)
-
-    # Apply pagination
-    query = query.limit(limit).offset(offset).order_by(Deck.created_at.desc())
+    query = _deck_page(query, is_public, content_hash, cursor, limit, offset)
 
     result = await db.execute(query)
     decks = result.scalars().all()
 
+    set_next_cursor(response, decks, limit, key=lambda d: (d.created_at, d.id))
     return decks
 
 
+@router.get("/summary", response_model=list[DeckSummary])
+async def list_deck_summaries(
+    response: Response,
+    is_public: bool | None = Query(None, description="Filter by public/private"),
+    content_hash: str | None = Query(None, description="Only decks with these contents"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    db: AsyncSession = Depends(get_db),
+):
+    """List decks newest first without their cards.
+
+    Only deck columns, the stored stats and the leader's name and colors are
+    read, in one query; use GET /decks/{id} for the card list.
+    """
+    query = select(
+        *_SUMMARY_COLUMNS,
+        Leader.name.label("leader_name"),
+        Leader.colors.label("leader_colors"),
+    ).outerjoin(Leader, Deck.leader_id == Leader.id)
+    query = _deck_page(query, is_public, content_hash, cursor, limit, offset)
+
+    result = await db.execute(query)
+    rows = result.all()
+
+    set_next_cursor(response, rows, limit, key=lambda r: (r.created_at, r.id))
+    return [DeckSummary.model_validate(row._mapping) for row in rows]
+
+
 @router.get("/{deck_id}", response_model=DeckResponse)
 async def get_deck(deck_id: UUID, db: AsyncSession = Depends(get_db)):
     """Get a specific deck by ID"""
-    result = await db.execute(
-        select(Deck)
-        .where(Deck.id == deck_id)
-        .options(
-            selectinload(Deck.deck_cards).selectinload(DeckCard.card),
-            selectinload(Deck.leader),
+    deck = await _load_deck(db, deck_id)
+
+    if not deck:
+        raise HTTPException(status_code=404, detail="Deck not found")
+
+    return deck
+
+
+@router.get("/{deck_id}/stats")
+async def get_deck_stats(deck_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Get a deck's stored statistics without loading its cards"""
+    deck = await db.get(Deck, deck_id)
+
+    if not deck:
+        raise HTTPException(status_code=404, detail="Deck not found")
+
+    stats = await load_deck_stats(db, deck)
+    return {"deck_id": deck.id, "revision": deck.revision, **stats.summary()}
+
+
+@router.post("/{deck_id}/simulate", response_model=SimulationResponse)
+async def simulate_deck(
+    deck_id: UUID, body: SimulationRequest, db: AsyncSession = Depends(get_db)
+):
+    """Monte Carlo odds of drawing each cost, and given cards, by each turn"""
+    if body.iterations > settings.simulation_max_iterations:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.simulation_max_iterations} iterations",
         )
+    deck = await db.get(Deck, deck_id)
+    if not deck:
+        raise HTTPException(status_code=404, detail="Deck not found")
+
+    encoding = DeckEncoding.from_lines(await load_deck_lines(db, deck_id))
+    options = body.model_dump(exclude={"parallel"})
+    parallel = body.parallel
+    if parallel is None:
+        parallel = body.iterations > settings.simulation_parallel_threshold
+    try:
+        if parallel:
+            result = await simulate_draws_parallel(encoding, **options)
+        else:
+            result = await asyncio.to_thread(simulate_draws, encoding, **options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"deck_id": deck_id, **result}
+
+
+@router.post("/{deck_id}/consistency", response_model=ConsistencyResponse)
+async def deck_consistency(
+    deck_id: UUID, body: ConsistencyRequest, db: AsyncSession = Depends(get_db)
+):
+    """Exact odds of drawing card groups by each turn (hypergeometric)"""
+    deck = await db.get(Deck, deck_id)
+    if not deck:
+        raise HTTPException(status_code=404, detail="Deck not found")
+
+    result = analyze_consistency(
+        await load_deck_lines(db, deck_id),
+        [CardGroup.from_spec(group.model_dump()) for group in body.groups],
+        turns=body.turns,
+        going_first=body.going_first,
     )
-    deck = result.scalar_one_or_none()
+    return {"deck_id": deck_id, **result}
+
+
+@router.get("/{deck_id}/code", response_model=DeckCodeResponse)
+async def export_deck(deck_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Get the shareable code and content hash of a deck"""
+    deck = await db.get(Deck, deck_id)
 
     if not deck:
         raise HTTPException(status_code=404, detail="Deck not found")
 
-    return deck
+    lines = await _deck_lines(db, deck_id)
+    try:
+        code = encode_deck_code(deck.leader_id, lines)
+    except DeckCodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return DeckCodeResponse(
+        deck_id=deck.id,
+        code=code,
+        content_hash=deck_content_hash(deck.leader_id, lines),
+    )
 
 
 @router.patch("/{deck_id}", response_model=DeckResponse)
@@ -135,89 +456,145 @@ async def update_deck(
     deck_id: UUID, deck_update: DeckUpdate, db: AsyncSession = Depends(get_db)
 ):
     """Update a deck (metadata and/or cards)"""
-    # Load deck with relationships
-    result = await db.execute(
-        select(Deck)
-        .where(Deck.id == deck_id)
-        .options(
-            selectinload(Deck.deck_cards).selectinload(DeckCard.card),
-            selectinload(Deck.leader),
-        )
-    )
-    deck = result.scalar_one_or_none()
+    deck = await db.get(Deck, deck_id)
 
     if not deck:
         raise HTTPException(status_code=404, detail="Deck not found")
 
-    # Update metadata fields
-    if deck_update.name is not None:
-        deck.name = deck_update.name
-    if deck_update.description is not None:
-        deck.description = deck_update.description
-    if deck_update.is_public is not None:
-        deck.is_public = deck_update.is_public
-
-    # Update leader
+    # Reads first: anything staged on the deck would be autoflushed by them
     if deck_update.leader_id is not None:
         leader = await db.get(Leader, deck_update.leader_id)
         if not leader:
             raise HTTPException(status_code=404, detail="Leader not found")
-        deck.leader_id = deck_update.leader_id
-
-    # Replace cards if provided
+    cards = None
     if deck_update.cards is not None:
-        # Delete existing deck cards
-        await db.execute(
-            delete(DeckCard).where(DeckCard.deck_id == deck_id)
-        )
-
-        # Add new cards
-        for card_item in deck_update.cards:
-            card = await db.get(Card, card_item.card_id)
-            if not card:
-                raise HTTPException(
-                    status_code=404, detail=f"Card {card_item.card_id} not found"
-                )
-            deck_card = DeckCard(
-                deck_id=deck.id,
-                card_id=card_item.card_id,
-                quantity=card_item.quantity,
+        cards = await _fetch_cards(db, [item.card_id for item in deck_update.cards])
+
+    card_ids = None
+    async with _deck_write(db):
+        # Update metadata fields
+        if deck_update.name is not None:
+            deck.name = deck_update.name
+        if deck_update.description is not None:
+            deck.description = deck_update.description
+        if deck_update.is_public is not None:
+            deck.is_public = deck_update.is_public
+        if deck_update.leader_id is not None:
+            deck.leader_id = deck_update.leader_id
+
+        # Replace cards if provided
+        if deck_update.cards is not None:
+            card_ids = [item.card_id for item in deck_update.cards]
+            await db.execute(delete(DeckCard).where(DeckCard.deck_id == deck_id))
+            await _insert_cards(db, deck.id, deck_update.cards)
+
+            DeckStats.from_lines(
+                (cards[item.card_id], item.quantity) for item in deck_update.cards
+            ).apply_to(deck)
+            deck.content_hash = deck_content_hash(
+                deck.leader_id,
+                [(item.card_id, item.quantity) for item in deck_update.cards],
             )
-            db.add(deck_card)
-
-        await db.flush()
-
-        # Reload to get new deck_cards for stats calculation
-        await db.refresh(deck)
-        result = await db.execute(
-            select(Deck)
-            .where(Deck.id == deck_id)
-            .options(
-                selectinload(Deck.deck_cards).selectinload(DeckCard.card),
-                selectinload(Deck.leader),
-            )
-        )
-        deck = result.scalar_one()
+        elif deck_update.leader_id is not None:
+            lines = await _deck_lines(db, deck_id)
+            card_ids = [card_id for card_id, _ in lines]
+            deck.content_hash = deck_content_hash(deck.leader_id, lines)
 
-        # Recalculate stats
-        validator = DeckValidator()
-        stats = validator.calculate_deck_stats(deck)
-        deck.total_cards = stats["total_cards"]
-        deck.avg_cost = stats["avg_cost"]
-        deck.color_distribution = stats["color_distribution"]
+    if card_ids is not None:
+        record_deck(deck_id, deck.leader_id, card_ids)
 
-    await db.commit()
+    return await _load_deck(db, deck_id)
+
+
+@router.post("/{deck_id}/ops", response_model=DeckOpsResponse)
+async def apply_deck_ops(
+    deck_id: UUID, ops_request: DeckOpsRequest, db: AsyncSession = Depends(get_db)
+):
+    """Apply add/remove/set operations to a deck's card lines.
+
+    Only the touched rows are written and the stored stats are adjusted by
+    each card's quantity change instead of being recomputed. ``revision`` must
+    match the deck's current revision; otherwise 409 and the client refetches.
+    """
+    deck = await db.get(Deck, deck_id)
+
+    if not deck:
+        raise HTTPException(status_code=404, detail="Deck not found")
+    if deck.revision != ops_request.revision:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Deck is at revision {deck.revision}, not {ops_request.revision}",
+        )
+
+    card_ids = list(dict.fromkeys(op.card_id for op in ops_request.ops))
+    cards = await _fetch_cards(db, card_ids)
 
-    # Reload with all relationships for response serialization
+    # Current lines for the touched cards only
     result = await db.execute(
-        select(Deck)
-        .where(Deck.id == deck_id)
-        .options(
-            selectinload(Deck.deck_cards).selectinload(DeckCard.card),
-            selectinload(Deck.leader),
+        select(DeckCard).where(
+            DeckCard.deck_id == deck_id, DeckCard.card_id.in_(card_ids)
         )
     )
-    return result.scalar_one()
+    lines: dict[str, list[DeckCard]] = {}
+    for deck_card in result.scalars():
+        lines.setdefault(deck_card.card_id, []).append(deck_card)
+
+    before = {cid: sum(dc.quantity for dc in lines.get(cid, [])) for cid in card_ids}
+    after = dict(before)
+    for op in ops_request.ops:
+        if op.op == "add":
+            after[op.card_id] += op.quantity
+        elif op.op == "remove":
+            after[op.card_id] -= op.quantity
+        else:
+            after[op.card_id] = op.quantity
+        if not 0 <= after[op.card_id] <= 4:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Card {op.card_id} would have {after[op.card_id]} copies (0-4 allowed)",
+            )
+
+    stats = await load_deck_stats(db, deck)
+
+    changed = [cid for cid in card_ids if after[cid] != before[cid]]
+    if changed:
+        contents = dict(canonical_lines(await _deck_lines(db, deck_id)))
+        contents.update(after)
+
+        # The deck UPDATE is guarded by its revision; a concurrent writer
+        # that got there first makes it match no row. Touching updated_at
+        # makes sure the UPDATE (and the revision bump) is sent even when
+        # the summary columns come out the same.
+        async with _deck_write(db):
+            deck.content_hash = deck_content_hash(deck.leader_id, contents.items())
+            for card_id in changed:
+                stats.add(cards[card_id], after[card_id] - before[card_id])
+                existing = lines.get(card_id, [])
+                if after[card_id] and existing:
+                    existing[0].quantity = after[card_id]
+                    existing = existing[1:]
+                elif after[card_id]:
+                    db.add(
+                        DeckCard(
+                            deck_id=deck.id, card_id=card_id, quantity=after[card_id]
+                        )
+                    )
+                for deck_card in existing:
+                    await db.delete(deck_card)
+
+            stats.apply_to(deck)
+            deck.updated_at = func.now()
+        record_deck(deck_id, deck.leader_id, [cid for cid, qty in contents.items() if qty])
+
+    return DeckOpsResponse(
+        id=deck.id,
+        revision=deck.revision,
+        total_cards=stats.total_cards,
+        avg_cost=stats.avg_cost,
+        color_distribution=stats.color_distribution,
+        cost_curve=stats.cost_curve,
+        changed=[DeckLine(card_id=cid, quantity=after[cid]) for cid in card_ids],
+    )
 
 
 @router.delete("/{deck_id}", status_code=204)
@@ -230,6 +607,7 @@ async def delete_deck(deck_id: UUID, db: AsyncSession = Depends(get_db)):
 
     await db.delete(deck)
     await db.commit()
+    forget_deck(deck_id)
 
     return None
 
@@ -237,20 +615,12 @@ async def delete_deck(deck_id: UUID, db: AsyncSession = Depends(get_db)):
 @router.post("/{deck_id}/validate")
 async def validate_deck(deck_id: UUID, db: AsyncSession = Depends(get_db)):
     """Validate a deck against One Piece TCG rules"""
-    result = await db.execute(
-        select(Deck)
-        .where(Deck.id == deck_id)
-        .options(
-            selectinload(Deck.deck_cards).selectinload(DeckCard.card),
-            selectinload(Deck.leader),
-        )
-    )
-    deck = result.scalar_one_or_none()
+    deck = await _load_deck(db, deck_id)
 
     if not deck:
         raise HTTPException(status_code=404, detail="Deck not found")
 
     validator = DeckValidator()
-    is_valid, errors = await validator.validate_deck(deck, db)
+    is_valid, errors = validator.validate_deck(deck)
 
     return {"is_valid": is_valid, "errors": errors}
@@ -40,6 +40,34 @@ class Settings(BaseSettings):
 
     # API
     api_v1_prefix: str = "/api/v1"
+    catalog_cache_max_age: int = 60  # seconds clients may reuse card responses
+
+    # Card sync
+    card_sync_chunk_size: int = 500  # rows per INSERT ... ON CONFLICT statement
+    card_sync_fixture_dir: str = ""  # replay recorded API payloads instead of HTTP
+    card_sync_streaming: bool = True  # parse and write upstream payloads incrementally
+
+    # Bulk deck validation
+    deck_batch_max_decks: int = 10000  # decklists accepted per request
+    deck_batch_chunk_size: int = 1000  # decklists per vectorized pass
+
+    # Draw simulation
+    simulation_batch_size: int = 100_000  # games per vectorized batch
+    simulation_max_iterations: int = 5_000_000
+    simulation_parallel_threshold: int = 1_000_000  # larger runs use worker processes
+    simulation_workers: int = 0  # process pool size; 0 = one per CPU
+
+    # Goldfish simulation
+    goldfish_games: int = 2000  # games per deck in the analyzer graph
+    goldfish_batch_size: int = 500  # games per vectorized batch / pool task
+
+    # Co-occurrence recommendations
+    cooccurrence_min_support: int = 2  # decks a pair needs before it scores
+    cooccurrence_min_leader_decks: int = 20  # fewer and all decks are used
+
+    # Synergy graph
+    synergy_graph_path: str = "data/synergy_graph.npz"
+    synergy_graph_top_k: int = 64  # strongest edges kept per card
 
 
 settings = Settings()
@@ -1,14 +1,48 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings as app_settings
+from app.database import AsyncSessionLocal
 from app.api.v1 import cards, decks, ai, chat
 from app.api.v1 import settings as settings_router_module
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.services.card_catalog import refresh_catalog
+from app.services.cooccurrence import refresh_cooccurrence
+from app.services.process_pool import shutdown_process_pool
+from app.services.legal_pools import refresh_legal_pools
+from app.services.synergy_graph import refresh_synergy_graph
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the in-memory catalog, legal pools, synergy graph and co-occurrence index"""
+    try:
+        async with AsyncSessionLocal() as db:
+            catalog = await refresh_catalog(db)
+    except Exception as e:
+        # Searches fall back to the database until the next sync
+        logger.warning(f"Card catalog not loaded at startup: {e}")
+    else:
+        refresh_legal_pools(catalog)
+        try:
+            await refresh_synergy_graph(catalog)
+        except Exception as e:
+            logger.warning(f"Synergy graph not built at startup: {e}")
+    try:
+        async with AsyncSessionLocal() as db:
+            await refresh_cooccurrence(db)
+    except Exception as e:
+        # Recommendations stay empty; saved decks are not tracked until restart
+        logger.warning(f"Co-occurrence index not built at startup: {e}")
+    yield
+    shutdown_process_pool()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="OPTCG AI Agent API",
@@ -16,6 +50,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -25,6 +60,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
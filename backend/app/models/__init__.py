@@ -2,5 +2,16 @@ from app.models.card import Card, Leader
 from app.models.deck import Deck, DeckCard
 from app.models.user import User
 from app.models.conversation import Conversation, Message
+from app.models.catalog import CatalogSync, SyncSource
 
-__all__ = ["Card", "Leader", "Deck", "DeckCard", "User", "Conversation", "Message"]
+__all__ = [
+    "Card",
+    "Leader",
+    "Deck",
+    "DeckCard",
+    "User",
+    "Conversation",
+    "Message",
+    "CatalogSync",
+    "SyncSource",
+]
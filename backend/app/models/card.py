@@ -1,5 +1,7 @@
-from sqlalchemy import Column, String, Integer, Text, TIMESTAMP, func
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import (
+    Column, String, Integer, SmallInteger, Text, TIMESTAMP, Computed, Index, func,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from app.database import Base
 
 
@@ -12,6 +14,7 @@ class Card(Base):
     name = Column(String(255), nullable=False, index=True)
     type = Column(String(20), nullable=False)  # Character, Event, Stage
     color = Column(String(50))  # Red, Blue, Green, Purple, Black, Yellow
+    color_mask = Column(SmallInteger, nullable=False, default=0, server_default="0")
     cost = Column(Integer)
     power = Column(Integer)
     counter = Column(Integer)
@@ -22,11 +25,30 @@ class Card(Base):
     category = Column(String(100))  # Character category (e.g., "Straw Hat Crew")
     set_code = Column(String(10))  # OP01, OP02, etc.
     image_url = Column(Text)
+    content_hash = Column(String(64))  # Hash of synced fields, for diff sync
+    # Full-text search vector over the ability text (maintained by Postgres)
+    text_search = Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(text, ''))", persisted=True),
+    )
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(
         TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        # Trigram indexes so ILIKE '%...%' filters avoid sequential scans
+        Index(
+            "ix_cards_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_cards_category_trgm", "category",
+            postgresql_using="gin", postgresql_ops={"category": "gin_trgm_ops"},
+        ),
+        Index("ix_cards_text_search", "text_search", postgresql_using="gin"),
+    )
+
     def __repr__(self):
         return f"<Card {self.id}: {self.name}>"
 
@@ -41,16 +63,29 @@ class Leader(Base):
     life = Column(Integer, nullable=False)  # Life points (usually 4 or 5)
     power = Column(Integer)
     colors = Column(ARRAY(String))  # Array of colors this leader supports
+    color_mask = Column(SmallInteger, nullable=False, default=0, server_default="0")
     attribute = Column(String(100))
     text = Column(Text)  # Leader ability text
     featured_character = Column(String(255))  # Main character name
     category = Column(String(100))
     set_code = Column(String(10))
     image_url = Column(Text)
+    content_hash = Column(String(64))  # Hash of synced fields, for diff sync
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(
         TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        Index(
+            "ix_leaders_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_leaders_category_trgm", "category",
+            postgresql_using="gin", postgresql_ops={"category": "gin_trgm_ops"},
+        ),
+    )
+
     def __repr__(self):
         return f"<Leader {self.id}: {self.name}>"
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, TIMESTAMP, func
+from sqlalchemy.dialects.postgresql import JSONB
+from app.database import Base
+
+
+class CatalogSync(Base):
+    """One row per card sync. The latest id is the catalog version."""
+
+    __tablename__ = "catalog_syncs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    stats = Column(JSONB)  # Stats returned by OPTCGAPIClient.sync_to_database
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<CatalogSync v{self.id}>"
+
+
+class SyncSource(Base):
+    """HTTP validators from the last successful fetch of each upstream endpoint."""
+
+    __tablename__ = "sync_sources"
+
+    url = Column(String(255), primary_key=True)
+    etag = Column(String(255))
+    last_modified = Column(String(64))
+    updated_at = Column(
+        TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return f"<SyncSource {self.url}>"
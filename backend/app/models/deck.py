@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, DECIMAL, TIMESTAMP, Text, func
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, DECIMAL, TIMESTAMP, Text, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -19,11 +19,30 @@ class Deck(Base):
     total_cards = Column(Integer, default=0)
     avg_cost = Column(DECIMAL(5, 2))
     color_distribution = Column(JSONB)  # {"Red": 25, "Blue": 15, "Green": 10}
+    stats = Column(JSONB)  # running sums maintained by DeckStats
+    revision = Column(Integer, nullable=False, server_default="0")
+    content_hash = Column(String(64))  # see app.services.deck_code
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(
         TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        # Keyset pagination for the newest-first deck listing
+        Index("ix_decks_created_at_id", "created_at", "id"),
+        # Identical-deck lookups; published decks must be unique
+        Index("ix_decks_content_hash", "content_hash"),
+        Index(
+            "uq_decks_public_content_hash",
+            "content_hash",
+            unique=True,
+            postgresql_where=text("is_public"),
+        ),
+    )
+
+    # Every UPDATE checks and bumps the revision (optimistic concurrency)
+    __mapper_args__ = {"version_id_col": revision}
+
     # Relationships
     deck_cards = relationship("DeckCard", back_populates="deck", cascade="all, delete-orphan")
     leader = relationship("Leader")
@@ -2,6 +2,20 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 
 
+class CardReference(BaseModel):
+    """A card mentioned by name in another card's text"""
+
+    id: str
+    name: str
+
+
+class CardReferences(BaseModel):
+    """Cards and traits an effect text mentions"""
+
+    cards: list[CardReference] = []
+    traits: list[str] = []
+
+
 class CardResponse(BaseModel):
     """Card response schema"""
 
@@ -21,6 +35,7 @@ class CardResponse(BaseModel):
     image_url: str | None = None
     created_at: datetime
     updated_at: datetime
+    references: CardReferences | None = None
 
     class Config:
         from_attributes = True
@@ -42,6 +57,48 @@ class LeaderResponse(BaseModel):
     image_url: str | None = None
     created_at: datetime
     updated_at: datetime
+    references: CardReferences | None = None
 
     class Config:
         from_attributes = True
+
+
+class CardSynergy(BaseModel):
+    """A card recommended from the synergy graph"""
+
+    card_id: str
+    name: str
+    type: str | None = None
+    color: str | None = None
+    cost: int | None = None
+    score: float = Field(description="Summed edge weight to the input cards")
+    reasons: list[str] = Field(description="Edge kinds: trait, attribute, reference, cost")
+
+
+class CardCooccurrence(BaseModel):
+    """A card often played alongside the input cards in stored decks"""
+
+    card_id: str
+    name: str
+    type: str | None = None
+    color: str | None = None
+    cost: int | None = None
+    score: float = Field(description="Summed positive PMI to the input cards")
+    decks_with_seed: int = Field(description="Most decks it shares with one input card")
+    play_rate: float = Field(description="Share of the scoped decks that run it")
+    leader_id: str | None = Field(description="Leader whose decks were used; null for all decks")
+    deck_count: int = Field(description="Decks in that scope")
+
+
+class LegalPoolResponse(BaseModel):
+    """Cards a leader may run: colors a subset of the leader's"""
+
+    leader_id: str
+    colors: list[str]
+    card_ids: list[str] = Field(description="Legal card IDs, sorted")
+    total: int
+    by_cost: dict[int, int]
+    by_type: dict[str, int]
+    by_color: dict[str, int]
+    counter_cards: int = Field(description="Cards with any counter value")
+    counter_2000: int = Field(description="Cards with a +2000 counter")
@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic import BaseModel, Field, UUID4
 from datetime import datetime
 from app.schemas.card import CardResponse, LeaderResponse
@@ -54,9 +55,202 @@ class DeckResponse(BaseModel):
     total_cards: int
     avg_cost: float | None
     color_distribution: dict | None
+    revision: int = 0
+    content_hash: str | None = None
     deck_cards: list[DeckCardResponse] = []
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class DeckSummary(BaseModel):
+    """Deck listing entry: deck columns, stored stats and leader basics, no cards"""
+
+    id: UUID4
+    user_id: UUID4 | None = None
+    name: str
+    description: str | None
+    leader_id: str
+    leader_name: str | None = None
+    leader_colors: list[str] | None = None
+    is_public: bool
+    total_cards: int
+    avg_cost: float | None
+    color_distribution: dict | None
+    stats: dict | None = None
+    revision: int = 0
+    content_hash: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class DeckOp(BaseModel):
+    """A single card-line change: add or remove copies, or set the count"""
+
+    op: Literal["add", "remove", "set"]
+    card_id: str
+    quantity: int = Field(1, ge=0, le=4)
+
+
+class DeckOpsRequest(BaseModel):
+    """A batch of card-line changes against a known deck revision"""
+
+    revision: int = Field(description="Revision the client last saw; 409 if stale")
+    ops: list[DeckOp] = Field(min_length=1, max_length=100)
+
+
+class DeckLine(BaseModel):
+    card_id: str
+    quantity: int
+
+
+class DeckOpsResponse(BaseModel):
+    """New revision, updated stats and the resulting count of each touched card"""
+
+    id: UUID4
+    revision: int
+    total_cards: int
+    avg_cost: float | None
+    color_distribution: dict | None
+    cost_curve: dict[int, int]
+    changed: list[DeckLine]
+
+
+class DeckImport(BaseModel):
+    """Schema for creating a deck from a deck code"""
+
+    code: str = Field(min_length=1, max_length=2048)
+    name: str = Field(min_length=1, max_length=255)
+    description: str | None = None
+    is_public: bool = False
+
+
+class DeckCodeResponse(BaseModel):
+    """Shareable deck code and the content hash of the same canonical form"""
+
+    deck_id: UUID4
+    code: str
+    content_hash: str
+
+
+class DecklistLine(BaseModel):
+    card_id: str
+    quantity: int = Field(ge=1, le=50)
+
+
+class Decklist(BaseModel):
+    """An unsaved deck: leader plus card list"""
+
+    leader_id: str
+    cards: list[DecklistLine] = []
+
+
+class DecklistBatch(BaseModel):
+    decks: list[Decklist] = Field(min_length=1, max_length=1000)
+
+
+class DeckRuleError(BaseModel):
+    rule: str = Field(description="leader, deck_size, unknown_card, max_copies or color")
+    message: str
+    card_id: str | None = None
+
+
+class DeckValidation(BaseModel):
+    is_valid: bool
+    total_cards: int
+    errors: list[DeckRuleError]
+
+
+class DeckBatchValidation(BaseModel):
+    valid_count: int
+    results: list[DeckValidation]
+
+
+class SimulationRequest(BaseModel):
+    iterations: int = Field(100_000, ge=1000, description="Games to simulate")
+    turns: int = Field(5, ge=1, le=10)
+    going_first: bool = True
+    mulligan_cost: int | None = Field(
+        2, ge=0, le=10,
+        description="Mulligan hands with no card costing at most this; null never mulligans",
+    )
+    targets: list[str] = Field(
+        [], max_length=20, description="Card IDs to report draw-by-turn odds for"
+    )
+    seed: int | None = Field(None, ge=0, description="Replay a run with its seed")
+    parallel: bool | None = Field(
+        None, description="Spread batches over worker processes; default: large runs only"
+    )
+
+
+class TurnOdds(BaseModel):
+    turn: int
+    don: int
+    cards_seen: int
+    on_curve: float = Field(description="P(a card costing exactly the DON!! available)")
+    playable: float = Field(description="P(any card costing at most the DON!! available)")
+    expected_counter: float
+    cost_hits: dict[int, float]
+    targets: dict[str, float]
+
+
+class SimulationResponse(BaseModel):
+    deck_id: UUID4
+    iterations: int
+    seed: int
+    going_first: bool
+    mulligan_cost: int | None
+    mulligan_rate: float
+    turns: list[TurnOdds]
+
+
+class CardGroupSpec(BaseModel):
+    """Cards matching every given criterion"""
+
+    label: str | None = None
+    card_ids: list[str] | None = None
+    cost_min: int | None = Field(None, ge=0)
+    cost_max: int | None = Field(None, ge=0)
+    trait: str | None = None
+    keyword: str | None = Field(None, description='Effect text phrase, e.g. "blocker"')
+    type: str | None = Field(None, description="CHARACTER, EVENT or STAGE")
+    min_copies: int = Field(1, ge=1, le=50)
+
+
+class ConsistencyRequest(BaseModel):
+    groups: list[CardGroupSpec] = Field(
+        [], max_length=8, description="Defaults to one group per cost in the deck"
+    )
+    turns: int = Field(5, ge=1, le=10)
+    going_first: bool = True
+
+
+class GroupTurnOdds(BaseModel):
+    turn: int
+    cards_seen: int
+    probability: float
+    expected_copies: float
+
+
+class GroupOdds(BaseModel):
+    label: str
+    copies: int
+    min_copies: int
+    card_ids: list[str]
+    opening_hand: float
+    by_turn: list[GroupTurnOdds]
+
+
+class ConsistencyResponse(BaseModel):
+    deck_id: UUID4
+    deck_size: int
+    going_first: bool
+    groups: list[GroupOdds]
+    all_groups: list[float] | None = Field(
+        None, description="P(every group satisfied) by turn, for two or more groups"
+    )
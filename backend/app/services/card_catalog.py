@@ -0,0 +1,350 @@
+"""CardCatalog — process-wide, read-only in-memory snapshot of cards and leaders.
+
+The catalog only changes when a card sync runs, so it is loaded once at startup
+and rebuilt after every sync. Numeric and categorical columns are held as NumPy
+arrays so filtered searches run as vectorized masks instead of ILIKE scans.
+"""
+
+from __future__ import annotations
+
+import logging
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Card, Leader, CatalogSync
+from app.services.card_references import CardReferenceIndex
+from app.services.colors import color_bit, color_mask
+
+logger = logging.getLogger(__name__)
+
+
+# ── Serializers ──
+
+
+def card_to_dict(card: Card) -> dict:
+    return {
+        "id": card.id,
+        "name": card.name,
+        "type": card.type,
+        "color": card.color,
+        "cost": card.cost,
+        "power": card.power,
+        "counter": card.counter,
+        "attribute": card.attribute,
+        "text": card.text,
+        "trigger": card.trigger,
+        "rarity": card.rarity,
+        "category": card.category,
+        "set_code": card.set_code,
+        "image_url": card.image_url,
+    }
+
+
+def leader_to_dict(leader: Leader) -> dict:
+    return {
+        "id": leader.id,
+        "name": leader.name,
+        "life": leader.life,
+        "power": leader.power,
+        "colors": leader.colors or [],
+        "attribute": leader.attribute,
+        "text": leader.text,
+        "category": leader.category,
+        "set_code": leader.set_code,
+        "image_url": leader.image_url,
+    }
+
+
+# ── Column builders ──
+
+
+def _numeric(rows: list[dict], key: str) -> np.ndarray:
+    """Float column with NaN for NULL, so comparisons drop NULLs like SQL does."""
+    return np.array(
+        [np.nan if r[key] is None else r[key] for r in rows], dtype=np.float32
+    )
+
+
+def _lowered(rows: list[dict], key: str) -> np.ndarray:
+    return np.array([(r[key] or "").lower() for r in rows], dtype=str)
+
+
+def _codes(values: list[str | None]) -> tuple[np.ndarray, dict[str, int]]:
+    """Dictionary-encode a categorical column. NULL is encoded as -1."""
+    lookup: dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int16)
+    for i, value in enumerate(values):
+        if value is None:
+            codes[i] = -1
+        else:
+            codes[i] = lookup.setdefault(value, len(lookup))
+    return codes, lookup
+
+
+def _contains(haystack: np.ndarray, needle: str, mask: np.ndarray) -> np.ndarray:
+    """Narrow ``mask`` to rows whose lowered text contains ``needle``.
+
+    Only rows still selected by ``mask`` are scanned, so cheap numeric filters
+    applied first keep the string work small.
+    """
+    idx = np.flatnonzero(mask)
+    narrowed = np.zeros_like(mask)
+    if idx.size:
+        hits = np.char.find(haystack[idx], needle.lower()) >= 0
+        narrowed[idx[hits]] = True
+    return narrowed
+
+
+def _freeze(*arrays: np.ndarray) -> None:
+    for arr in arrays:
+        arr.flags.writeable = False
+
+
+class CardCatalog:
+    """Immutable columnar snapshot of the card and leader tables.
+
+    ``version`` is the id of the card sync the snapshot reflects; it only ever
+    increases, so it can key HTTP caches of catalog responses.
+    """
+
+    def __init__(self, cards: list[dict], leaders: list[dict], version: int = 0):
+        self.version = version
+        self.cards = sorted(cards, key=lambda c: c["id"])
+        self.leaders = sorted(leaders, key=lambda l: l["id"])
+        self._card_index = {c["id"]: i for i, c in enumerate(self.cards)}
+        self._leader_index = {l["id"]: i for i, l in enumerate(self.leaders)}
+
+        # Cards
+        self.card_cost = _numeric(self.cards, "cost")
+        self.card_power = _numeric(self.cards, "power")
+        self.card_counter = _numeric(self.cards, "counter")
+        self.card_color_mask = np.array(
+            [color_mask(c["color"]) for c in self.cards], dtype=np.uint8
+        )
+        self.card_type, self._type_codes = _codes(
+            [c["type"].lower() if c["type"] else None for c in self.cards]
+        )
+        self.card_set, self._card_set_codes = _codes(
+            [c["set_code"] for c in self.cards]
+        )
+        self.card_name = _lowered(self.cards, "name")
+        self.card_color = _lowered(self.cards, "color")
+        self.card_category = _lowered(self.cards, "category")
+        self.card_text = _lowered(self.cards, "text")
+
+        # Leaders
+        self.leader_power = _numeric(self.leaders, "power")
+        self.leader_color_mask = np.array(
+            [color_mask(l["colors"]) for l in self.leaders], dtype=np.uint8
+        )
+        self.leader_set, self._leader_set_codes = _codes(
+            [l["set_code"] for l in self.leaders]
+        )
+        self.leader_name = _lowered(self.leaders, "name")
+        self.leader_category = _lowered(self.leaders, "category")
+
+        # Plain-int copies for per-card lookups (NumPy scalars are slow)
+        self._card_masks = self.card_color_mask.tolist()
+        self._leader_masks = self.leader_color_mask.tolist()
+
+        # Names and traits mentioned in effect texts
+        self.references = CardReferenceIndex(
+            (r["id"], r["name"], r["category"]) for r in self.cards + self.leaders
+        )
+
+        _freeze(
+            self.card_cost, self.card_power, self.card_counter,
+            self.card_color_mask, self.card_type, self.card_set,
+            self.card_name, self.card_color, self.card_category, self.card_text,
+            self.leader_power, self.leader_color_mask, self.leader_set,
+            self.leader_name, self.leader_category,
+        )
+
+    @property
+    def card_count(self) -> int:
+        return len(self.cards)
+
+    @property
+    def leader_count(self) -> int:
+        return len(self.leaders)
+
+    # ── Lookups ──
+
+    def get_card(self, card_id: str) -> dict | None:
+        i = self._card_index.get(card_id)
+        return dict(self.cards[i]) if i is not None else None
+
+    def get_leader(self, leader_id: str) -> dict | None:
+        i = self._leader_index.get(leader_id)
+        return dict(self.leaders[i]) if i is not None else None
+
+    def card_identity(self, card_id: str) -> tuple[str, int] | None:
+        """(name, color_mask) of a card: what deck validation needs"""
+        i = self._card_index.get(card_id)
+        if i is None:
+            return None
+        return self.cards[i]["name"], self._card_masks[i]
+
+    def leader_identity(self, leader_id: str) -> tuple[str, int] | None:
+        i = self._leader_index.get(leader_id)
+        if i is None:
+            return None
+        return self.leaders[i]["name"], self._leader_masks[i]
+
+    def card_rows(self, card_ids: list[str]) -> np.ndarray:
+        """Row of each card ID in the card columns, -1 for unknown IDs"""
+        index = self._card_index
+        return np.array([index.get(cid, -1) for cid in card_ids], dtype=np.int64)
+
+    def leader_rows(self, leader_ids: list[str]) -> np.ndarray:
+        index = self._leader_index
+        return np.array([index.get(lid, -1) for lid in leader_ids], dtype=np.int64)
+
+    def get_cards(self, card_ids: list[str]) -> dict[str, dict]:
+        return {
+            cid: dict(self.cards[self._card_index[cid]])
+            for cid in card_ids
+            if cid in self._card_index
+        }
+
+    # ── Searches ──
+
+    def search_cards(
+        self,
+        *,
+        name: str | None = None,
+        color: str | None = None,
+        cost_min: int | None = None,
+        cost_max: int | None = None,
+        card_type: str | None = None,
+        category: str | None = None,
+        power_min: int | None = None,
+        set_code: str | None = None,
+        text_contains: str | None = None,
+        within: np.ndarray | None = None,
+        limit: int = 15,
+    ) -> list[dict]:
+        """Same filter semantics as the SQL search, evaluated as array masks.
+
+        ``within`` restricts the search to those card rows (e.g. a leader's
+        legal pool).
+        """
+        if within is None:
+            mask = np.ones(len(self.cards), dtype=bool)
+        else:
+            mask = np.zeros(len(self.cards), dtype=bool)
+            mask[within] = True
+
+        if cost_min is not None:
+            mask &= self.card_cost >= cost_min
+        if cost_max is not None:
+            mask &= self.card_cost <= cost_max
+        if power_min is not None:
+            mask &= self.card_power >= power_min
+        if card_type:
+            mask &= self.card_type == self._type_codes.get(card_type.lower(), -2)
+        if set_code:
+            mask &= self.card_set == self._card_set_codes.get(set_code, -2)
+        if color:
+            bit = color_bit(color)
+            if bit is not None:
+                mask &= (self.card_color_mask & bit) != 0
+            else:
+                mask = _contains(self.card_color, color, mask)
+        if name:
+            mask = _contains(self.card_name, name, mask)
+        if category:
+            mask = _contains(self.card_category, category, mask)
+        if text_contains:
+            mask = _contains(self.card_text, text_contains, mask)
+
+        idx = np.flatnonzero(mask)
+        if text_contains and idx.size:
+            # Rank effect-text matches by how often the phrase occurs
+            hits = np.char.count(self.card_text[idx], text_contains.lower())
+            idx = idx[np.argsort(-hits, kind="stable")]
+        return [dict(self.cards[i]) for i in idx[:limit]]
+
+    def search_leaders(
+        self,
+        *,
+        name: str | None = None,
+        color: str | None = None,
+        category: str | None = None,
+        set_code: str | None = None,
+        power_min: int | None = None,
+        limit: int = 15,
+    ) -> list[dict]:
+        mask = np.ones(len(self.leaders), dtype=bool)
+
+        if power_min is not None:
+            mask &= self.leader_power >= power_min
+        if set_code:
+            mask &= self.leader_set == self._leader_set_codes.get(set_code, -2)
+        if color:
+            bit = color_bit(color)
+            if bit is not None:
+                mask &= (self.leader_color_mask & bit) != 0
+            else:
+                mask &= np.array(
+                    [color in l["colors"] for l in self.leaders], dtype=bool
+                )
+        if name:
+            mask = _contains(self.leader_name, name, mask)
+        if category:
+            mask = _contains(self.leader_category, category, mask)
+
+        idx = np.flatnonzero(mask)[:limit]
+        return [dict(self.leaders[i]) for i in idx]
+
+
+# ── Process-wide snapshot ──
+
+_catalog: CardCatalog | None = None
+
+
+def get_catalog() -> CardCatalog | None:
+    """Return the current snapshot, or None if it has not been loaded yet."""
+    return _catalog
+
+
+async def load_catalog(db: AsyncSession) -> CardCatalog:
+    """Read the card and leader tables into a new CardCatalog."""
+    cards = (await db.execute(select(Card))).scalars().all()
+    leaders = (await db.execute(select(Leader))).scalars().all()
+    version = (await db.execute(select(func.max(CatalogSync.id)))).scalar()
+    return CardCatalog(
+        [card_to_dict(c) for c in cards],
+        [leader_to_dict(l) for l in leaders],
+        version=version or 0,
+    )
+
+
+async def load_catalog_subset(
+    db: AsyncSession, card_ids: set[str], leader_ids: set[str]
+) -> CardCatalog:
+    """A catalog of just the given cards and leaders, one query per table.
+
+    For one-off jobs that only touch a few cards, or when the process-wide
+    snapshot has not been loaded.
+    """
+    cards = (await db.execute(select(Card).where(Card.id.in_(card_ids)))).scalars()
+    leaders = (
+        await db.execute(select(Leader).where(Leader.id.in_(leader_ids)))
+    ).scalars()
+    return CardCatalog(
+        [card_to_dict(c) for c in cards], [leader_to_dict(l) for l in leaders]
+    )
+
+
+async def refresh_catalog(db: AsyncSession) -> CardCatalog:
+    """Rebuild the snapshot and swap it in atomically."""
+    global _catalog
+    catalog = await load_catalog(db)
+    _catalog = catalog
+    logger.info(
+        f"Card catalog v{catalog.version} loaded: {catalog.card_count} cards, "
+        f"{catalog.leader_count} leaders"
+    )
+    return catalog
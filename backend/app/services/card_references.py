@@ -0,0 +1,84 @@
+"""CardReferenceIndex — which cards and traits an effect text mentions.
+
+Card text refers to other cards by bracketed name ("[Nami]") and to groups by
+braced trait ("{Straw Hat Crew}"). One Aho-Corasick automaton holds every name
+and trait of the catalog, so a single pass over a text finds all of them. The
+index is part of the catalog snapshot and is rebuilt with it after each sync.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+from app.services.text_matcher import AhoCorasick
+
+
+def split_traits(category: str | None) -> list[str]:
+    """"Straw Hat Crew/Supernovas" -> ["Straw Hat Crew", "Supernovas"]."""
+    if not category:
+        return []
+    return [t.strip() for t in category.split("/") if t.strip()]
+
+
+class CardReferences:
+    """Result of a lookup: referenced card IDs (all printings) and traits."""
+
+    __slots__ = ("card_ids", "traits")
+
+    def __init__(self, card_ids: list[str], traits: list[str]):
+        self.card_ids = card_ids
+        self.traits = traits
+
+    def __bool__(self) -> bool:
+        return bool(self.card_ids or self.traits)
+
+    def to_dict(self) -> dict:
+        return {"cards": self.card_ids, "traits": self.traits}
+
+
+class CardReferenceIndex:
+    def __init__(self, entries: Iterable[tuple[str, str, str | None]]):
+        """Build from (card_id, name, category) of every card and leader."""
+        by_name: dict[str, list[str]] = defaultdict(list)
+        traits: dict[str, str] = {}
+        for card_id, name, category in entries:
+            by_name[name.lower()].append(card_id)
+            for trait in split_traits(category):
+                traits.setdefault(trait.lower(), trait)
+
+        # Pattern i resolves to _targets[i]: a list of card IDs or a trait name
+        patterns: list[str] = []
+        self._targets: list[list[str] | str] = []
+        for name, card_ids in by_name.items():
+            patterns.append(f"[{name}]")
+            self._targets.append(card_ids)
+        for lowered, trait in traits.items():
+            patterns.append(f"{{{lowered}}}")
+            self._targets.append(trait)
+        self._matcher = AhoCorasick(patterns)
+
+    def __len__(self) -> int:
+        return len(self._matcher)
+
+    def find(self, text: str | None, exclude: str | None = None) -> CardReferences:
+        """Cards and traits mentioned in ``text``, in order of first mention.
+
+        ``exclude`` drops a card ID, typically the card the text belongs to.
+        """
+        card_ids: list[str] = []
+        traits: list[str] = []
+        if not text:
+            return CardReferences(card_ids, traits)
+
+        seen: set[int] = set()
+        for _, index in self._matcher.iter_matches(text.lower()):
+            if index in seen:
+                continue
+            seen.add(index)
+            target = self._targets[index]
+            if isinstance(target, str):
+                traits.append(target)
+            else:
+                card_ids.extend(cid for cid in target if cid != exclude)
+        return CardReferences(card_ids, traits)
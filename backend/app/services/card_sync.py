@@ -1,82 +1,301 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
 import httpx
-from app.models import Card, Leader
+from app.config import settings
+from app.database import Base
+from app.models import Card, Leader, CatalogSync, SyncSource
+from app.services.colors import color_mask, parse_colors
+from app.services.deck_stats import refresh_deck_stats
+from app.services.fixture_transport import FixtureTransport
+from app.services.json_stream import iter_json_array
+from sqlalchemy import func, inspect, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class FetchResult:
+    """Outcome of one conditional fetch of every source endpoint."""
+
+    cards: list[dict] = field(default_factory=list)
+    by_source: dict[str, list[dict]] = field(default_factory=dict)  # url -> cards
+    not_modified: list[str] = field(default_factory=list)  # URLs that sent 304
+    failed: list[str] = field(default_factory=list)
+    validators: dict[str, dict] = field(default_factory=dict)  # url -> headers
+
+    @property
+    def complete(self) -> bool:
+        """True if every source returned a full payload."""
+        return not self.not_modified and not self.failed
+
+
 class OPTCGAPIClient:
     """Client for syncing cards from optcgapi.com"""
 
     SET_CARDS_URL = "https://optcgapi.com/api/allSetCards/"
     ST_CARDS_URL = "https://optcgapi.com/api/allSTCards/"
+    SOURCE_URLS = (SET_CARDS_URL, ST_CARDS_URL)
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        """
+        Args:
+            transport: Custom httpx transport. Defaults to replaying fixtures
+                from ``settings.card_sync_fixture_dir`` when that is set.
+        """
+        if transport is None and settings.card_sync_fixture_dir:
+            transport = FixtureTransport(settings.card_sync_fixture_dir)
+        self.transport = transport
 
     async def fetch_all_cards(self) -> list[dict]:
         """Fetch all cards from both set and starter deck endpoints"""
-        all_cards = []
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            for url in [self.SET_CARDS_URL, self.ST_CARDS_URL]:
-                try:
-                    logger.info(f"Fetching cards from {url}")
-                    response = await client.get(url)
-                    response.raise_for_status()
-                    data = response.json()
-                    if isinstance(data, list):
-                        logger.info(f"Got {len(data)} cards from {url}")
-                        all_cards.extend(data)
-                    else:
-                        logger.error(f"Unexpected response format from {url}: {type(data)}")
-                except httpx.HTTPError as e:
-                    logger.error(f"HTTP error fetching from {url}: {e}")
-                except Exception as e:
-                    logger.error(f"Error fetching from {url}: {e}")
-
-        logger.info(f"Total cards fetched: {len(all_cards)}")
-        return all_cards
-
-    async def sync_to_database(self, db: AsyncSession) -> dict:
-        """Sync all cards to database. Returns sync statistics."""
-        cards_data = await self.fetch_all_cards()
-
-        if not cards_data:
-            logger.warning("No cards fetched from API")
-            return {"cards_synced": 0, "leaders_synced": 0}
-
-        cards_synced = 0
-        leaders_synced = 0
-        errors = 0
-
-        for card_data in cards_data:
-            try:
-                card_type = card_data.get("card_type", "")
-                is_leader = card_type == "Leader"
+        result = await self.fetch_updates()
+        return result.cards
 
-                if is_leader:
-                    leader = self._map_leader(card_data)
-                    await db.merge(leader)
-                    leaders_synced += 1
-                else:
-                    card = self._map_card(card_data)
-                    await db.merge(card)
-                    cards_synced += 1
+    async def fetch_updates(
+        self, validators: dict[str, dict] | None = None
+    ) -> FetchResult:
+        """Fetch all source endpoints concurrently.
 
-            except Exception as e:
-                card_id = card_data.get("card_set_id", "unknown")
-                logger.error(f"Error syncing card {card_id}: {e}")
-                errors += 1
+        Args:
+            validators: Per-URL ``{"etag", "last_modified"}`` from the previous
+                fetch. Sources that have not changed answer 304 and are listed in
+                ``not_modified`` instead of contributing cards.
+        """
+        validators = validators or {}
+        result = FetchResult()
+
+        async with httpx.AsyncClient(timeout=60.0, transport=self.transport) as client:
+            responses = await asyncio.gather(
+                *(
+                    self._fetch_source(client, url, validators.get(url))
+                    for url in self.SOURCE_URLS
+                )
+            )
+
+        for url, (status, data, validator) in zip(self.SOURCE_URLS, responses):
+            if status == "ok":
+                result.cards.extend(data)
+                result.by_source[url] = data
+                result.validators[url] = validator
+            elif status == "not_modified":
+                result.not_modified.append(url)
+                result.validators[url] = validator
+            else:
+                result.failed.append(url)
+
+        logger.info(
+            f"Total cards fetched: {len(result.cards)} "
+            f"({len(result.not_modified)} source(s) unchanged)"
+        )
+        return result
+
+    async def stream_updates(
+        self,
+        sink: Callable[[dict, str], Awaitable[None]],
+        validators: dict[str, dict] | None = None,
+    ) -> FetchResult:
+        """Like fetch_updates, but hand each record and its source URL to
+        ``sink`` as it is parsed.
+
+        The returned FetchResult has an empty ``cards`` list.
+        """
+        validators = validators or {}
+        result = FetchResult()
+
+        async with httpx.AsyncClient(timeout=60.0, transport=self.transport) as client:
+            responses = await asyncio.gather(
+                *(
+                    self._stream_source(client, url, validators.get(url), sink)
+                    for url in self.SOURCE_URLS
+                )
+            )
+
+        for url, (status, validator) in zip(self.SOURCE_URLS, responses):
+            if status == "failed":
+                result.failed.append(url)
                 continue
+            if status == "not_modified":
+                result.not_modified.append(url)
+            result.validators[url] = validator
+        return result
+
+    async def _stream_source(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        validator: dict | None,
+        sink: Callable[[dict, str], Awaitable[None]],
+    ) -> tuple[str, dict | None]:
+        """Stream one endpoint into ``sink``. Returns (status, validator)."""
+        count = 0
+        try:
+            logger.info(f"Streaming cards from {url}")
+            async with client.stream(
+                "GET", url, headers=_conditional_headers(validator)
+            ) as response:
+                if response.status_code == 304:
+                    logger.info(f"Not modified since last sync: {url}")
+                    return "not_modified", validator
+                response.raise_for_status()
+                async for record in iter_json_array(response.aiter_text()):
+                    if isinstance(record, dict):
+                        await sink(record, url)
+                        count += 1
+                logger.info(f"Streamed {count} cards from {url}")
+                return "ok", {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error streaming from {url} after {count} cards: {e}")
+        except Exception as e:
+            logger.error(f"Error streaming from {url} after {count} cards: {e}")
+        return "failed", None
+
+    async def _fetch_source(
+        self, client: httpx.AsyncClient, url: str, validator: dict | None
+    ) -> tuple[str, list[dict] | None, dict | None]:
+        """GET one endpoint. Returns (status, cards, validator)."""
+        try:
+            logger.info(f"Fetching cards from {url}")
+            response = await client.get(url, headers=_conditional_headers(validator))
+            if response.status_code == 304:
+                logger.info(f"Not modified since last sync: {url}")
+                return "not_modified", None, validator
+            response.raise_for_status()
+            data = response.json()
+            if not isinstance(data, list):
+                logger.error(f"Unexpected response format from {url}: {type(data)}")
+                return "failed", None, None
+            logger.info(f"Got {len(data)} cards from {url}")
+            return "ok", data, {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error fetching from {url}: {e}")
+        except Exception as e:
+            logger.error(f"Error fetching from {url}: {e}")
+        return "failed", None, None
+
+    async def sync_to_database(
+        self,
+        db: AsyncSession,
+        chunk_size: int | None = None,
+        force: bool = False,
+        stream: bool | None = None,
+    ) -> dict:
+        """Sync all cards to database. Returns sync statistics and a diff report.
+
+        Each row carries a hash of its synced content; only rows that are new or
+        whose hash changed are written. The diff report lists added, changed
+        and removed IDs (removed rows are reported, not deleted: decks may
+        still reference them). The catalog version is only bumped when the
+        diff is non-empty, so downstream caches stay valid across no-op syncs.
+
+        Upstream responses are fetched conditionally against the validators
+        stored by the previous sync; pass ``force=True`` to refetch everything.
+
+        With ``stream=True`` (default: ``settings.card_sync_streaming``) the
+        responses are parsed incrementally and written in ``chunk_size``
+        batches as records arrive, so peak memory does not grow with the
+        size of the catalog.
+        """
+        chunk_size = chunk_size or settings.card_sync_chunk_size
+        if stream is None:
+            stream = settings.card_sync_streaming
+        validators = None if force else await _load_validators(db)
+
+        stored_cards, stored_leaders = await _stored_hashes(db)
+        writer = _SyncWriter(self, db, stored_cards, stored_leaders, chunk_size)
 
-        await db.commit()
+        started = time.perf_counter()
+        if stream:
+            fetched = await self.stream_updates(writer.add, validators)
+        else:
+            fetched = await self.fetch_updates(validators)
+            for url, cards in fetched.by_source.items():
+                for card_data in cards:
+                    await writer.add(card_data, url)
+        await writer.flush()
+        elapsed = time.perf_counter() - started
+
+        if not writer.records:
+            version = (await db.execute(select(func.max(CatalogSync.id)))).scalar()
+            if fetched.not_modified and not fetched.failed:
+                logger.info("Upstream catalog unchanged, nothing to sync")
+            else:
+                logger.warning("No cards fetched from API")
+            await _save_validators(db, fetched.validators)
+            await db.commit()
+            return {
+                "cards_synced": 0,
+                "leaders_synced": 0,
+                "not_modified": fetched.not_modified,
+                "seconds": round(elapsed, 3),
+                "catalog_changed": False,
+                "catalog_version": version,
+            }
+
+        # Removals can only be inferred when every source sent a full payload
+        diff = writer.diff(track_removed=fetched.complete)
+        synced = writer.cards_synced + writer.leaders_synced
+        stats = {
+            "cards_synced": writer.cards_synced,
+            "leaders_synced": writer.leaders_synced,
+            "unchanged": writer.unchanged,
+            "not_modified": fetched.not_modified,
+            "errors": writer.errors,
+            "streamed": stream,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(synced / elapsed, 1) if elapsed > 0 else None,
+        }
+        catalog_changed = bool(diff["added"] or diff["changed"])
+        # A source whose rows did not all land is refetched in full next time
+        if writer.failed_sources:
+            logger.warning(
+                f"Not storing validators for sources with errors: "
+                f"{', '.join(sorted(writer.failed_sources))}"
+            )
+        await _save_validators(
+            db,
+            {
+                url: validator
+                for url, validator in fetched.validators.items()
+                if url not in writer.failed_sources
+            },
+        )
+
+        if catalog_changed:
+            # Decks running a card whose values changed get fresh stats
+            await refresh_deck_stats(db, diff["changed"], chunk_size)
+            # Record the sync; its id is the new catalog version
+            sync = CatalogSync(stats={**stats, "diff": diff})
+            db.add(sync)
+            await db.commit()
+            version = sync.id
+        else:
+            await db.commit()
+            version = (await db.execute(select(func.max(CatalogSync.id)))).scalar()
 
         logger.info(
-            f"Sync complete: {cards_synced} cards, {leaders_synced} leaders synced, {errors} errors"
+            f"Sync complete: {len(diff['added'])} added, {len(diff['changed'])} changed, "
+            f"{len(diff['removed'])} removed, {stats['unchanged']} unchanged, "
+            f"{writer.errors} errors (catalog v{version})"
         )
 
         return {
-            "cards_synced": cards_synced,
-            "leaders_synced": leaders_synced,
-            "errors": errors,
+            **stats,
+            "diff": diff,
+            "catalog_changed": catalog_changed,
+            "catalog_version": version,
         }
 
     def _safe_int(self, value) -> int | None:
@@ -94,23 +313,6 @@ class OPTCGAPIClient:
             return None
         return set_id.replace("-", "")
 
-    def _parse_colors(self, color_str: str | None) -> list[str]:
-        """Parse color string into list of colors.
-
-        The API uses space-separated colors for multi-color cards (e.g. "Green Red").
-        Valid OPTCG colors: Red, Green, Blue, Purple, Black, Yellow.
-        """
-        if not color_str:
-            return []
-        valid_colors = {"Red", "Green", "Blue", "Purple", "Black", "Yellow"}
-        # Split on spaces and check if each token is a valid color
-        tokens = color_str.strip().split()
-        colors = [t for t in tokens if t in valid_colors]
-        if colors:
-            return colors
-        # Fallback: return the whole string as a single color
-        return [color_str.strip()]
-
     def _map_card(self, data: dict) -> Card:
         """Map API card data to Card model."""
         return Card(
@@ -118,6 +320,7 @@ class OPTCGAPIClient:
             name=data.get("card_name", ""),
             type=data.get("card_type", "Character"),
             color=data.get("card_color"),
+            color_mask=color_mask(data.get("card_color")),
             cost=self._safe_int(data.get("card_cost")),
             power=self._safe_int(data.get("card_power")),
             counter=self._safe_int(data.get("counter_amount")),
@@ -131,12 +334,14 @@ class OPTCGAPIClient:
 
     def _map_leader(self, data: dict) -> Leader:
         """Map API card data to Leader model."""
+        colors = parse_colors(data.get("card_color"))
         return Leader(
             id=data["card_set_id"],
             name=data.get("card_name", ""),
             life=self._safe_int(data.get("life")) or 5,
             power=self._safe_int(data.get("card_power")),
-            colors=self._parse_colors(data.get("card_color")),
+            colors=colors,
+            color_mask=color_mask(colors),
             attribute=data.get("attribute"),
             text=data.get("card_text"),
             featured_character=data.get("card_name"),
@@ -144,3 +349,249 @@ class OPTCGAPIClient:
             set_code=self._extract_set_code(data.get("set_id")),
             image_url=data.get("card_image"),
         )
+
+
+# ── Bulk upsert ──
+
+# Columns the sync never writes: timestamps are managed by the database and
+# text_search is a generated column.
+_NON_SYNCED_COLUMNS = {"created_at", "updated_at", "text_search"}
+
+
+def _row(obj: Base) -> dict:
+    """Column values a mapper set on a transient model instance."""
+    state = inspect(obj)
+    return {
+        attr.key: attr.loaded_value
+        for attr in state.attrs
+        if attr.key in state.dict and attr.key not in _NON_SYNCED_COLUMNS
+    }
+
+
+def _hashed(row: dict) -> dict:
+    """Add a content hash over the synced columns to a mapped row."""
+    payload = json.dumps(row, sort_keys=True, separators=(",", ":"), default=str)
+    row["content_hash"] = hashlib.sha256(payload.encode()).hexdigest()
+    return row
+
+
+async def _stored_hashes(
+    db: AsyncSession,
+) -> tuple[dict[str, str | None], dict[str, str | None]]:
+    """Current content hashes for cards and leaders, fetched in one query."""
+    query = union_all(
+        select(literal("card").label("kind"), Card.id, Card.content_hash),
+        select(literal("leader").label("kind"), Leader.id, Leader.content_hash),
+    )
+    cards: dict[str, str | None] = {}
+    leaders: dict[str, str | None] = {}
+    for kind, row_id, content_hash in (await db.execute(query)).all():
+        (cards if kind == "card" else leaders)[row_id] = content_hash
+    return cards, leaders
+
+
+def _conditional_headers(validator: dict | None) -> dict:
+    headers = {}
+    if validator:
+        if validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if validator.get("last_modified"):
+            headers["If-Modified-Since"] = validator["last_modified"]
+    return headers
+
+
+class _SyncWriter:
+    """Maps fetched records, diffs them against stored hashes and upserts
+    changed rows in fixed-size batches.
+
+    Records can arrive from several concurrent sources; a lock keeps the
+    shared session and batches consistent. Only IDs and hashes are kept for
+    the whole sync, never the full rows. An ID repeated in the feed counts
+    once, with the content of its last record.
+    """
+
+    def __init__(
+        self,
+        client: "OPTCGAPIClient",
+        db: AsyncSession,
+        stored_cards: dict[str, str | None],
+        stored_leaders: dict[str, str | None],
+        chunk_size: int,
+    ):
+        self.client = client
+        self.db = db
+        self.chunk_size = chunk_size
+        self._lock = asyncio.Lock()
+        # Hashes before the sync, which the diff is taken against
+        self._stored = {Card: stored_cards, Leader: stored_leaders}
+        # Hash each row has in the table, updated as batches are written
+        self._written = {Card: dict(stored_cards), Leader: dict(stored_leaders)}
+        # Hash of the last record per ID: the feed repeats IDs with different
+        # content (alternate arts), and the last one wins
+        self._latest: dict = {Card: {}, Leader: {}}
+        # Keyed by id: one upsert statement cannot touch a row twice
+        self._batches: dict = {Card: {}, Leader: {}}
+        self._batch_sources: dict = {Card: {}, Leader: {}}  # id -> source URL
+        self.failed_sources: set[str] = set()
+        self.records = 0
+        self.errors = 0
+        self.cards_synced = 0
+        self.leaders_synced = 0
+
+    async def add(self, card_data: dict, source: str | None = None) -> None:
+        async with self._lock:
+            self.records += 1
+            try:
+                if card_data.get("card_type", "") == "Leader":
+                    model = Leader
+                    row = _hashed(_row(self.client._map_leader(card_data)))
+                else:
+                    model = Card
+                    row = _hashed(_row(self.client._map_card(card_data)))
+            except Exception as e:
+                card_id = card_data.get("card_set_id", "unknown")
+                logger.error(f"Error syncing card {card_id}: {e}")
+                self.errors += 1
+                self._source_failed(source)
+                return
+
+            row_id = row["id"]
+            content_hash = row["content_hash"]
+            self._latest[model][row_id] = content_hash
+            batch = self._batches[model]
+            if self._written[model].get(row_id) == content_hash:
+                # A repeat may restore what the table holds; drop its pending write
+                batch.pop(row_id, None)
+                self._batch_sources[model].pop(row_id, None)
+                return
+
+            batch[row_id] = row
+            self._batch_sources[model][row_id] = source
+            if len(batch) >= self.chunk_size:
+                await self._flush_model(model)
+
+    @property
+    def unchanged(self) -> int:
+        return sum(
+            1
+            for model in (Card, Leader)
+            for row_id, content_hash in self._latest[model].items()
+            if self._stored[model].get(row_id) == content_hash
+        )
+
+    async def flush(self) -> None:
+        async with self._lock:
+            for model in (Card, Leader):
+                await self._flush_model(model)
+
+    async def _flush_model(self, model: type[Base]) -> None:
+        batch = self._batches[model]
+        if not batch:
+            return
+        rows = list(batch.values())
+        sources = self._batch_sources[model]
+        batch.clear()
+        written, failed = await _upsert_rows(self.db, model, rows, self.chunk_size)
+        self.errors += len(failed)
+        for row_id in failed:
+            self._source_failed(sources.get(row_id))
+        written_hashes = self._written[model]
+        for row in rows:
+            if row["id"] not in failed:
+                written_hashes[row["id"]] = row["content_hash"]
+        sources.clear()
+        if model is Card:
+            self.cards_synced += written
+        else:
+            self.leaders_synced += written
+
+    def _source_failed(self, source: str | None) -> None:
+        if source is not None:
+            self.failed_sources.add(source)
+
+    def diff(self, track_removed: bool = True) -> dict:
+        """IDs whose final content this sync differs from before it."""
+        added, changed, removed = [], [], []
+        for model in (Card, Leader):
+            stored, latest = self._stored[model], self._latest[model]
+            for row_id, content_hash in latest.items():
+                if row_id not in stored:
+                    added.append(row_id)
+                elif stored[row_id] != content_hash:
+                    changed.append(row_id)
+            if track_removed:
+                removed.extend(sorted(set(stored) - set(latest)))
+        return {"added": added, "changed": changed, "removed": removed}
+
+
+async def _load_validators(db: AsyncSession) -> dict[str, dict]:
+    result = await db.execute(select(SyncSource))
+    return {
+        s.url: {"etag": s.etag, "last_modified": s.last_modified}
+        for s in result.scalars().all()
+    }
+
+
+async def _save_validators(db: AsyncSession, validators: dict[str, dict]) -> None:
+    """Store the validators in the sync transaction, so they only advance
+    together with the data they describe."""
+    if not validators:
+        return
+    rows = [
+        {"url": url, "etag": v.get("etag"), "last_modified": v.get("last_modified")}
+        for url, v in validators.items()
+    ]
+    stmt = pg_insert(SyncSource).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[SyncSource.url],
+            set_={
+                "etag": stmt.excluded.etag,
+                "last_modified": stmt.excluded.last_modified,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def _upsert_statement(model: type[Base], rows: list[dict]):
+    stmt = pg_insert(model).values(rows)
+    update = {key: stmt.excluded[key] for key in rows[0] if key != "id"}
+    update["updated_at"] = func.now()
+    return stmt.on_conflict_do_update(index_elements=[model.id], set_=update)
+
+
+async def _upsert_rows(
+    db: AsyncSession, model: type[Base], rows: list[dict], chunk_size: int
+) -> tuple[int, set[str]]:
+    """Upsert rows in chunks. Returns (rows written, IDs of the rows that failed).
+
+    Each chunk runs in a savepoint; if it fails, only that chunk is retried
+    row by row so one bad record does not sink the rest of the sync.
+    """
+    written = 0
+    failed: set[str] = set()
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start : start + chunk_size]
+        try:
+            async with db.begin_nested():
+                await db.execute(_upsert_statement(model, chunk))
+            written += len(chunk)
+            continue
+        except Exception as e:
+            logger.warning(
+                f"Bulk upsert of {len(chunk)} {model.__tablename__} rows failed, "
+                f"retrying row by row: {e}"
+            )
+
+        for row in chunk:
+            try:
+                async with db.begin_nested():
+                    await db.execute(_upsert_statement(model, [row]))
+                written += 1
+            except Exception as e:
+                logger.error(f"Error syncing card {row.get('id', 'unknown')}: {e}")
+                failed.add(row.get("id"))
+
+    return written, failed
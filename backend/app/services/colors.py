@@ -0,0 +1,73 @@
+"""Card color model — one parser and one bitmask encoding for the whole backend.
+
+Each OPTCG color maps to one bit, so a card's colors fit in a smallint and the
+leader color-identity rule becomes ``card_mask & ~leader_mask == 0``. Colors
+outside COLOR_BITS have no bit; a card with no recognised color encodes to 0,
+which is never legal.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+COLOR_BITS = {
+    "Red": 1,
+    "Green": 2,
+    "Blue": 4,
+    "Purple": 8,
+    "Black": 16,
+    "Yellow": 32,
+}
+ALL_COLORS = sum(COLOR_BITS.values())
+
+
+def parse_colors(color_str: str | None) -> list[str]:
+    """Parse a color string into a list of colors.
+
+    Handles both space-separated (optcgapi, e.g. "Green Red") and
+    comma-separated (legacy, e.g. "Red,Blue") formats. Unrecognized strings
+    are returned whole as a single color.
+    """
+    if not color_str:
+        return []
+    tokens = color_str.replace(",", " ").split()
+    colors = [t for t in tokens if t in COLOR_BITS]
+    if colors:
+        return colors
+    # Fallback: return the whole string as a single color
+    return [color_str.strip()]
+
+
+def color_mask(colors: str | Iterable[str] | None) -> int:
+    """Encode a color string or list of colors as a bitmask."""
+    if colors is None:
+        return 0
+    if isinstance(colors, str):
+        colors = parse_colors(colors)
+    mask = 0
+    for color in colors:
+        mask |= COLOR_BITS.get(color.strip(), 0)
+    return mask
+
+
+def color_bit(color: str) -> int | None:
+    """Bit for a single (case-insensitive) color name, or None if unknown."""
+    return COLOR_BITS.get(color.strip().capitalize())
+
+
+# Every combination of the six colors, decoded once
+_MASK_COLORS = [
+    tuple(color for color, bit in COLOR_BITS.items() if mask & bit)
+    for mask in range(1 << len(COLOR_BITS))
+]
+
+
+def mask_to_colors(mask: int) -> list[str]:
+    """Decode a bitmask back into color names, in canonical order."""
+    return list(_MASK_COLORS[mask & (len(_MASK_COLORS) - 1)])
+
+
+def is_color_legal(card_mask: int, leader_mask: int) -> bool:
+    """True if the card has a recognised color and every color of it is one
+    of the leader's colors."""
+    return card_mask != 0 and card_mask & ~leader_mask == 0
@@ -0,0 +1,169 @@
+"""Deck consistency: exact odds of drawing card groups by each turn.
+
+A group is every card in the deck matching all of its criteria (a cost
+range, a trait, an effect keyword, a type or explicit card IDs). Odds come
+from the closed forms in ``probability``; no sampling is involved.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+
+from app.services.card_references import split_traits
+from app.services.draw_simulator import OPENING_HAND, cards_seen
+from app.services.probability import (
+    expected_successes,
+    prob_all_at_least_by_draws,
+    prob_at_least,
+)
+
+
+class CardGroup:
+    """Cards matching every given criterion; unset criteria match anything."""
+
+    def __init__(
+        self,
+        label: str | None = None,
+        card_ids: Sequence[str] | None = None,
+        cost_min: int | None = None,
+        cost_max: int | None = None,
+        trait: str | None = None,
+        keyword: str | None = None,
+        card_type: str | None = None,
+        min_copies: int = 1,
+    ):
+        self.card_ids = set(card_ids) if card_ids else None
+        self.cost_min = cost_min
+        self.cost_max = cost_max
+        self.trait = trait.lower() if trait else None
+        self.keyword = keyword.lower() if keyword else None
+        self.card_type = card_type.lower() if card_type else None
+        self.min_copies = min_copies
+        self.label = label or self._describe(trait, keyword)
+
+    @classmethod
+    def from_spec(cls, spec: dict) -> "CardGroup":
+        """From a CardGroupSpec dump or tool arguments"""
+        return cls(
+            label=spec.get("label"),
+            card_ids=spec.get("card_ids"),
+            cost_min=spec.get("cost_min"),
+            cost_max=spec.get("cost_max"),
+            trait=spec.get("trait"),
+            keyword=spec.get("keyword"),
+            card_type=spec.get("type"),
+            min_copies=spec.get("min_copies") or 1,
+        )
+
+    @classmethod
+    def for_cost(cls, cost: int) -> "CardGroup":
+        return cls(cost_min=cost, cost_max=cost)
+
+    def matches(self, card: Any) -> bool:
+        if self.card_ids is not None and card.id not in self.card_ids:
+            return False
+        if self.cost_min is not None or self.cost_max is not None:
+            if card.cost is None:
+                return False
+            if self.cost_min is not None and card.cost < self.cost_min:
+                return False
+            if self.cost_max is not None and card.cost > self.cost_max:
+                return False
+        if self.trait and self.trait not in (t.lower() for t in split_traits(card.category)):
+            return False
+        if self.keyword and self.keyword not in (card.text or "").lower():
+            return False
+        if self.card_type and (card.type or "").lower() != self.card_type:
+            return False
+        return True
+
+    def _describe(self, trait: str | None, keyword: str | None) -> str:
+        parts = []
+        if self.card_ids is not None:
+            parts.append(", ".join(sorted(self.card_ids)))
+        if self.cost_min is not None and self.cost_min == self.cost_max:
+            parts.append(f"cost {self.cost_min}")
+        elif self.cost_max is not None:
+            parts.append(f"cost {self.cost_min or 0}-{self.cost_max}")
+        elif self.cost_min is not None:
+            parts.append(f"cost {self.cost_min}+")
+        if self.card_type:
+            parts.append(self.card_type)
+        if trait:
+            parts.append(f"{{{trait}}}")
+        if keyword:
+            parts.append(f"'{keyword}'")
+        return " ".join(parts) or "any card"
+
+
+def analyze_consistency(
+    lines: Iterable[tuple[Any, int]],
+    groups: Sequence[CardGroup] = (),
+    turns: int = 5,
+    going_first: bool = True,
+) -> dict:
+    """Exact per-turn odds of drawing each group (and all of them together).
+
+    Without groups, each cost in the deck is a group of its own and no
+    combined odds are given.
+    """
+    lines = [(card, qty) for card, qty in lines if qty > 0]
+    deck_size = sum(qty for _, qty in lines)
+    combine = len(groups) > 1
+    if not groups:
+        costs = sorted({card.cost for card, _ in lines if card.cost is not None})
+        groups = [CardGroup.for_cost(cost) for cost in costs]
+
+    # Cards belonging to exactly the same groups form one cell
+    cells: dict[int, int] = {}
+    members: list[list[str]] = [[] for _ in groups]
+    copies = [0] * len(groups)
+    for card, qty in lines:
+        bits = 0
+        for i, group in enumerate(groups):
+            if group.matches(card):
+                bits |= 1 << i
+                copies[i] += qty
+                members[i].append(card.id)
+        if bits:
+            cells[bits] = cells.get(bits, 0) + qty
+
+    seen = [min(cards_seen(t, going_first), deck_size) for t in range(1, turns + 1)]
+    results = []
+    for i, group in enumerate(groups):
+        results.append({
+            "label": group.label,
+            "copies": copies[i],
+            "min_copies": group.min_copies,
+            "card_ids": members[i],
+            "opening_hand": round(
+                prob_at_least(group.min_copies, deck_size, copies[i], OPENING_HAND), 4
+            ),
+            "by_turn": [
+                {
+                    "turn": t + 1,
+                    "cards_seen": n,
+                    "probability": round(
+                        prob_at_least(group.min_copies, deck_size, copies[i], n), 4
+                    ),
+                    "expected_copies": round(expected_successes(deck_size, copies[i], n), 2),
+                }
+                for t, n in enumerate(seen)
+            ],
+        })
+
+    joint = None
+    if combine:
+        needs = [group.min_copies for group in groups]
+        cell_list = [(qty, bits) for bits, qty in cells.items()]
+        joint = [
+            round(p, 4)
+            for p in prob_all_at_least_by_draws(cell_list, needs, deck_size, seen)
+        ]
+
+    return {
+        "deck_size": deck_size,
+        "going_first": going_first,
+        "groups": results,
+        "all_groups": joint,
+    }
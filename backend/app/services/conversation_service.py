@@ -3,7 +3,7 @@ import logging
 from uuid import UUID
 
 import redis.asyncio as aioredis
-from sqlalchemy import select, desc, func, literal_column
+from sqlalchemy import select, desc, func, literal_column, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -54,10 +54,19 @@ class ConversationService:
         db: AsyncSession,
         limit: int = 20,
         offset: int = 0,
+        after: tuple | None = None,
     ) -> list[Conversation]:
+        """List conversations, most recently active first.
+
+        ``after`` is the (updated_at, id) key of the last row already seen.
+        """
+        query = select(Conversation)
+        if after is not None:
+            query = query.where(
+                tuple_(Conversation.updated_at, Conversation.id) < after
+            )
         result = await db.execute(
-            select(Conversation)
-            .order_by(desc(Conversation.updated_at))
+            query.order_by(desc(Conversation.updated_at), desc(Conversation.id))
             .limit(limit)
             .offset(offset)
         )
@@ -268,11 +277,17 @@ class ConversationService:
         conversation_id: UUID,
         limit: int = 50,
         offset: int = 0,
+        after: tuple | None = None,
     ) -> list[Message]:
+        """Page through a conversation in order.
+
+        ``after`` is the (created_at, id) key of the last message already seen.
+        """
+        query = select(Message).where(Message.conversation_id == conversation_id)
+        if after is not None:
+            query = query.where(tuple_(Message.created_at, Message.id) > after)
         result = await db.execute(
-            select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at)
+            query.order_by(Message.created_at, Message.id)
             .limit(limit)
             .offset(offset)
         )
@@ -0,0 +1,342 @@
+"""CooccurrenceIndex — which cards players run together, from the stored decks.
+
+Each deck counts as the set of distinct cards in it. Per leader (and over
+all decks) the index keeps how many decks contain each card and each pair of
+cards, as sparse rows: row ``a`` lists every card ``b`` seen with ``a`` and
+n(a, b), the number of decks running both. From those counts
+
+    PMI(a, b) = log( n(a, b) * N / (n(a) * n(b)) )
+
+measures how much more often ``b`` is played with ``a`` than by chance.
+"Cards frequently played with this deck" scores every neighbour of the
+deck's cards by
+
+    sum over the deck's cards a of  P(b | a) * (1 + max(PMI(a, b), 0))
+
+so staples of the archetype rank by how often they are played, lifted when
+they are played *because of* the deck's cards, while rare cards that
+happen to share a deck or two (where PMI alone is largest) stay at the
+bottom. Only the rows of the deck's own cards are read: one ``bincount``
+over their concatenated entries, a millisecond or so per query.
+
+Saving, editing or deleting a deck updates the counts in place: the deck's
+old card set is subtracted and the new one added. Only the rows it touches
+change; each row's arrays are rebuilt on its next query. A full rebuild
+from the database runs at startup.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Container, Iterable
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Deck, DeckCard
+
+logger = logging.getLogger(__name__)
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+def _pairs(decks: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Every ordered (a, b) pair of distinct cards within each deck."""
+    triu: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+    src, dst = [], []
+    for cards in decks:
+        m = len(cards)
+        if m not in triu:
+            triu[m] = np.triu_indices(m, 1)
+        i, j = triu[m]
+        src += [cards[i], cards[j]]
+        dst += [cards[j], cards[i]]
+    if not src:
+        return _EMPTY, _EMPTY
+    return np.concatenate(src), np.concatenate(dst)
+
+
+class _Counts:
+    """Deck, card and pair counts for one group of decks.
+
+    A row lives as arrays (fast to score) and/or a dict (cheap to update);
+    an update moves it to the dict and drops its arrays.
+    """
+
+    def __init__(self):
+        self.decks = 0
+        self.cards = np.zeros(64, dtype=np.int64)
+        self._arrays: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._dicts: dict[int, dict[int, int]] = {}
+
+    @classmethod
+    def from_decks(cls, decks: list[np.ndarray], vocab_size: int) -> "_Counts":
+        """Bulk-build from decks given as arrays of distinct card numbers."""
+        counts = cls()
+        counts.decks = len(decks)
+        counts.cards = np.zeros(max(vocab_size, 64), dtype=np.int64)
+        if decks:
+            np.add.at(counts.cards, np.concatenate(decks), 1)
+        src, dst = _pairs(decks)
+        codes, n = np.unique(src * vocab_size + dst, return_counts=True)
+        if len(codes):
+            rows, cols = np.divmod(codes, vocab_size)
+            bounds = np.flatnonzero(np.diff(rows)) + 1
+            starts = np.concatenate(([0], bounds))
+            for a, ids, row_counts in zip(
+                rows[starts].tolist(), np.split(cols, bounds), np.split(n, bounds)
+            ):
+                counts._arrays[a] = (ids, row_counts)
+        return counts
+
+    def _grow(self, size: int) -> None:
+        if size > len(self.cards):
+            grown = np.zeros(max(size, 2 * len(self.cards)), dtype=np.int64)
+            grown[: len(self.cards)] = self.cards
+            self.cards = grown
+
+    def _row_dict(self, a: int) -> dict[int, int]:
+        row = self._dicts.get(a)
+        if row is None:
+            ids, n = self._arrays.get(a, (_EMPTY, _EMPTY))
+            row = self._dicts[a] = dict(zip(ids.tolist(), n.tolist()))
+        self._arrays.pop(a, None)
+        return row
+
+    def row(self, a: int) -> tuple[np.ndarray, np.ndarray]:
+        """(neighbour card numbers, n(a, b)) for card ``a``"""
+        arrays = self._arrays.get(a)
+        if arrays is None:
+            row = self._dicts.get(a)
+            if not row:
+                return _EMPTY, _EMPTY
+            arrays = self._arrays[a] = (
+                np.fromiter(row.keys(), dtype=np.int64, count=len(row)),
+                np.fromiter(row.values(), dtype=np.int64, count=len(row)),
+            )
+        return arrays
+
+    def update(self, cards: np.ndarray, step: int) -> None:
+        self.decks += step
+        self._grow(int(cards.max()) + 1)
+        self.cards[cards] += step
+        for a in cards.tolist():
+            row = self._row_dict(a)
+            for b in cards.tolist():
+                if b != a:
+                    n = row.get(b, 0) + step
+                    if n > 0:
+                        row[b] = n
+                    else:
+                        row.pop(b, None)
+            if not row:
+                del self._dicts[a]
+
+    def score(
+        self, seeds: list[int], min_support: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score and best single-seed support of every card number"""
+        ids, contributions, support = [], [], []
+        n = self.decks
+        for a in seeds:
+            if a >= len(self.cards) or not self.cards[a]:
+                continue
+            b, n_ab = self.row(a)
+            keep = n_ab >= min_support
+            b, n_ab = b[keep], n_ab[keep]
+            n_a = self.cards[a]
+            pmi = np.log(n_ab * n / (n_a * self.cards[b]))
+            ids.append(b)
+            contributions.append(n_ab / n_a * (1 + np.maximum(pmi, 0)))
+            support.append(n_ab)
+        size = len(self.cards)
+        if not ids:
+            return np.zeros(size), np.zeros(size, dtype=np.int64)
+        ids = np.concatenate(ids)
+        scores = np.bincount(ids, weights=np.concatenate(contributions), minlength=size)
+        best = np.zeros(size, dtype=np.int64)
+        np.maximum.at(best, ids, np.concatenate(support))
+        return scores, best
+
+
+class CooccurrenceIndex:
+    """Co-occurrence counts per leader and over all decks, kept incrementally."""
+
+    def __init__(self):
+        self._numbers: dict[str, int] = {}  # card ID -> row number
+        self._card_ids: list[str] = []
+        self._decks: dict[UUID, tuple[str | None, np.ndarray]] = {}
+        self._all = _Counts()
+        self._by_leader: dict[str, _Counts] = {}
+
+    @classmethod
+    def from_decks(
+        cls, decks: Iterable[tuple[UUID, str | None, Iterable[str]]]
+    ) -> "CooccurrenceIndex":
+        """Bulk-build from (deck_id, leader_id, card_ids); much faster than record()."""
+        index = cls()
+        by_leader: dict[str, list[np.ndarray]] = {}
+        every = []
+        for deck_id, leader_id, card_ids in decks:
+            cards = index._encode(card_ids)
+            if not len(cards):
+                continue
+            index._decks[deck_id] = (leader_id, cards)
+            every.append(cards)
+            if leader_id:
+                by_leader.setdefault(leader_id, []).append(cards)
+        size = len(index._card_ids)
+        index._all = _Counts.from_decks(every, size)
+        index._by_leader = {
+            leader_id: _Counts.from_decks(group, size)
+            for leader_id, group in by_leader.items()
+        }
+        return index
+
+    @property
+    def deck_count(self) -> int:
+        return len(self._decks)
+
+    @property
+    def leader_count(self) -> int:
+        return len(self._by_leader)
+
+    def leader_deck_count(self, leader_id: str) -> int:
+        counts = self._by_leader.get(leader_id)
+        return counts.decks if counts else 0
+
+    def _encode(self, card_ids: Iterable[str]) -> np.ndarray:
+        numbers = []
+        for card_id in dict.fromkeys(card_ids):
+            number = self._numbers.get(card_id)
+            if number is None:
+                number = self._numbers[card_id] = len(self._card_ids)
+                self._card_ids.append(card_id)
+            numbers.append(number)
+        return np.array(numbers, dtype=np.int64)
+
+    def record(self, deck_id: UUID, leader_id: str | None, card_ids: Iterable[str]) -> None:
+        """Add a deck, or replace what was recorded for it before."""
+        self.forget(deck_id)
+        cards = self._encode(card_ids)
+        if not len(cards):
+            return
+        self._decks[deck_id] = (leader_id, cards)
+        self._all.update(cards, 1)
+        if leader_id:
+            self._by_leader.setdefault(leader_id, _Counts()).update(cards, 1)
+
+    def forget(self, deck_id: UUID) -> None:
+        recorded = self._decks.pop(deck_id, None)
+        if recorded is None:
+            return
+        leader_id, cards = recorded
+        self._all.update(cards, -1)
+        if leader_id:
+            counts = self._by_leader[leader_id]
+            counts.update(cards, -1)
+            if not counts.decks:
+                del self._by_leader[leader_id]
+
+    def recommend(
+        self,
+        card_ids: Iterable[str],
+        leader_id: str | None = None,
+        k: int = 20,
+        allowed: Container[str] | None = None,
+    ) -> list[dict]:
+        """Cards most often played alongside ``card_ids``, strongest first.
+
+        Uses the decks of ``leader_id`` once it has enough of them, otherwise
+        every deck. Cards already in ``card_ids`` are never returned; with
+        ``allowed`` (e.g. a leader's legal pool) only cards in it are.
+        """
+        counts = self._by_leader.get(leader_id) if leader_id else None
+        scope = leader_id
+        if counts is None or counts.decks < settings.cooccurrence_min_leader_decks:
+            counts, scope = self._all, None
+        if not counts.decks:
+            return []
+
+        # Card numbers are shared by every scope; cards first seen after this
+        # scope's counts were sized have no counts in it
+        seeds = [
+            number
+            for number in (self._numbers.get(cid) for cid in set(card_ids))
+            if number is not None and number < len(counts.cards)
+        ]
+        scores, support = counts.score(seeds, settings.cooccurrence_min_support)
+        scores[seeds] = 0
+        candidates = np.flatnonzero(scores > 0)
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+        results = []
+        for j in candidates.tolist():
+            card_id = self._card_ids[j]
+            if allowed is not None and card_id not in allowed:
+                continue
+            results.append({
+                "card_id": card_id,
+                "score": round(float(scores[j]), 3),
+                "decks_with_seed": int(support[j]),
+                "play_rate": round(int(counts.cards[j]) / counts.decks, 4),
+                "leader_id": scope,
+                "deck_count": counts.decks,
+            })
+            if len(results) == k:
+                break
+        return results
+
+
+async def load_cooccurrence(db: AsyncSession) -> CooccurrenceIndex:
+    """Build an index from every stored deck, streaming the card lines."""
+    result = await db.stream(
+        select(Deck.id, Deck.leader_id, DeckCard.card_id)
+        .join(DeckCard, DeckCard.deck_id == Deck.id)
+        .where(DeckCard.quantity > 0)
+        .order_by(Deck.id)
+    )
+    decks = []
+    current = None
+    async for deck_id, leader_id, card_id in result:
+        if deck_id != current:
+            current = deck_id
+            decks.append((deck_id, leader_id, []))
+        decks[-1][2].append(card_id)
+    return CooccurrenceIndex.from_decks(decks)
+
+
+# ── Process-wide index ──
+
+_index: CooccurrenceIndex | None = None
+
+
+def get_cooccurrence() -> CooccurrenceIndex | None:
+    """Return the current index, or None if it has not been built yet."""
+    return _index
+
+
+async def refresh_cooccurrence(db: AsyncSession) -> CooccurrenceIndex:
+    """Rebuild the index from the database and swap it in."""
+    global _index
+    index = await load_cooccurrence(db)
+    _index = index
+    logger.info(
+        f"Co-occurrence index built: {index.deck_count} decks, "
+        f"{index.leader_count} leaders"
+    )
+    return index
+
+
+def record_deck(deck_id: UUID, leader_id: str | None, card_ids: Iterable[str]) -> None:
+    """Fold a saved deck into the index (no-op until it has been built)."""
+    if _index is not None:
+        _index.record(deck_id, leader_id, card_ids)
+
+
+def forget_deck(deck_id: UUID) -> None:
+    if _index is not None:
+        _index.forget(deck_id)
@@ -0,0 +1,342 @@
+"""Bulk deck validation and stats for NDJSON decklists.
+
+Each input line is one decklist::
+
+    {"ref": "player-17", "leader_id": "OP01-001", "cards": [{"card_id": "OP01-013", "quantity": 4}, ...]}
+
+A batch is flattened to one row per card line (deck, catalog row, quantity),
+so every rule check and every DeckStats figure is a mask or ``bincount`` over
+those arrays rather than a Python loop per card. Only the errors that are
+found are formatted one by one. Errors use the same messages as
+DeckValidator, and stats have the same shape as ``DeckStats.summary``.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from app.services.card_catalog import CardCatalog
+from app.services.colors import COLOR_BITS, parse_colors
+from app.services.deck_stats import KEYWORDS, power_bucket
+from app.services.deck_validator import (
+    DECK_SIZE,
+    MAX_COPIES,
+    color_error,
+    deck_size_error,
+    max_copies_error,
+    unknown_card_error,
+    unknown_leader_error,
+)
+
+MAX_QUANTITY = 50
+
+
+class Decklist:
+    """One parsed NDJSON line"""
+
+    __slots__ = ("line", "ref", "leader_id", "cards")
+
+    def __init__(
+        self, line: int, ref: Any, leader_id: str, cards: list[tuple[str, int]]
+    ):
+        self.line = line
+        self.ref = ref
+        self.leader_id = leader_id
+        self.cards = cards
+
+
+def parse_decklists(
+    lines: Iterable[str | bytes],
+) -> Iterator[Decklist | dict]:
+    """Parse NDJSON decklists; blank lines are skipped.
+
+    Yields a Decklist per valid line and an ``{"line", "error"}`` dict per
+    malformed one, so a bad line never aborts the batch.
+    """
+    for number, raw in enumerate(lines, start=1):
+        if not raw.strip():
+            continue
+        try:
+            yield _parse_line(number, json.loads(raw))
+        except ValueError as e:
+            yield {"line": number, "error": str(e)}
+
+
+def _parse_line(number: int, data: Any) -> Decklist:
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    leader_id = data.get("leader_id")
+    if not isinstance(leader_id, str) or not leader_id:
+        raise ValueError("leader_id must be a non-empty string")
+    entries = data.get("cards", [])
+    if not isinstance(entries, list):
+        raise ValueError("cards must be a list")
+
+    cards = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError("each card must be an object")
+        card_id, quantity = entry.get("card_id"), entry.get("quantity", 1)
+        if not isinstance(card_id, str) or not card_id:
+            raise ValueError("card_id must be a non-empty string")
+        if (
+            not isinstance(quantity, int)
+            or isinstance(quantity, bool)
+            or not 1 <= quantity <= MAX_QUANTITY
+        ):
+            raise ValueError(f"quantity of {card_id} must be 1-{MAX_QUANTITY}")
+        cards.append((card_id, quantity))
+    return Decklist(number, data.get("ref"), leader_id, cards)
+
+
+def referenced_ids(decklists: Iterable[Decklist]) -> tuple[set[str], set[str]]:
+    """(card IDs, leader IDs) mentioned anywhere in the batch"""
+    card_ids: set[str] = set()
+    leader_ids: set[str] = set()
+    for decklist in decklists:
+        leader_ids.add(decklist.leader_id)
+        card_ids.update(card_id for card_id, _ in decklist.cards)
+    return card_ids, leader_ids
+
+
+def check_decklists(
+    catalog: CardCatalog, decklists: list[Decklist], with_stats: bool = True
+) -> list[dict]:
+    """Validation result (and stats) for each decklist, in input order."""
+    n = len(decklists)
+    if not n:
+        return []
+
+    deck = np.repeat(
+        np.arange(n, dtype=np.int64), [len(d.cards) for d in decklists]
+    )
+    card_ids = [card_id for d in decklists for card_id, _ in d.cards]
+    qty = np.array(
+        [quantity for d in decklists for _, quantity in d.cards], dtype=np.int64
+    )
+    rows = catalog.card_rows(card_ids)
+    totals = np.bincount(deck, weights=qty, minlength=n).astype(np.int64)
+
+    leader_rows = catalog.leader_rows([d.leader_id for d in decklists])
+    known_leader = leader_rows >= 0
+    leader_masks = np.zeros(n, dtype=np.uint8)
+    leader_masks[known_leader] = catalog.leader_color_mask[leader_rows[known_leader]]
+
+    errors: list[list[dict]] = [[] for _ in range(n)]
+    for i in np.flatnonzero(~known_leader).tolist():
+        errors[i].append(unknown_leader_error(decklists[i].leader_id))
+    for i in np.flatnonzero(totals != DECK_SIZE).tolist():
+        errors[i].append(deck_size_error(int(totals[i])))
+    _check_cards(catalog, deck, card_ids, qty, rows, known_leader, leader_masks, errors)
+
+    stats = _deck_stats(catalog, deck, qty, rows, n) if with_stats else None
+    totals = totals.tolist()
+    results = []
+    for i, decklist in enumerate(decklists):
+        result = {
+            "line": decklist.line,
+            "ref": decklist.ref,
+            "leader_id": decklist.leader_id,
+            "is_valid": not errors[i],
+            "total_cards": totals[i],
+            "errors": errors[i],
+        }
+        if stats is not None:
+            result["stats"] = stats[i]
+        results.append(result)
+    return results
+
+
+def _check_cards(
+    catalog: CardCatalog,
+    deck: np.ndarray,
+    card_ids: list[str],
+    qty: np.ndarray,
+    rows: np.ndarray,
+    known_leader: np.ndarray,
+    leader_masks: np.ndarray,
+    errors: list[list[dict]],
+) -> None:
+    """Per-card rules, with repeated lines of a card in one deck summed."""
+    if not card_ids:
+        return
+    # Known cards are identified by catalog row, unknown ones numbered after
+    card_codes = rows.copy()
+    unknown_codes: dict[str, int] = {}
+    for j in np.flatnonzero(rows < 0).tolist():
+        card_codes[j] = catalog.card_count + unknown_codes.setdefault(
+            card_ids[j], len(unknown_codes)
+        )
+    key = deck * (catalog.card_count + len(unknown_codes)) + card_codes
+    _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    merged = np.bincount(inverse, weights=qty).astype(np.int64)
+
+    # One entry per (deck, card), in order of first appearance
+    order = np.argsort(first, kind="stable")
+    first, merged = first[order], merged[order]
+    entry_deck, entry_row = deck[first], rows[first]
+    known = entry_row >= 0
+    card_masks = np.zeros(len(first), dtype=np.uint8)
+    card_masks[known] = catalog.card_color_mask[entry_row[known]]
+
+    unknown = ~known
+    over = known & (merged > MAX_COPIES)
+    off_color = (
+        known
+        & known_leader[entry_deck]
+        & (
+            (card_masks == 0)
+            | ((card_masks & ~leader_masks[entry_deck]) != 0)
+        )
+    )
+    for e in np.flatnonzero(unknown | over | off_color).tolist():
+        card_id, i = card_ids[first[e]], int(entry_deck[e])
+        if unknown[e]:
+            errors[i].append(unknown_card_error(card_id))
+            continue
+        name = catalog.cards[entry_row[e]]["name"]
+        if over[e]:
+            errors[i].append(max_copies_error(card_id, name, int(merged[e])))
+        if off_color[e]:
+            errors[i].append(
+                color_error(card_id, name, int(card_masks[e]), int(leader_masks[i]))
+            )
+
+
+def _deck_stats(
+    catalog: CardCatalog,
+    deck: np.ndarray,
+    qty: np.ndarray,
+    rows: np.ndarray,
+    n: int,
+) -> list[dict]:
+    """DeckStats.summary() of every deck, over its known cards."""
+    known = rows >= 0
+    deck, qty, rows = deck[known], qty[known], rows[known]
+    # Per-card attributes are looked up once per distinct card in the batch
+    used, local = np.unique(rows, return_inverse=True)
+    cards = [catalog.cards[r] for r in used]
+
+    total_cards = np.bincount(deck, weights=qty, minlength=n)
+    cost = np.nan_to_num(catalog.card_cost[used], nan=0.0)[local]
+    total_cost = np.bincount(deck, weights=qty * cost, minlength=n)
+
+    color_distribution = [{} for _ in range(n)]
+    masks = catalog.card_color_mask[used][local]
+    for color, bit in COLOR_BITS.items():
+        counts = np.bincount(deck, weights=qty * ((masks & bit) != 0), minlength=n)
+        _spread(color_distribution, color, counts)
+    # Colors outside COLOR_BITS have no mask bit; parse_colors keeps them whole
+    for j in np.flatnonzero(masks == 0).tolist():
+        for color in parse_colors(cards[local[j]]["color"]):
+            counts = color_distribution[deck[j]]
+            counts[color] = counts.get(color, 0) + int(qty[j])
+
+    cost_curve = _tally(
+        deck, qty, local, n, [c["cost"] if c["cost"] is not None else 0 for c in cards]
+    )
+    type_counts = _tally(deck, qty, local, n, [c["type"] or "Unknown" for c in cards])
+    counter_counts = _tally(deck, qty, local, n, [c["counter"] for c in cards])
+    power_distribution = _tally(
+        deck, qty, local, n,
+        [power_bucket(c["power"]) if c["power"] is not None else None for c in cards],
+    )
+
+    keyword_counts = [{} for _ in range(n)]
+    texts = catalog.card_text[used]
+    for keyword in KEYWORDS:
+        hits = (np.char.find(texts, keyword) >= 0)[local]
+        counts = np.bincount(deck, weights=qty * hits, minlength=n)
+        _spread(keyword_counts, keyword, counts)
+
+    total_cards = total_cards.astype(np.int64).tolist()
+    total_cost = total_cost.tolist()
+    return [
+        {
+            "total_cards": total_cards[i],
+            "avg_cost": (
+                round(total_cost[i] / total_cards[i], 2) if total_cards[i] > 0 else 0
+            ),
+            "color_distribution": color_distribution[i],
+            "cost_curve": cost_curve[i],
+            "type_counts": type_counts[i],
+            "counter_counts": counter_counts[i],
+            "power_distribution": power_distribution[i],
+            "keyword_counts": keyword_counts[i],
+        }
+        for i in range(n)
+    ]
+
+
+def _spread(tallies: list[dict], label: Any, counts: np.ndarray) -> None:
+    """Set ``label`` in each deck's dict where its count is non-zero."""
+    decks = np.flatnonzero(counts)
+    for i, value in zip(decks.tolist(), counts[decks].astype(np.int64).tolist()):
+        tallies[i][label] = value
+
+
+def _tally(
+    deck: np.ndarray,
+    qty: np.ndarray,
+    local: np.ndarray,
+    n: int,
+    values: list,
+) -> list[dict]:
+    """Per-deck {value: copies}, where ``values`` holds one label per distinct
+    card (None to leave the card out)."""
+    lookup: dict[Any, int] = {}
+    codes = np.array(
+        [-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values],
+        dtype=np.int64,
+    )
+    tallies: list[dict] = [{} for _ in range(n)]
+    if not lookup:
+        return tallies
+    line_codes = codes[local]
+    keep = line_codes >= 0
+    width = len(lookup)
+    counts = np.bincount(
+        deck[keep] * width + line_codes[keep],
+        weights=qty[keep],
+        minlength=n * width,
+    ).reshape(n, width)
+    labels = list(lookup)
+    decks, cols = np.nonzero(counts)
+    values = counts[decks, cols].astype(np.int64).tolist()
+    for i, j, value in zip(decks.tolist(), cols.tolist(), values):
+        tallies[i][labels[j]] = value
+    return tallies
+
+
+def run_batch(
+    catalog: CardCatalog,
+    items: Iterable[Decklist | dict],
+    chunk_size: int = 1000,
+    with_stats: bool = True,
+) -> Iterator[dict]:
+    """Results for parsed NDJSON items in input order, ``chunk_size`` decks per
+    vectorized pass. Parse errors are passed through as they are."""
+    chunk: list[Decklist] = []
+    pending: list[Decklist | dict] = []
+    for item in items:
+        pending.append(item)
+        if isinstance(item, Decklist):
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield from _flush(catalog, pending, chunk, with_stats)
+                chunk, pending = [], []
+    yield from _flush(catalog, pending, chunk, with_stats)
+
+
+def _flush(
+    catalog: CardCatalog,
+    pending: list[Decklist | dict],
+    chunk: list[Decklist],
+    with_stats: bool,
+) -> Iterator[dict]:
+    results = iter(check_decklists(catalog, chunk, with_stats))
+    for item in pending:
+        yield next(results) if isinstance(item, Decklist) else item
@@ -0,0 +1,97 @@
+"""Canonical deck encoding — a short shareable code and a stable content hash.
+
+A deck's contents are its leader plus the multiset of (card_id, quantity)
+lines. Both the code and the hash are computed from the canonical form:
+quantities summed per card, zero lines dropped, sorted by card ID. Two decks
+with the same contents therefore get the same hash regardless of name, line
+order or how they were built.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import zlib
+from itertools import groupby
+from typing import Iterable, Tuple
+
+CODE_VERSION = 1
+_RESERVED = set("|;:,*")
+
+
+class DeckCodeError(ValueError):
+    """The deck code is malformed or uses an unknown version."""
+
+
+def canonical_lines(lines: Iterable[Tuple[str, int]]) -> list[tuple[str, int]]:
+    """Sum quantities per card, drop empty lines and sort by card ID."""
+    totals: dict[str, int] = {}
+    for card_id, quantity in lines:
+        totals[card_id] = totals.get(card_id, 0) + quantity
+    return sorted((cid, qty) for cid, qty in totals.items() if qty > 0)
+
+
+def canonical_text(leader_id: str | None, lines: Iterable[Tuple[str, int]]) -> str:
+    """``leader|card*qty,card*qty`` — the exact string that gets hashed.
+
+    The decks migration rebuilds the same string in SQL, so keep them in step.
+    """
+    body = ",".join(f"{cid}*{qty}" for cid, qty in canonical_lines(lines))
+    return f"{leader_id or ''}|{body}"
+
+
+def deck_content_hash(leader_id: str | None, lines: Iterable[Tuple[str, int]]) -> str:
+    return hashlib.sha256(canonical_text(leader_id, lines).encode()).hexdigest()
+
+
+def encode_deck_code(leader_id: str, lines: Iterable[Tuple[str, int]]) -> str:
+    """Pack a deck into a URL-safe code.
+
+    Card IDs are grouped by set prefix ("OP01:001*4,002*2;ST01:...") so the
+    repeated prefixes cost nothing, then raw-deflated and base64 encoded.
+    """
+    lines = canonical_lines(lines)
+    for card_id in [leader_id] + [cid for cid, _ in lines]:
+        if _RESERVED & set(card_id):
+            raise DeckCodeError(f"Card ID {card_id!r} cannot be encoded")
+
+    groups = []
+    for prefix, group in groupby(lines, key=lambda line: _split_id(line[0])[0]):
+        entries = ",".join(f"{_split_id(cid)[1]}*{qty}" for cid, qty in group)
+        groups.append(f"{prefix}:{entries}")
+    payload = f"{leader_id}|{';'.join(groups)}".encode()
+
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    packed = bytes([CODE_VERSION]) + compressor.compress(payload) + compressor.flush()
+    return base64.urlsafe_b64encode(packed).decode().rstrip("=")
+
+
+def decode_deck_code(code: str) -> tuple[str, list[tuple[str, int]]]:
+    """Unpack a code into (leader_id, canonical lines)."""
+    try:
+        packed = base64.urlsafe_b64decode(code.strip() + "=" * (-len(code.strip()) % 4))
+        if not packed or packed[0] != CODE_VERSION:
+            raise DeckCodeError("Unknown deck code version")
+        payload = zlib.decompress(packed[1:], -15).decode()
+
+        leader_id, _, body = payload.partition("|")
+        if not leader_id:
+            raise DeckCodeError("Deck code has no leader")
+        lines = []
+        for group in filter(None, body.split(";")):
+            prefix, _, entries = group.partition(":")
+            for entry in entries.split(","):
+                suffix, _, qty = entry.partition("*")
+                card_id = f"{prefix}-{suffix}" if prefix else suffix
+                lines.append((card_id, int(qty)))
+    except DeckCodeError:
+        raise
+    except (ValueError, zlib.error, UnicodeDecodeError) as e:
+        raise DeckCodeError(f"Malformed deck code: {e}") from e
+    return leader_id, canonical_lines(lines)
+
+
+def _split_id(card_id: str) -> tuple[str, str]:
+    """"OP01-001" -> ("OP01", "001"); IDs without a dash have no prefix."""
+    prefix, dash, suffix = card_id.partition("-")
+    return (prefix, suffix) if dash else ("", card_id)
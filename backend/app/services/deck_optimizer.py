@@ -0,0 +1,272 @@
+"""Deck optimizer: fill a deck's open slots under the construction rules.
+
+The cards already in the deck stay; the optimizer picks the remaining copies
+from the leader's legal pool (color identity, at most 4 copies, 50 cards)
+to maximise
+
+    sum of card values                      synergy to the leader and deck,
+                                            trait focus, counter value
+  + a bonus for each repeated copy          consistency over one-ofs
+  - curve weight * sum (count - target)^2   per cost, for the chosen shape
+  - counter weight * counter cards short of the minimum
+
+Every term is known per copy, so a greedy fill takes the best marginal copy
+at a time (one vector pass over the pool per slot), and a swap search then
+trades single copies while that improves the score. A full plan takes a few
+milliseconds.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from app.services.card_catalog import CardCatalog
+from app.services.card_references import split_traits
+from app.services.deck_validator import DECK_SIZE, MAX_COPIES, DeckValidator
+from app.services.draw_simulator import MAX_DON
+from app.services.legal_pools import get_legal_pool
+from app.services.synergy_graph import SynergyGraph, kinds_to_names
+
+# Share of the 50 cards at each cost 0..10 (10 includes anything above)
+CURVE_SHAPES = {
+    "aggro": [0.02, 0.16, 0.20, 0.18, 0.14, 0.12, 0.08, 0.05, 0.03, 0.01, 0.01],
+    "midrange": [0.02, 0.12, 0.16, 0.14, 0.14, 0.14, 0.10, 0.08, 0.05, 0.03, 0.02],
+    "control": [0.02, 0.08, 0.12, 0.12, 0.14, 0.14, 0.12, 0.10, 0.07, 0.05, 0.04],
+}
+
+CURVE_WEIGHT = 0.25
+COUNTER_WEIGHT = 0.5  # per counter card short of the minimum
+COUNTER_VALUE = 0.5  # per 1000 counter
+COPY_BONUS = 0.2
+MAX_SWAPS = 100
+
+
+class DeckObjective:
+    """What a good fill looks like; every weight can be turned off with 0."""
+
+    def __init__(
+        self,
+        curve: str = "midrange",
+        traits: Sequence[str] | None = None,
+        min_counters: int = 20,
+        synergy_weight: float = 1.0,
+        trait_weight: float = 1.0,
+        exclude: Sequence[str] | None = None,
+    ):
+        if curve not in CURVE_SHAPES:
+            raise ValueError(
+                f"Unknown curve '{curve}' (expected one of {', '.join(CURVE_SHAPES)})"
+            )
+        self.curve = curve
+        self.traits = [t.lower() for t in traits] if traits is not None else None
+        self.min_counters = min_counters
+        self.synergy_weight = synergy_weight
+        self.trait_weight = trait_weight
+        self.exclude = set(exclude or ())
+
+    @classmethod
+    def from_spec(cls, spec: dict) -> "DeckObjective":
+        """From tool arguments; missing or null keys take the defaults.
+
+        Raises:
+            ValueError: a number argument that is not a number
+        """
+        defaults = cls()
+
+        def number(key: str, cast: type):
+            value = spec.get(key)
+            if value is None:
+                return getattr(defaults, key)
+            try:
+                return cast(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid {key} {value!r} (expected a number)")
+
+        return cls(
+            curve=spec.get("curve") or defaults.curve,
+            traits=spec.get("traits"),
+            min_counters=number("min_counters", int),
+            synergy_weight=number("synergy_weight", float),
+            trait_weight=number("trait_weight", float),
+            exclude=spec.get("exclude"),
+        )
+
+
+class _FillState:
+    """Copies held per pool card and the running curve/counter totals."""
+
+    def __init__(self, pool_bucket, pool_counter, held, room, curve_counts, counters):
+        self.bucket = pool_bucket
+        self.is_counter = pool_counter
+        self.held = held  # existing + added copies per pool card
+        self.room = room  # copies that may still be added
+        self.curve = curve_counts  # copies per cost bucket, whole deck
+        self.counters = counters  # counter cards, whole deck
+
+
+def optimize_deck(
+    catalog: CardCatalog,
+    leader_id: str,
+    current: Iterable[tuple[str, int]] = (),
+    objective: DeckObjective | None = None,
+    graph: SynergyGraph | None = None,
+) -> dict:
+    """Cards to add so the deck reaches 50 with the best objective score.
+
+    Args:
+        catalog: Card snapshot the pool is drawn from
+        leader_id: Leader whose colors bound the pool
+        current: (card_id, quantity) already in the deck; kept as they are
+        objective: Scoring; defaults to DeckObjective()
+        graph: Synergy graph for the catalog; without one (or for another
+            catalog version) only the trait focus measures synergy
+
+    Raises:
+        ValueError: unknown leader, or the deck already has more than 50 cards
+    """
+    objective = objective or DeckObjective()
+    leader = catalog.get_leader(leader_id)
+    if leader is None:
+        raise ValueError(f"Unknown leader '{leader_id}'")
+
+    current_qty: dict[str, int] = {}
+    for card_id, qty in current:
+        if qty > 0:
+            current_qty[card_id] = current_qty.get(card_id, 0) + qty
+    slots = DECK_SIZE - sum(current_qty.values())
+    if slots < 0:
+        raise ValueError(f"Deck already has {DECK_SIZE - slots} cards")
+
+    # Pool: every legal card with a cost
+    pool = get_legal_pool(catalog, leader_id).rows
+    pool = pool[np.isfinite(catalog.card_cost[pool])]
+    if objective.exclude:
+        pool = np.setdiff1d(pool, catalog.card_rows(list(objective.exclude)))
+
+    # Per-copy value of each pool card
+    traits = objective.traits
+    if traits is None:
+        traits = [t.lower() for t in split_traits(leader["category"])]
+    values = np.zeros(len(pool))
+    synergy, kinds = None, None
+    if graph is not None and graph.version == catalog.version and graph.card_count == catalog.card_count:
+        synergy, kinds = graph.scores([leader_id, *current_qty])
+        synergy, kinds = synergy[pool], kinds[pool]
+        if synergy.max(initial=0) > 0:
+            values += objective.synergy_weight * synergy / synergy.max()
+    trait_hit = np.zeros(len(pool), dtype=bool)
+    for trait in traits:
+        trait_hit |= np.char.find(catalog.card_category[pool], trait) >= 0
+    values += objective.trait_weight * trait_hit
+    counter = np.nan_to_num(catalog.card_counter[pool])
+    values += COUNTER_VALUE * counter / 1000
+
+    # State including the cards already in the deck
+    bucket = np.minimum(catalog.card_cost[pool], MAX_DON).astype(np.int64)
+    held = np.zeros(len(pool), dtype=np.int64)
+    position = {int(row): i for i, row in enumerate(pool)}
+    curve = np.zeros(MAX_DON + 1)
+    counters = 0
+    for card_id, qty in current_qty.items():
+        card = catalog.get_card(card_id)
+        if card is None:
+            continue
+        if card["cost"] is not None:
+            curve[min(card["cost"], MAX_DON)] += qty
+        if card["counter"]:
+            counters += qty
+        i = position.get(int(catalog.card_rows([card_id])[0]))
+        if i is not None:
+            held[i] = qty
+    state = _FillState(
+        bucket, counter > 0, held, np.maximum(MAX_COPIES - held, 0), curve, counters
+    )
+    targets = np.array(CURVE_SHAPES[objective.curve]) * DECK_SIZE
+    added = np.zeros(len(pool), dtype=np.int64)
+
+    def add_gains() -> np.ndarray:
+        gains = (
+            values
+            + COPY_BONUS * (state.held > 0)
+            - CURVE_WEIGHT * (2 * (state.curve - targets) + 1)[state.bucket]
+        )
+        if state.counters < objective.min_counters:
+            gains += COUNTER_WEIGHT * state.is_counter
+        gains[state.room <= 0] = -np.inf
+        return gains
+
+    def remove_gain(i: int) -> float:
+        b = state.bucket[i]
+        gain = -values[i] - COPY_BONUS * (state.held[i] > 1)
+        gain -= CURVE_WEIGHT * (1 - 2 * (state.curve[b] - targets[b]))
+        if state.is_counter[i] and state.counters <= objective.min_counters:
+            gain -= COUNTER_WEIGHT
+        return float(gain)
+
+    def apply(i: int, step: int) -> None:
+        state.held[i] += step
+        state.room[i] -= step
+        state.curve[state.bucket[i]] += step
+        state.counters += step * int(state.is_counter[i])
+        added[i] += step
+
+    # Greedy fill, one copy at a time
+    for _ in range(slots):
+        gains = add_gains()
+        best = int(np.argmax(gains)) if len(gains) else -1
+        if best < 0 or not np.isfinite(gains[best]):
+            break
+        apply(best, 1)
+
+    # Swap one added copy for another while the score improves
+    for _ in range(MAX_SWAPS):
+        best_delta, best_swap = 1e-9, None
+        for i in np.flatnonzero(added):
+            loss = remove_gain(i)
+            apply(i, -1)
+            gains = add_gains()
+            gains[i] = -np.inf
+            j = int(np.argmax(gains))
+            if loss + gains[j] > best_delta:
+                best_delta, best_swap = loss + gains[j], (int(i), j)
+            apply(i, 1)
+        if best_swap is None:
+            break
+        apply(best_swap[0], -1)
+        apply(best_swap[1], 1)
+
+    # Plan, most copies first
+    chosen = np.flatnonzero(added)
+    chosen = chosen[np.lexsort((bucket[chosen], -added[chosen]))]
+    cards_to_add = []
+    for i in chosen:
+        card = catalog.cards[pool[i]]
+        reasons = []
+        if synergy is not None and synergy[i] > 0:
+            reasons.append(f"synergy ({', '.join(kinds_to_names(int(kinds[i])))})")
+        if trait_hit[i]:
+            reasons.append(f"{{{card['category']}}}")
+        if counter[i]:
+            reasons.append(f"+{int(counter[i])} counter")
+        reasons.append(f"cost {card['cost']} for the {objective.curve} curve")
+        cards_to_add.append({
+            "card_id": card["id"],
+            "name": card["name"],
+            "quantity": int(added[i]),
+            "cost": card["cost"],
+            "counter": card["counter"],
+            "reason": "; ".join(reasons),
+        })
+
+    lines = list(current_qty.items()) + [(c["card_id"], c["quantity"]) for c in cards_to_add]
+    return {
+        "leader_id": leader_id,
+        "slots": slots,
+        "cards_to_add": cards_to_add,
+        "total_cards": sum(qty for _, qty in lines),
+        "curve": {cost: int(n) for cost, n in enumerate(state.curve) if n},
+        "counter_cards": int(state.counters),
+        "errors": DeckValidator().validate_decklist(catalog, leader_id, lines),
+    }
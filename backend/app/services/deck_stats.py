@@ -0,0 +1,250 @@
+"""DeckStats — running deck statistics that can be updated one card line at a time.
+
+Every figure is a sum over card lines, so adding or removing copies of a card
+is a constant-time delta rather than a walk over the whole deck. The state is
+stored in ``decks.stats``; the summary columns are derived from it. A card
+sync that changes a card recomputes the stats and summary columns of every
+deck running it from the new card values.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models import Card, Deck, DeckCard
+from app.services.colors import parse_colors
+
+# Bump when the stored layout changes; older blobs are rebuilt from the lines
+STATS_VERSION = 2
+
+KEYWORDS = ["blocker", "rush", "double attack", "banish", "on play", "on k.o."]
+POWER_BUCKETS = ["0-3000", "4000-5000", "6000-7000", "8000+"]
+# Deck columns DeckStats.columns() writes
+_STATS_COLUMNS = ("stats", "total_cards", "avg_cost", "color_distribution")
+
+
+def power_bucket(power: int) -> str:
+    if power <= 3000:
+        return "0-3000"
+    if power <= 5000:
+        return "4000-5000"
+    if power <= 7000:
+        return "6000-7000"
+    return "8000+"
+
+
+class DeckStats:
+    def __init__(self) -> None:
+        self.total_cards = 0
+        self.total_cost = 0
+        self.color_distribution: dict[str, int] = {}
+        self.cost_curve: dict[int, int] = {}
+        self.type_counts: dict[str, int] = {}
+        self.counter_counts: dict[int, int] = {}
+        self.power_distribution: dict[str, int] = {}
+        self.keyword_counts: dict[str, int] = {}
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[Tuple[Any, int]]) -> "DeckStats":
+        """Build from (card, quantity) pairs."""
+        stats = cls()
+        for card, quantity in lines:
+            stats.add(card, quantity)
+        return stats
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "DeckStats | None":
+        """Load the form stored in ``decks.stats``; None if missing or outdated."""
+        if not data or data.get("version") != STATS_VERSION:
+            return None
+        stats = cls()
+        stats.total_cards = data["total_cards"]
+        stats.total_cost = data["total_cost"]
+        stats.color_distribution = dict(data["color_distribution"])
+        # JSON object keys are strings
+        stats.cost_curve = {int(k): v for k, v in data["cost_curve"].items()}
+        stats.type_counts = dict(data["type_counts"])
+        stats.counter_counts = {int(k): v for k, v in data["counter_counts"].items()}
+        stats.power_distribution = dict(data["power_distribution"])
+        stats.keyword_counts = dict(data["keyword_counts"])
+        return stats
+
+    def add(self, card: Any, quantity: int) -> None:
+        """Apply ``quantity`` copies of ``card``; a negative quantity removes them."""
+        if not quantity:
+            return
+        self.total_cards += quantity
+        if card.cost is not None:
+            self.total_cost += card.cost * quantity
+        for color in parse_colors(card.color):
+            _bump(self.color_distribution, color, quantity)
+        _bump(self.cost_curve, card.cost if card.cost is not None else 0, quantity)
+        _bump(self.type_counts, card.type or "Unknown", quantity)
+        if card.counter is not None:
+            _bump(self.counter_counts, card.counter, quantity)
+        if card.power is not None:
+            _bump(self.power_distribution, power_bucket(card.power), quantity)
+        if card.text:
+            text_lower = card.text.lower()
+            for keyword in KEYWORDS:
+                if keyword in text_lower:
+                    _bump(self.keyword_counts, keyword, quantity)
+
+    @property
+    def avg_cost(self) -> float:
+        if self.total_cards <= 0:
+            return 0
+        return round(self.total_cost / self.total_cards, 2)
+
+    def summary(self) -> dict:
+        """Same shape as ``DeckValidator.calculate_deck_stats``."""
+        return {
+            "total_cards": self.total_cards,
+            "avg_cost": self.avg_cost,
+            "color_distribution": dict(self.color_distribution),
+            "cost_curve": dict(self.cost_curve),
+            "type_counts": dict(self.type_counts),
+            "counter_counts": dict(self.counter_counts),
+            "power_distribution": dict(self.power_distribution),
+            "keyword_counts": dict(self.keyword_counts),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "version": STATS_VERSION,
+            "total_cards": self.total_cards,
+            "total_cost": self.total_cost,
+            "color_distribution": dict(self.color_distribution),
+            "cost_curve": {str(k): v for k, v in sorted(self.cost_curve.items())},
+            "type_counts": dict(self.type_counts),
+            "counter_counts": {
+                str(k): v for k, v in sorted(self.counter_counts.items())
+            },
+            "power_distribution": dict(self.power_distribution),
+            "keyword_counts": dict(self.keyword_counts),
+        }
+
+    def columns(self) -> dict:
+        """The stored stats and the summary columns derived from them."""
+        return {
+            "stats": self.to_dict(),
+            "total_cards": self.total_cards,
+            "avg_cost": self.avg_cost,
+            "color_distribution": dict(self.color_distribution),
+        }
+
+    def apply_to(self, deck: Any) -> None:
+        """Store the stats and refresh the deck's summary columns."""
+        for key, value in self.columns().items():
+            setattr(deck, key, value)
+
+
+async def load_deck_lines(db: AsyncSession, deck_id: UUID) -> list[Tuple[Card, int]]:
+    """(card, quantity) for every line of a deck, in one query."""
+    result = await db.execute(
+        select(Card, DeckCard.quantity)
+        .join(DeckCard, DeckCard.card_id == Card.id)
+        .where(DeckCard.deck_id == deck_id)
+        .order_by(Card.id)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def rebuild_deck_stats(db: AsyncSession, deck_id: UUID) -> DeckStats:
+    """Recompute stats from a deck's card lines in one query."""
+    return DeckStats.from_lines(await load_deck_lines(db, deck_id))
+
+
+async def load_deck_stats(db: AsyncSession, deck: Deck) -> DeckStats:
+    """Stored stats for a deck, rebuilt from its lines if missing or outdated.
+
+    A rebuild is written back (in the caller's transaction) so later reads are
+    one row fetch again.
+    """
+    stats = DeckStats.from_dict(deck.stats)
+    if stats is None:
+        stats = await rebuild_deck_stats(db, deck.id)
+        await _store_rebuilt(db, deck, stats)
+    return stats
+
+
+async def _store_rebuilt(db: AsyncSession, deck: Deck, stats: DeckStats) -> None:
+    """Write rebuilt stats without counting as an edit of the deck.
+
+    The revision and updated_at are left alone; the UPDATE only applies while
+    the deck is still at the revision the stats were rebuilt from, so it
+    cannot overwrite the stats of a concurrent edit.
+    """
+    columns = stats.columns()
+    await db.execute(
+        update(Deck)
+        .where(Deck.id == deck.id, Deck.revision == deck.revision)
+        .values(**columns, updated_at=Deck.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    for key, value in columns.items():
+        set_committed_value(deck, key, value)
+
+
+async def refresh_deck_stats(
+    db: AsyncSession, card_ids: list[str], chunk_size: int = 1000
+) -> int:
+    """Recompute the stats of every deck running any of ``card_ids``.
+
+    For a card sync: the stored sums and the summary columns are rebuilt from
+    the new card values. Runs in the caller's transaction; the revision and
+    updated_at are left alone, since the decks themselves have not been
+    edited. Returns the number of decks refreshed.
+    """
+    deck_ids: set[UUID] = set()
+    for start in range(0, len(card_ids), chunk_size):
+        chunk = card_ids[start : start + chunk_size]
+        result = await db.execute(
+            select(DeckCard.deck_id).where(DeckCard.card_id.in_(chunk)).distinct()
+        )
+        deck_ids.update(result.scalars())
+
+    ordered = sorted(deck_ids)
+    table = Deck.__table__
+    for start in range(0, len(ordered), chunk_size):
+        chunk = ordered[start : start + chunk_size]
+        result = await db.execute(
+            select(DeckCard.deck_id, Card, DeckCard.quantity)
+            .join(Card, Card.id == DeckCard.card_id)
+            .where(DeckCard.deck_id.in_(chunk))
+        )
+        lines: dict[UUID, list] = {deck_id: [] for deck_id in chunk}
+        for deck_id, card, quantity in result.all():
+            lines[deck_id].append((card, quantity))
+        rows = [
+            {"deck_id": deck_id, **_prefixed(DeckStats.from_lines(deck_lines).columns())}
+            for deck_id, deck_lines in lines.items()
+        ]
+        await db.execute(
+            update(table)
+            .where(table.c.id == bindparam("deck_id"))
+            .values(
+                **{key: bindparam(f"new_{key}") for key in _STATS_COLUMNS},
+                updated_at=table.c.updated_at,
+            ),
+            rows,
+        )
+    return len(ordered)
+
+
+def _prefixed(columns: dict) -> dict:
+    # executemany bind names must differ from the column names
+    return {f"new_{key}": value for key, value in columns.items()}
+
+
+def _bump(counts: dict, key: Any, quantity: int) -> None:
+    value = counts.get(key, 0) + quantity
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
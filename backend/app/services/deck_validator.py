@@ -1,106 +1,161 @@
-from typing import List, Tuple
+from typing import Iterable, List, Mapping, Tuple
+from app.models.card import Card
 from app.models.deck import Deck
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.services.card_catalog import CardCatalog
+from app.services.colors import is_color_legal, mask_to_colors
+from app.services.deck_stats import DeckStats
+
+
+# Rule identifiers reported with each error
+RULE_LEADER = "leader"
+RULE_DECK_SIZE = "deck_size"
+RULE_UNKNOWN_CARD = "unknown_card"
+RULE_MAX_COPIES = "max_copies"
+RULE_COLOR = "color"
+
+DECK_SIZE = 50
+MAX_COPIES = 4
+
+
+def check_decklist(
+    leader: Tuple[str, int] | None,
+    lines: Iterable[Tuple[str, int]],
+    cards: Mapping[str, Tuple[str, int]],
+    has_leader: bool | None = None,
+) -> List[dict]:
+    """Check construction rules on plain data; no ORM objects or I/O.
+
+    Args:
+        leader: (name, color_mask) of the leader, or None if unknown
+        lines: (card_id, quantity) pairs; repeated IDs are summed
+        cards: card_id -> (name, color_mask) for the cards in ``lines``
+        has_leader: whether a leader was given at all (defaults to ``leader``)
+
+    Returns:
+        List of {"rule", "message", "card_id"} errors, empty if valid
+    """
+    errors = []
+    quantities: dict[str, int] = {}
+    for card_id, quantity in lines:
+        quantities[card_id] = quantities.get(card_id, 0) + quantity
+
+    # Rule 1: Must have exactly 1 leader
+    if not (leader is not None if has_leader is None else has_leader):
+        errors.append(_error(RULE_LEADER, "Deck must have a leader"))
+
+    # Rule 2: Must have exactly 50 cards
+    total_cards = sum(quantities.values())
+    if total_cards != DECK_SIZE:
+        errors.append(deck_size_error(total_cards))
+
+    for card_id, quantity in quantities.items():
+        card = cards.get(card_id)
+        if card is None:
+            errors.append(unknown_card_error(card_id))
+            continue
+        name, card_mask = card
 
+        # Rule 3: Max 4 copies of any card (except DON!! cards)
+        if quantity > MAX_COPIES:
+            errors.append(max_copies_error(card_id, name, quantity))
 
-class DeckValidator:
-    """Validates One Piece TCG deck construction rules"""
+        # Rule 4: Color identity must match leader
+        if leader is not None and not is_color_legal(card_mask, leader[1]):
+            errors.append(color_error(card_id, name, card_mask, leader[1]))
 
-    async def validate_deck(
-        self, deck: Deck, db: AsyncSession
-    ) -> Tuple[bool, List[str]]:
-        """
-        Validate deck against One Piece TCG rules
+    return errors
 
-        Returns:
-            Tuple of (is_valid, list_of_errors)
-        """
-        errors = []
 
-        # Rule 1: Must have exactly 1 leader
-        if not deck.leader_id:
-            errors.append("Deck must have a leader")
+# Error builders, shared with the vectorized batch checks in deck_batch
 
-        # Rule 2: Must have exactly 50 cards
-        total_cards = sum(dc.quantity for dc in deck.deck_cards)
-        if total_cards != 50:
-            errors.append(f"Deck must have exactly 50 cards (currently has {total_cards})")
 
-        # Rule 3: Max 4 copies of any card (except DON!! cards)
-        for deck_card in deck.deck_cards:
-            if deck_card.quantity > 4:
-                errors.append(
-                    f"Max 4 copies allowed of '{deck_card.card.name}' (has {deck_card.quantity})"
-                )
+def deck_size_error(total_cards: int) -> dict:
+    return _error(
+        RULE_DECK_SIZE,
+        f"Deck must have exactly {DECK_SIZE} cards (currently has {total_cards})",
+    )
 
-        # Rule 4: Color identity must match leader
-        if deck.leader:
-            allowed_colors = set(deck.leader.colors)
 
-            for deck_card in deck.deck_cards:
-                card_colors = self._parse_color(deck_card.card.color)
-                if not card_colors.issubset(allowed_colors):
-                    errors.append(
-                        f"'{deck_card.card.name}' has invalid color(s) for this leader. "
-                        f"Leader allows: {', '.join(allowed_colors)}, "
-                        f"Card has: {', '.join(card_colors)}"
-                    )
+def unknown_card_error(card_id: str) -> dict:
+    return _error(RULE_UNKNOWN_CARD, f"Unknown card '{card_id}'", card_id)
 
-        return len(errors) == 0, errors
 
-    def _parse_color(self, color_str: str | None) -> set:
-        """Parse color string into set of colors.
+def unknown_leader_error(leader_id: str) -> dict:
+    return _error(RULE_LEADER, f"Unknown leader '{leader_id}'")
 
-        Handles both comma-separated (legacy) and space-separated (optcgapi) formats.
-        """
-        if not color_str:
-            return set()
 
-        # Handle comma-separated (e.g., "Red,Blue")
-        if "," in color_str:
-            return set(c.strip() for c in color_str.split(","))
+def max_copies_error(card_id: str, name: str, quantity: int) -> dict:
+    return _error(
+        RULE_MAX_COPIES,
+        f"Max {MAX_COPIES} copies allowed of '{name}' (has {quantity})",
+        card_id,
+    )
+
 
-        # Handle space-separated multi-color (e.g., "Green Red")
-        valid_colors = {"Red", "Green", "Blue", "Purple", "Black", "Yellow"}
-        tokens = color_str.strip().split()
-        colors = {t for t in tokens if t in valid_colors}
-        if colors:
-            return colors
+def color_error(card_id: str, name: str, card_mask: int, leader_mask: int) -> dict:
+    if not card_mask:
+        return _error(
+            RULE_COLOR,
+            f"'{name}' has no recognised color, so it is legal for no leader",
+            card_id,
+        )
+    return _error(
+        RULE_COLOR,
+        f"'{name}' has invalid color(s) for this leader. "
+        f"Leader allows: {', '.join(mask_to_colors(leader_mask))}, "
+        f"Card has: {', '.join(mask_to_colors(card_mask))}",
+        card_id,
+    )
 
-        return {color_str.strip()}
+
+def _error(rule: str, message: str, card_id: str | None = None) -> dict:
+    return {"rule": rule, "message": message, "card_id": card_id}
+
+
+class DeckValidator:
+    """Validates One Piece TCG deck construction rules"""
+
+    def validate_deck(self, deck: Deck) -> Tuple[bool, List[str]]:
+        """
+        Validate a loaded deck (deck_cards.card and leader) against the rules
+
+        Returns:
+            Tuple of (is_valid, list_of_errors)
+        """
+        leader = (deck.leader.name, deck.leader.color_mask) if deck.leader else None
+        errors = check_decklist(
+            leader,
+            ((dc.card_id, dc.quantity) for dc in deck.deck_cards),
+            {dc.card_id: (dc.card.name, dc.card.color_mask) for dc in deck.deck_cards},
+            has_leader=bool(deck.leader_id),
+        )
+        return len(errors) == 0, [e["message"] for e in errors]
+
+    def validate_decklist(
+        self,
+        catalog: CardCatalog,
+        leader_id: str | None,
+        lines: Iterable[Tuple[str, int]],
+    ) -> List[dict]:
+        """Validate an unsaved decklist against a catalog snapshot"""
+        lines = list(lines)
+        leader = catalog.leader_identity(leader_id) if leader_id else None
+        errors = []
+        if leader_id and leader is None:
+            errors.append(unknown_leader_error(leader_id))
+        cards = {}
+        for card_id, _ in lines:
+            identity = catalog.card_identity(card_id)
+            if identity is not None:
+                cards[card_id] = identity
+        return errors + check_decklist(leader, lines, cards, has_leader=bool(leader_id))
 
     def calculate_deck_stats(self, deck: Deck) -> dict:
         """Calculate deck statistics"""
-        total_cards = 0
-        total_cost = 0
-        color_counts = {}
-        cost_curve = {}
-
-        for deck_card in deck.deck_cards:
-            card = deck_card.card
-            quantity = deck_card.quantity
-
-            total_cards += quantity
-
-            # Calculate average cost
-            if card.cost is not None:
-                total_cost += card.cost * quantity
-
-            # Color distribution
-            colors = self._parse_color(card.color)
-            for color in colors:
-                color_counts[color] = color_counts.get(color, 0) + quantity
-
-            # Cost curve
-            cost = card.cost if card.cost is not None else 0
-            cost_curve[cost] = cost_curve.get(cost, 0) + quantity
-
-        avg_cost = round(total_cost / total_cards, 2) if total_cards > 0 else 0
-
-        return {
-            "total_cards": total_cards,
-            "avg_cost": avg_cost,
-            "color_distribution": color_counts,
-            "cost_curve": cost_curve,
-        }
+        return self.calculate_stats(
+            (deck_card.card, deck_card.quantity) for deck_card in deck.deck_cards
+        )
+
+    def calculate_stats(self, lines: Iterable[Tuple[Card, int]]) -> dict:
+        """Calculate statistics from (card, quantity) pairs, without a Deck row"""
+        return DeckStats.from_lines(lines).summary()
@@ -0,0 +1,323 @@
+"""Monte Carlo draw simulation: opening hands, mulligans and per-turn access.
+
+A deck is encoded as one small int per copy. A batch of games is a
+(batch, cards drawn) matrix dealt from independent shuffles of that encoding,
+so shuffling, the mulligan decision and every per-turn question are array
+operations over the whole batch. Each question reduces to "at which draw
+position does the first matching card appear", and a card is in hand by a
+turn when that position is below the number of cards seen.
+
+Cards played are not removed from hand: figures are about what has been
+drawn by each turn. Every batch gets its own child of one SeedSequence, so
+results depend only on the seed and the run size, whether batches run in
+this process or in worker processes.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+from app.config import settings
+from app.services.process_pool import map_in_processes
+
+OPENING_HAND = 5
+MAX_DON = 10
+
+
+def don_available(turn: int, going_first: bool) -> int:
+    """DON!! on the field on ``turn``: the first player starts with one."""
+    return min(MAX_DON, 2 * turn - 1 if going_first else 2 * turn)
+
+
+def cards_seen(turn: int, going_first: bool) -> int:
+    """Cards drawn by ``turn``: the first player skips their first draw."""
+    return OPENING_HAND + turn - (1 if going_first else 0)
+
+
+class DeckEncoding:
+    """Per-card features of a deck; ``copies`` holds one card index per copy."""
+
+    def __init__(
+        self,
+        card_ids: list[str],
+        costs: np.ndarray,
+        counters: np.ndarray,
+        counts: np.ndarray,
+    ):
+        self.card_ids = card_ids
+        self.costs = costs
+        self.counters = counters
+        self.copies = np.repeat(np.arange(len(card_ids), dtype=np.int16), counts)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[tuple[Any, int]]) -> "DeckEncoding":
+        """Build from (card, quantity) pairs. Cards without a cost get -1."""
+        lines = [(card, qty) for card, qty in lines if qty > 0]
+        return cls(
+            card_ids=[card.id for card, _ in lines],
+            costs=np.array(
+                [-1 if card.cost is None else card.cost for card, _ in lines],
+                dtype=np.int16,
+            ),
+            counters=np.array([card.counter or 0 for card, _ in lines], dtype=np.int32),
+            counts=np.array([qty for _, qty in lines], dtype=np.int64),
+        )
+
+    @classmethod
+    def from_deck_cards(cls, deck_cards: Iterable[dict]) -> "DeckEncoding":
+        """Build from serialized deck cards ({"card": {...}, "quantity": n})."""
+        lines = [(dc["card"], dc.get("quantity", 0)) for dc in deck_cards]
+        lines = [(card, qty) for card, qty in lines if qty > 0]
+        return cls(
+            card_ids=[card.get("id") for card, _ in lines],
+            costs=np.array(
+                [-1 if card.get("cost") is None else card["cost"] for card, _ in lines],
+                dtype=np.int16,
+            ),
+            counters=np.array([card.get("counter") or 0 for card, _ in lines], dtype=np.int32),
+            counts=np.array([qty for _, qty in lines], dtype=np.int64),
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.copies)
+
+    def index_of(self, card_id: str) -> int:
+        try:
+            return self.card_ids.index(card_id)
+        except ValueError:
+            raise ValueError(f"Card {card_id} is not in the deck") from None
+
+
+def deal(
+    rng: np.random.Generator, copies: np.ndarray, size: int, depth: int
+) -> np.ndarray:
+    """Top ``depth`` cards of ``size`` independent shuffles of ``copies``.
+
+    A Fisher-Yates shuffle stopped after ``depth`` swaps: the drawn prefix is
+    uniformly random, and nothing below it is ever shuffled.
+    """
+    decks = np.tile(copies, (size, 1))
+    rows = np.arange(size)
+    for i in range(depth):
+        j = rng.integers(i, len(copies), size=size)
+        picked = decks[rows, j]
+        decks[rows, j] = decks[:, i]
+        decks[:, i] = picked
+    return decks[:, :depth]
+
+
+def mulligan(
+    rng: np.random.Generator,
+    drawn: np.ndarray,
+    copies: np.ndarray,
+    costs: np.ndarray,
+    mulligan_cost: int | None,
+) -> int:
+    """Redeal, in place, games whose opening hand has no card costing at most
+    ``mulligan_cost``; returns how many were redealt.
+
+    The whole hand goes back and five new cards are drawn, which is the same
+    as playing from a fresh shuffle.
+    """
+    if mulligan_cost is None:
+        return 0
+    cheap = (costs >= 0) & (costs <= mulligan_cost)
+    redo = ~cheap[drawn[:, :OPENING_HAND]].any(axis=1)
+    count = int(redo.sum())
+    if count:
+        drawn[redo] = deal(rng, copies, count, drawn.shape[1])
+    return count
+
+
+def _first_positions(drawn: np.ndarray, n_cards: int) -> np.ndarray:
+    """(games, n_cards) draw position of each card's first copy; depth if undrawn."""
+    size, depth = drawn.shape
+    first = np.full((size, n_cards), depth, dtype=np.int16)
+    rows = np.arange(size)
+    # Deepest position first, so earlier copies overwrite later ones
+    for pos in range(depth - 1, -1, -1):
+        first[rows, drawn[:, pos]] = pos
+    return first
+
+
+def _simulate_batch(
+    copies: np.ndarray,
+    costs: np.ndarray,
+    counters: np.ndarray,
+    targets: list[int],
+    turns: int,
+    going_first: bool,
+    mulligan_cost: int | None,
+    size: int,
+    seed: np.random.SeedSequence,
+) -> dict:
+    """Play ``size`` openings; returns hit counts, summed over games.
+
+    Module-level and free of app state so it can run in a worker process.
+    """
+    rng = np.random.default_rng(seed)
+    seen = [min(cards_seen(t, going_first), len(copies)) for t in range(1, turns + 1)]
+    depth = seen[-1]
+    drawn = deal(rng, copies, size, depth)
+
+    mulligans = mulligan(rng, drawn, copies, costs, mulligan_cost)
+
+    seen_arr = np.array(seen)
+    first = _first_positions(drawn, len(costs))
+    max_cost = max(int(costs.max(initial=0)), MAX_DON)
+    by_cost = np.full((max_cost + 1, size), depth, dtype=np.int16)
+    for c in np.unique(costs[costs >= 0]).tolist():
+        by_cost[c] = first[:, costs == c].min(axis=1)
+    cost_hits = (by_cost[:, :, None] < seen_arr).sum(axis=1)
+
+    # On curve: a card costing exactly the DON!! available; playable: any
+    # card costing at most that
+    on_curve = np.zeros(turns, dtype=np.int64)
+    playable = np.zeros(turns, dtype=np.int64)
+    for t in range(turns):
+        don = don_available(t + 1, going_first)
+        on_curve[t] = cost_hits[don, t]
+        playable[t] = (by_cost[: don + 1].min(axis=0) < seen[t]).sum()
+
+    target_hits = np.zeros((len(targets), turns), dtype=np.int64)
+    for i, index in enumerate(targets):
+        target_hits[i] = (first[:, index, None] < seen_arr).sum(axis=0)
+
+    counter_sum = np.cumsum(counters[drawn], axis=1, dtype=np.int64)[:, seen_arr - 1].sum(axis=0)
+
+    return {
+        "games": size,
+        "mulligans": mulligans,
+        "cost_hits": cost_hits,
+        "on_curve": on_curve,
+        "playable": playable,
+        "target_hits": target_hits,
+        "counter_sum": counter_sum,
+    }
+
+
+def seeded_batches(iterations: int, seed: int | None, batch_size: int) -> tuple[int, list]:
+    """Split a run into (size, child seed) batches; returns the root seed too."""
+    root = np.random.SeedSequence(seed)
+    sizes = [batch_size] * (iterations // batch_size)
+    if iterations % batch_size:
+        sizes.append(iterations % batch_size)
+    return root.entropy, list(zip(sizes, root.spawn(len(sizes))))
+
+
+def merge_counts(parts: list[dict]) -> dict:
+    """Sum batch results key by key (ints and NumPy arrays alike)."""
+    total = dict(parts[0])
+    for part in parts[1:]:
+        for key, value in part.items():
+            total[key] = total[key] + value
+    return total
+
+
+def _summarise(
+    deck: DeckEncoding,
+    totals: dict,
+    targets: Sequence[str],
+    turns: int,
+    going_first: bool,
+    mulligan_cost: int | None,
+    seed: int,
+) -> dict:
+    games = totals["games"]
+    cost_hits = totals["cost_hits"] / games
+    deck_costs = sorted({int(c) for c in deck.costs if c >= 0})
+    rows = []
+    for t in range(turns):
+        turn = t + 1
+        rows.append({
+            "turn": turn,
+            "don": don_available(turn, going_first),
+            "cards_seen": min(cards_seen(turn, going_first), deck.size),
+            "on_curve": round(float(totals["on_curve"][t] / games), 4),
+            "playable": round(float(totals["playable"][t] / games), 4),
+            "expected_counter": round(float(totals["counter_sum"][t] / games), 1),
+            "cost_hits": {c: round(float(cost_hits[c, t]), 4) for c in deck_costs},
+            "targets": {
+                card_id: round(float(totals["target_hits"][i, t] / games), 4)
+                for i, card_id in enumerate(targets)
+            },
+        })
+    return {
+        "iterations": games,
+        "seed": seed,
+        "going_first": going_first,
+        "mulligan_cost": mulligan_cost,
+        "mulligan_rate": round(totals["mulligans"] / games, 4),
+        "turns": rows,
+    }
+
+
+def simulate_draws(
+    deck: DeckEncoding,
+    *,
+    iterations: int = 100_000,
+    turns: int = 5,
+    going_first: bool = True,
+    mulligan_cost: int | None = 2,
+    targets: Sequence[str] = (),
+    seed: int | None = None,
+) -> dict:
+    """Per-turn hit probabilities for ``deck``.
+
+    Args:
+        iterations: Games to simulate
+        turns: Turns to report, starting at 1
+        going_first: Whether the deck's player goes first
+        mulligan_cost: Mulligan an opening hand with no card costing at most
+            this; None never mulligans
+        targets: Card IDs to report "drawn by turn N" probabilities for
+        seed: Root seed; the one used is returned for replaying a run
+    """
+    if not deck.size:
+        raise ValueError("Deck has no cards")
+    target_rows = [deck.index_of(card_id) for card_id in targets]
+    root, batches = seeded_batches(iterations, seed, settings.simulation_batch_size)
+    parts = [
+        _simulate_batch(
+            deck.copies, deck.costs, deck.counters, target_rows,
+            turns, going_first, mulligan_cost, size, child,
+        )
+        for size, child in batches
+    ]
+    return _summarise(
+        deck, merge_counts(parts), targets, turns, going_first, mulligan_cost, root
+    )
+
+
+async def simulate_draws_parallel(
+    deck: DeckEncoding,
+    *,
+    iterations: int = 100_000,
+    turns: int = 5,
+    going_first: bool = True,
+    mulligan_cost: int | None = 2,
+    targets: Sequence[str] = (),
+    seed: int | None = None,
+) -> dict:
+    """simulate_draws with batches spread over the shared process pool.
+
+    Same seed, same results as the in-process run.
+    """
+    if not deck.size:
+        raise ValueError("Deck has no cards")
+    target_rows = [deck.index_of(card_id) for card_id in targets]
+    root, batches = seeded_batches(iterations, seed, settings.simulation_batch_size)
+    parts = await map_in_processes(
+        _simulate_batch,
+        [
+            (deck.copies, deck.costs, deck.counters, target_rows,
+             turns, going_first, mulligan_cost, size, child)
+            for size, child in batches
+        ],
+    )
+    return _summarise(
+        deck, merge_counts(parts), targets, turns, going_first, mulligan_cost, root
+    )
@@ -0,0 +1,89 @@
+"""Offline transports for OPTCGAPIClient.
+
+``FixtureTransport`` replays recorded API payloads from a directory, answering
+conditional requests the way a real server would, so the full sync path can be
+exercised and benchmarked without network access. ``RecordingTransport`` wraps
+a live transport and saves each successful payload into such a directory.
+
+Fixture files are named after the last path segment of the URL, e.g.
+``allSetCards.json`` for ``https://optcgapi.com/api/allSetCards/``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+
+import httpx
+
+
+def fixture_name(url: httpx.URL | str) -> str:
+    """File name a URL's payload is stored under."""
+    path = httpx.URL(str(url)).path.rstrip("/")
+    return f"{path.rsplit('/', 1)[-1]}.json"
+
+
+class FixtureTransport(httpx.AsyncBaseTransport):
+    """Serve GET requests from ``<directory>/<fixture_name(url)>``."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = self.directory / fixture_name(request.url)
+        if request.method != "GET" or not path.is_file():
+            return httpx.Response(404, request=request)
+
+        body = path.read_bytes()
+        stat = path.stat()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Content-Type": "application/json",
+        }
+
+        if_none_match = request.headers.get("If-None-Match")
+        if_modified_since = request.headers.get("If-Modified-Since")
+        if if_none_match is not None:
+            if etag in [v.strip() for v in if_none_match.split(",")]:
+                return httpx.Response(304, headers=headers, request=request)
+        elif if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                since = None
+            if since is not None and int(stat.st_mtime) <= since:
+                return httpx.Response(304, headers=headers, request=request)
+
+        return httpx.Response(200, headers=headers, content=body, request=request)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests through and save 200 responses as fixtures."""
+
+    def __init__(
+        self, directory: str | Path, inner: httpx.AsyncBaseTransport | None = None
+    ):
+        self.directory = Path(directory)
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        if response.status_code != 200:
+            return response
+
+        body = await response.aread()  # decoded, so drop the encoding headers
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / fixture_name(request.url)).write_bytes(body)
+        headers = [
+            (k, v)
+            for k, v in response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(200, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
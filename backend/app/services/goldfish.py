@@ -0,0 +1,259 @@
+"""Goldfish simulation: how well a deck's curve turns DON!! into plays.
+
+Goldfishing plays a deck against an empty board: draw, gain DON!! (1 on the
+first player's first turn, then +2 a turn up to 10) and play cards. Each turn
+the policy plays the cards whose total cost uses as much of the available
+DON!! as possible (a bounded subset-sum, so the turn is optimal rather than
+greedy), preferring expensive cards on ties. DON!! left over is wasted; a
+turn that spends none is a dead turn.
+
+Hands are tracked as card counts per cost, so a whole batch of games moves
+together: the subset-sum is a bitset of reachable totals per game, built by
+shifting across the cost buckets, and the cards to play are recovered by
+walking those bitsets back down.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from app.config import settings
+from app.services.draw_simulator import (
+    MAX_DON,
+    DeckEncoding,
+    cards_seen,
+    deal,
+    don_available,
+    merge_counts,
+    mulligan,
+    seeded_batches,
+)
+from app.services.process_pool import map_in_processes
+
+# Highest set bit of every bitset over 0..MAX_DON, i.e. the best total reached
+_HIGHEST = np.array(
+    [max(v.bit_length() - 1, 0) for v in range(1 << (MAX_DON + 1))], dtype=np.int16
+)
+
+
+def _best_play(hand: np.ndarray, don: int) -> tuple[np.ndarray, np.ndarray]:
+    """Cards to play from per-cost ``hand`` counts with ``don`` DON!!.
+
+    Returns (DON!! spent, cards played per cost) for every game.
+    """
+    size = len(hand)
+    full = (1 << (don + 1)) - 1
+    played = np.zeros_like(hand)
+    played[:, 0] = hand[:, 0]  # free cards always come down
+
+    # layers[c]: totals reachable with the cards costing 1..c
+    layers = [np.ones(size, dtype=np.int64)]
+    for c in range(1, don + 1):
+        prev = layers[-1]
+        count = hand[:, c]
+        reach, shifted = prev, prev
+        for k in range(1, don // c + 1):
+            shifted = (shifted << c) & full
+            reach = np.where(count >= k, reach | shifted, reach)
+        layers.append(reach)
+    spent = _HIGHEST[layers[don]].astype(np.int64)
+
+    # Walk back from the most expensive cost, taking as many copies as still
+    # leave the remainder reachable with the cheaper cards
+    remaining = spent.copy()
+    for c in range(don, 0, -1):
+        prev = layers[c - 1]
+        count = np.minimum(hand[:, c], don // c)
+        chosen = np.zeros(size, dtype=np.int64)
+        found = np.zeros(size, dtype=bool)
+        for x in range(don // c, -1, -1):
+            rest = remaining - x * c
+            ok = (
+                ~found
+                & (x <= count)
+                & (rest >= 0)
+                & ((prev >> np.maximum(rest, 0)) & 1).astype(bool)
+            )
+            chosen[ok] = x
+            found |= ok
+        played[:, c] = chosen
+        remaining -= chosen * c
+    return spent, played
+
+
+def _goldfish_batch(
+    copies: np.ndarray,
+    costs: np.ndarray,
+    turns: int,
+    going_first: bool,
+    mulligan_cost: int | None,
+    size: int,
+    seed: np.random.SeedSequence,
+) -> dict:
+    """Play ``size`` goldfish games; returns totals over games.
+
+    Module-level and free of app state so it can run in a worker process.
+    """
+    rng = np.random.default_rng(seed)
+    depth = min(cards_seen(turns, going_first), len(copies))
+    drawn = deal(rng, copies, size, depth)
+    mulligans = mulligan(rng, drawn, copies, costs, mulligan_cost)
+
+    # Cost bucket of each draw; cards with no cost or above 10 are never played
+    bucket = np.where((costs >= 0) & (costs <= MAX_DON), costs, -1)[drawn]
+    hand = np.zeros((size, MAX_DON + 1), dtype=np.int64)
+    rows = np.arange(size)
+
+    spent = np.zeros(turns, dtype=np.int64)
+    wasted = np.zeros(turns, dtype=np.int64)
+    dead = np.zeros(turns, dtype=np.int64)
+    played = np.zeros(turns, dtype=np.int64)
+    dead_per_game = np.zeros(size, dtype=np.int64)
+    seen = 0
+    for t in range(turns):
+        # Opening hand on the first turn, then the draw step
+        upto = min(cards_seen(t + 1, going_first), depth)
+        for pos in range(seen, upto):
+            ok = bucket[:, pos] >= 0
+            hand[rows[ok], bucket[ok, pos]] += 1
+        seen = upto
+
+        don = don_available(t + 1, going_first)
+        used, cards = _best_play(hand, don)
+        hand -= cards
+        is_dead = used == 0
+        spent[t] = used.sum()
+        wasted[t] = (don - used).sum()
+        dead[t] = is_dead.sum()
+        played[t] = cards.sum()
+        dead_per_game += is_dead
+
+    return {
+        "games": size,
+        "mulligans": mulligans,
+        "spent": spent,
+        "wasted": wasted,
+        "dead": dead,
+        "played": played,
+        "clean_games": int((dead_per_game == 0).sum()),
+    }
+
+
+def _summarise(
+    totals: dict, turns: int, going_first: bool, mulligan_cost: int | None, seed: int
+) -> dict:
+    games = totals["games"]
+    dons = [don_available(t + 1, going_first) for t in range(turns)]
+    rows = [
+        {
+            "turn": t + 1,
+            "don": dons[t],
+            "avg_spent": round(float(totals["spent"][t] / games), 2),
+            "avg_wasted": round(float(totals["wasted"][t] / games), 2),
+            "dead_rate": round(float(totals["dead"][t] / games), 4),
+            "avg_played": round(float(totals["played"][t] / games), 2),
+        }
+        for t in range(turns)
+    ]
+    return {
+        "games": games,
+        "seed": seed,
+        "going_first": going_first,
+        "mulligan_cost": mulligan_cost,
+        "mulligan_rate": round(totals["mulligans"] / games, 4),
+        "efficiency": round(float(totals["spent"].sum() / (games * sum(dons))), 4),
+        "avg_wasted": round(float(totals["wasted"].sum() / games), 2),
+        "avg_dead_turns": round(float(totals["dead"].sum() / games), 2),
+        "clean_game_rate": round(totals["clean_games"] / games, 4),
+        "turns": rows,
+    }
+
+
+def _prepare(deck: DeckEncoding, games: int, seed: int | None) -> tuple[int, list]:
+    if not deck.size:
+        raise ValueError("Deck has no cards")
+    return seeded_batches(games, seed, settings.goldfish_batch_size)
+
+
+def simulate_goldfish(
+    deck: DeckEncoding,
+    *,
+    games: int = 2000,
+    turns: int = 7,
+    going_first: bool = True,
+    mulligan_cost: int | None = 2,
+    seed: int | None = None,
+) -> dict:
+    """DON!! efficiency of ``deck`` over ``games`` goldfish games.
+
+    Args:
+        games: Games to play
+        turns: Turns per game, starting at 1
+        going_first: Whether the deck's player goes first
+        mulligan_cost: Mulligan an opening hand with no card costing at most
+            this; None never mulligans
+        seed: Root seed; the one used is returned for replaying a run
+    """
+    root, batches = _prepare(deck, games, seed)
+    parts = [
+        _goldfish_batch(
+            deck.copies, deck.costs, turns, going_first, mulligan_cost, size, child
+        )
+        for size, child in batches
+    ]
+    return _summarise(merge_counts(parts), turns, going_first, mulligan_cost, root)
+
+
+async def simulate_goldfish_parallel(
+    deck: DeckEncoding,
+    *,
+    games: int = 2000,
+    turns: int = 7,
+    going_first: bool = True,
+    mulligan_cost: int | None = 2,
+    seed: int | None = None,
+) -> dict:
+    """simulate_goldfish with batches spread over the shared process pool.
+
+    Same seed, same results as the in-process run.
+    """
+    root, batches = _prepare(deck, games, seed)
+    parts = await map_in_processes(
+        _goldfish_batch,
+        [
+            (deck.copies, deck.costs, turns, going_first, mulligan_cost, size, child)
+            for size, child in batches
+        ],
+    )
+    return _summarise(merge_counts(parts), turns, going_first, mulligan_cost, root)
+
+
+def describe_goldfish(result: dict, curve: dict | None = None) -> str:
+    """Markdown summary of a goldfish run, for reports and LLM prompts."""
+    order = "first" if result["going_first"] else "second"
+    lines = [
+        f"Goldfish simulation ({result['games']:,} games going {order}, "
+        f"seed {result['seed']}):",
+        f"- DON!! efficiency: {result['efficiency']:.1%} of available DON!! spent on plays",
+        f"- Average wasted DON!! per game: {result['avg_wasted']}",
+        f"- Average dead turns per game: {result['avg_dead_turns']} "
+        f"({result['clean_game_rate']:.1%} of games have none)",
+        f"- Mulligan rate: {result['mulligan_rate']:.1%}",
+        "",
+        "| Turn | DON!! | Spent | Wasted | Dead turn | Cards played |",
+        "|---|---|---|---|---|---|",
+    ]
+    for turn in result["turns"]:
+        lines.append(
+            f"| {turn['turn']} | {turn['don']} | {turn['avg_spent']} | "
+            f"{turn['avg_wasted']} | {turn['dead_rate']:.1%} | {turn['avg_played']} |"
+        )
+    if curve:
+        lines.append("")
+        lines.append(
+            "Cost curve: "
+            + ", ".join(f"{cost}: {count}" for cost, count in sorted(
+                curve.items(), key=lambda item: (item[0] is None, item[0] or 0)
+            ))
+        )
+    return "\n".join(lines)
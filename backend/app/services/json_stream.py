@@ -0,0 +1,104 @@
+"""Incremental parsing of large top-level JSON arrays.
+
+The card endpoints return one JSON array with every card. ``iter_json_array``
+yields its elements as soon as each one is complete, so only the current
+element and an unparsed tail of the text are ever held in memory.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+# An element cut off by the chunk boundary fails to decode within a few
+# characters of the end of the buffer (the longest token is "-Infinity"),
+# except for an unterminated string. A failure further back is invalid JSON.
+_INCOMPLETE_TAIL = 16
+MAX_ELEMENT_SIZE = 1 << 20  # characters
+
+
+class JSONStreamError(ValueError):
+    """The stream is not a well-formed JSON array."""
+
+
+def _is_incomplete(error: json.JSONDecodeError, length: int) -> bool:
+    return error.msg.startswith("Unterminated string") or (
+        length - error.pos <= _INCOMPLETE_TAIL
+    )
+
+
+async def iter_json_array(
+    chunks: AsyncIterable[str], max_element_size: int = MAX_ELEMENT_SIZE
+) -> AsyncIterator[Any]:
+    """Yield the elements of a JSON array read from text chunks.
+
+    Raises JSONStreamError as soon as an element is known to be invalid, or
+    when one grows past ``max_element_size`` characters without completing,
+    so a malformed payload cannot make the buffer grow without bound.
+    """
+    buffer = ""
+    pos = 0
+    started = False
+    finished = False
+    expect_value = True  # False right after an element, until a comma
+    after_comma = False
+
+    async for chunk in chunks:
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            if finished:
+                raise JSONStreamError("Unexpected data after the closing ']'")
+
+            if not started:
+                if buffer[pos] != "[":
+                    raise JSONStreamError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+
+            char = buffer[pos]
+            if char == "]":
+                if after_comma:
+                    raise JSONStreamError("Expected a value after ','")
+                finished = True
+                pos += 1
+                continue
+            if not expect_value:
+                if char != ",":
+                    raise JSONStreamError(f"Expected ',' or ']' at {char!r}")
+                expect_value = True
+                after_comma = True
+                pos += 1
+                continue
+
+            try:
+                value, end = _DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if not _is_incomplete(e, len(buffer)):
+                    raise JSONStreamError(f"Invalid array element: {e}") from e
+                if len(buffer) - pos > max_element_size:
+                    raise JSONStreamError(
+                        f"Array element longer than {max_element_size} characters"
+                    ) from e
+                break  # element not complete yet; read more
+            if not isinstance(value, (dict, list, str)) and (
+                end == len(buffer) or buffer[end] not in _DELIMITERS
+            ):
+                break  # a bare number may continue in the next chunk
+            pos = end
+            expect_value = False
+            after_comma = False
+            yield value
+
+    if not finished:
+        raise JSONStreamError("JSON array was not closed")
@@ -0,0 +1,128 @@
+"""LegalPools — the cards each leader may run, precomputed after each sync.
+
+A card is legal for a leader when its colors are a subset of the leader's
+(the same rule deck validation applies). Leaders sharing a color set share
+one pool, so the whole table is at most one vector pass per color
+combination; after that, a leader's pool is a dict lookup.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+from app.services.card_catalog import CardCatalog
+from app.services.colors import mask_to_colors
+
+logger = logging.getLogger(__name__)
+
+
+def legal_rows(catalog: CardCatalog, leader_mask: int) -> np.ndarray:
+    """Catalog rows of the cards legal under ``leader_mask``, in ID order.
+
+    Cards with no recognised color (mask 0) are never legal.
+    """
+    masks = catalog.card_color_mask
+    return np.flatnonzero((masks != 0) & ((masks & ~np.uint8(leader_mask)) == 0))
+
+
+class LegalPool:
+    """Sorted card IDs legal for one color set, with summary stats."""
+
+    def __init__(self, catalog: CardCatalog, mask: int):
+        self.mask = mask
+        self.colors = mask_to_colors(mask)
+        self.rows = legal_rows(catalog, mask)
+        self.card_ids = np.array([catalog.cards[i]["id"] for i in self.rows], dtype=str)
+        self.rows.flags.writeable = False
+        self.card_ids.flags.writeable = False
+        self.stats = _pool_stats(catalog, self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, card_id: str) -> bool:
+        i = np.searchsorted(self.card_ids, card_id)
+        return i < len(self.card_ids) and self.card_ids[i] == card_id
+
+
+def _pool_stats(catalog: CardCatalog, rows: np.ndarray) -> dict:
+    cost = catalog.card_cost[rows]
+    counter = np.nan_to_num(catalog.card_counter[rows])
+    by_cost = np.bincount(cost[np.isfinite(cost)].astype(np.int64), minlength=1)
+    by_type: dict[str, int] = {}
+    by_color: dict[str, int] = {}
+    for i, mask in zip(rows.tolist(), catalog.card_color_mask[rows].tolist()):
+        card_type = catalog.cards[i]["type"] or "Unknown"
+        by_type[card_type] = by_type.get(card_type, 0) + 1
+        for color in mask_to_colors(mask):
+            by_color[color] = by_color.get(color, 0) + 1
+    return {
+        "total": len(rows),
+        "by_cost": {cost: int(n) for cost, n in enumerate(by_cost.tolist()) if n},
+        "by_type": by_type,
+        "by_color": by_color,
+        "counter_cards": int((counter > 0).sum()),
+        "counter_2000": int((counter >= 2000).sum()),
+    }
+
+
+class LegalPools:
+    """Every leader's legal pool for one catalog snapshot."""
+
+    def __init__(self, catalog: CardCatalog):
+        self.catalog = catalog
+        self.version = catalog.version
+        by_mask: dict[int, LegalPool] = {}
+        self._by_leader: dict[str, LegalPool] = {}
+        for leader, mask in zip(catalog.leaders, catalog.leader_color_mask.tolist()):
+            if mask not in by_mask:
+                by_mask[mask] = LegalPool(catalog, mask)
+            self._by_leader[leader["id"]] = by_mask[mask]
+        self._by_mask = by_mask
+
+    @property
+    def pool_count(self) -> int:
+        return len(self._by_mask)
+
+    def get(self, leader_id: str) -> LegalPool | None:
+        return self._by_leader.get(leader_id)
+
+
+# ── Process-wide pools ──
+
+_pools: LegalPools | None = None
+
+
+def get_legal_pools() -> LegalPools | None:
+    """Return the current pools, or None if they have not been built yet."""
+    return _pools
+
+
+def get_legal_pool(catalog: CardCatalog, leader_id: str) -> LegalPool | None:
+    """The cached pool of ``leader_id`` if built from ``catalog``, else a fresh one.
+
+    None for a leader the catalog does not know.
+    """
+    pools = _pools
+    if pools is not None and pools.catalog is catalog:
+        pool = pools.get(leader_id)
+        if pool is not None:
+            return pool
+    rows = catalog.leader_rows([leader_id])
+    if rows[0] < 0:
+        return None
+    return LegalPool(catalog, int(catalog.leader_color_mask[rows[0]]))
+
+
+def refresh_legal_pools(catalog: CardCatalog) -> LegalPools:
+    """Rebuild the pools for ``catalog`` and swap them in."""
+    global _pools
+    pools = LegalPools(catalog)
+    _pools = pools
+    logger.info(
+        f"Legal pools v{pools.version} built: {pools.pool_count} color sets, "
+        f"{len(catalog.leaders)} leaders"
+    )
+    return pools
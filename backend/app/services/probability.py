@@ -0,0 +1,131 @@
+"""Exact draw probabilities from the (multivariate) hypergeometric distribution.
+
+"At least k of these K cards among the top n of an N-card deck" has a closed
+form, so consistency questions are answered exactly instead of sampled.
+Binomial coefficients come from a cached log-factorial table, which keeps
+every term a float lookup and an ``exp``; a one-group query over a 50-card
+deck takes a few microseconds.
+
+Several groups at once ("a 2-drop AND a searcher by turn 2") are handled
+even when the groups overlap: the deck is split into cells of cards that
+belong to exactly the same groups, and a small dynamic programme over the
+cells counts copies per group, capped at what each group needs.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import Sequence
+
+_LOG_FACT: list[float] = [0.0]
+
+
+def log_factorial(n: int) -> float:
+    """ln(n!), from a table grown on demand and kept for the process."""
+    if n >= len(_LOG_FACT):
+        for i in range(len(_LOG_FACT), n + 1):
+            _LOG_FACT.append(_LOG_FACT[-1] + math.log(i))
+    return _LOG_FACT[n]
+
+
+def log_comb(n: int, k: int) -> float:
+    """ln C(n, k); -inf when the choice is impossible."""
+    if k < 0 or k > n:
+        return -math.inf
+    return log_factorial(n) - log_factorial(k) - log_factorial(n - k)
+
+
+def hypergeom_pmf(k: int, population: int, successes: int, draws: int) -> float:
+    """P(exactly k successes in ``draws`` cards without replacement)."""
+    if k < 0 or k > successes or k > draws or draws - k > population - successes:
+        return 0.0
+    return math.exp(
+        log_comb(successes, k)
+        + log_comb(population - successes, draws - k)
+        - log_comb(population, draws)
+    )
+
+
+@lru_cache(maxsize=4096)
+def prob_at_least(k: int, population: int, successes: int, draws: int) -> float:
+    """P(at least k successes in ``draws`` cards without replacement)."""
+    if k <= 0:
+        return 1.0
+    draws = min(draws, population)
+    top = min(successes, draws)
+    if k > top:
+        return 0.0
+    # Sum the shorter tail
+    if k > top - k:
+        return min(1.0, sum(hypergeom_pmf(i, population, successes, draws) for i in range(k, top + 1)))
+    return max(0.0, 1.0 - sum(hypergeom_pmf(i, population, successes, draws) for i in range(k)))
+
+
+def expected_successes(population: int, successes: int, draws: int) -> float:
+    if population <= 0:
+        return 0.0
+    return min(draws, population) * successes / population
+
+
+def prob_all_at_least(
+    cells: Sequence[tuple[int, int]],
+    needs: Sequence[int],
+    population: int,
+    draws: int,
+) -> float:
+    """P(every group i has at least ``needs[i]`` copies among ``draws`` cards).
+
+    Args:
+        cells: (copies, group_bits) for each set of cards belonging to exactly
+            the same groups; bit i set means the cell counts toward group i.
+            Cards in no group are implied by ``population``.
+        needs: Minimum copies per group
+        population: Deck size
+        draws: Cards drawn
+    """
+    return prob_all_at_least_by_draws(cells, needs, population, [draws])[0]
+
+
+def prob_all_at_least_by_draws(
+    cells: Sequence[tuple[int, int]],
+    needs: Sequence[int],
+    population: int,
+    draws: Sequence[int],
+) -> list[float]:
+    """prob_all_at_least for several draw counts (e.g. one per turn) in one pass."""
+    draws = [max(0, min(n, population)) for n in draws]
+    most = max(draws, default=0)
+    cells = [(copies, bits) for copies, bits in cells if bits and copies > 0]
+    rest = population - sum(copies for copies, _ in cells)
+
+    # state: (group cards drawn, copies per group capped at its need) -> ways
+    states: dict[tuple, float] = {(0, (0,) * len(needs)): 1.0}
+    for copies, bits in cells:
+        members = [i for i in range(len(needs)) if bits >> i & 1]
+        weights = [math.exp(log_comb(copies, x)) for x in range(min(copies, most) + 1)]
+        nxt: dict[tuple, float] = {}
+        for (drawn, counts), weight in states.items():
+            for x in range(min(copies, most - drawn) + 1):
+                capped = list(counts)
+                for i in members:
+                    capped[i] = min(needs[i], capped[i] + x)
+                key = (drawn + x, tuple(capped))
+                nxt[key] = nxt.get(key, 0.0) + weight * weights[x]
+        states = nxt
+
+    # Ways to satisfy every group with exactly `drawn` group cards; the other
+    # draws all come from cards in no group
+    goal = tuple(needs)
+    satisfied: dict[int, float] = {}
+    for (drawn, counts), weight in states.items():
+        if counts == goal:
+            satisfied[drawn] = satisfied.get(drawn, 0.0) + weight
+    return [
+        min(1.0, sum(
+            weight * math.exp(log_comb(rest, n - drawn) - log_comb(population, n))
+            for drawn, weight in satisfied.items()
+            if drawn <= n
+        ))
+        for n in draws
+    ]
@@ -0,0 +1,48 @@
+"""Shared process pool for CPU-bound simulations.
+
+Simulations are pure NumPy work on small, picklable inputs, so large runs are
+split into batches and spread across worker processes. One pool is created
+lazily per API process and shut down with the app.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: workers must not inherit the event loop or DB connections
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.simulation_workers or None,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"Process pool started ({_pool._max_workers} workers)")
+    return _pool
+
+
+async def map_in_processes(fn: Callable[..., Any], calls: Iterable[tuple]) -> list:
+    """Run ``fn(*args)`` for each args tuple in the pool; results in order."""
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    return await asyncio.gather(
+        *(loop.run_in_executor(pool, fn, *args) for args in calls)
+    )
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
@@ -1,9 +1,25 @@
-from typing import List, Dict
+from collections import defaultdict
+from typing import Any, Dict, List
+
 from app.models import Card
+from app.services.card_catalog import get_catalog
+from app.services.card_references import CardReferenceIndex, split_traits
 
 
 class SynergyDetector:
-    """Detects synergies between cards in a deck"""
+    """Detects synergies between cards in a deck.
+
+    Instead of testing every pair, cards are bucketed by attribute, category
+    and cost so only pairs that share a bucket are ever visited, and search
+    effects are resolved with one CardReferenceIndex pass over each searcher's
+    text.
+    The work is O(n + matches) and every synergy type of a pair is reported.
+    """
+
+    def __init__(self, references: CardReferenceIndex | None = None):
+        # Defaults to the loaded catalog's index; without a catalog one is
+        # built per call from the deck's own cards
+        self.references = references
 
     async def detect_synergies(self, deck_cards: List[tuple[Card, int]]) -> List[Dict]:
         """
@@ -13,70 +29,120 @@ class SynergyDetector:
             deck_cards: List of (card, quantity) tuples
 
         Returns:
-            List of synergy dictionaries
+            List of synergy dictionaries, grouped by type
         """
-        synergies = []
+        return self.find_synergies(deck_cards)
+
+    def find_synergies(self, deck_cards: List[tuple[Any, int]]) -> List[Dict]:
+        """Synchronous core of detect_synergies, usable outside the event loop"""
+        cards = [card for card, _ in deck_cards]
+        qty = [quantity for _, quantity in deck_cards]
+        ids = [card.id for card in cards]
+        names = [card.name for card in cards]
+        synergies: List[Dict] = []
+        append = synergies.append
+
+        by_attribute: dict[str, list[int]] = defaultdict(list)
+        by_category: dict[str, list[int]] = defaultdict(list)
+        by_cost: dict[int, list[int]] = defaultdict(list)
+        for i, card in enumerate(cards):
+            if card.attribute:
+                by_attribute[card.attribute].append(i)
+            if card.category:
+                by_category[card.category].append(i)
+            if card.cost is not None:
+                by_cost[card.cost].append(i)
+
+        # Attribute synergy (e.g., "Slash" attribute boost): same attribute and
+        # at least one of the two texts mentions it
+        for attribute, members in by_attribute.items():
+            mentions = {i for i in members if attribute in (cards[i].text or "")}
+            if not mentions:
+                continue
+            explanation = f"{attribute} attribute tribal synergy"
+            for x, i in enumerate(members):
+                mentioned = i in mentions
+                for j in members[x + 1 :]:
+                    if mentioned or j in mentions:
+                        append({
+                            "type": "attribute_synergy",
+                            "cards": [ids[i], ids[j]],
+                            "card_names": [names[i], names[j]],
+                            "explanation": explanation,
+                            "attribute": attribute,
+                            "strength": min(qty[i], qty[j]),
+                        })
 
-        for i, (card_a, qty_a) in enumerate(deck_cards):
-            for card_b, qty_b in deck_cards[i + 1 :]:
-                synergy = self._check_synergy(card_a, card_b)
-                if synergy:
-                    synergy["strength"] = min(qty_a, qty_b)  # Synergy strength
-                    synergies.append(synergy)
+        # Category synergy (e.g., "Straw Hat Crew")
+        for category, members in by_category.items():
+            explanation = f"{category} tribal synergy"
+            for x, i in enumerate(members):
+                for j in members[x + 1 :]:
+                    append({
+                        "type": "category_synergy",
+                        "cards": [ids[i], ids[j]],
+                        "card_names": [names[i], names[j]],
+                        "explanation": explanation,
+                        "category": category,
+                        "strength": min(qty[i], qty[j]),
+                    })
+
+        # Cost curve synergy (smooth progression): adjacent cost buckets
+        for cost, members in by_cost.items():
+            following = by_cost.get(cost + 1)
+            if not following:
+                continue
+            rising = f"Smooth cost progression ({cost} -> {cost + 1})"
+            falling = f"Smooth cost progression ({cost + 1} -> {cost})"
+            for i in members:
+                for j in following:
+                    a, b, explanation = (i, j, rising) if i < j else (j, i, falling)
+                    append({
+                        "type": "curve_synergy",
+                        "cards": [ids[a], ids[b]],
+                        "card_names": [names[a], names[b]],
+                        "explanation": explanation,
+                        "strength": min(qty[a], qty[b]),
+                    })
+
+        # Search effect synergy: a searcher's text names another card
+        # ("[Nami]") or one of its traits ("{Straw Hat Crew}")
+        searchers = [
+            i for i, card in enumerate(cards)
+            if card.text and "search" in card.text.lower()
+        ]
+        if searchers:
+            references = self._references(cards)
+            by_id: dict[str, list[int]] = defaultdict(list)
+            by_trait: dict[str, list[int]] = defaultdict(list)
+            for i, card in enumerate(cards):
+                by_id[card.id].append(i)
+                for trait in split_traits(card.category):
+                    by_trait[trait].append(i)
+            for i in searchers:
+                refs = references.find(cards[i].text)
+                targets = {j for cid in refs.card_ids for j in by_id.get(cid, ())}
+                for trait in refs.traits:
+                    targets.update(by_trait.get(trait, ()))
+                targets.discard(i)
+                for j in sorted(targets):
+                    append({
+                        "type": "search_synergy",
+                        "cards": [ids[i], ids[j]],
+                        "card_names": [names[i], names[j]],
+                        "explanation": f"{names[i]} can search for {names[j]}",
+                        "strength": min(qty[i], qty[j]),
+                    })
 
         return synergies
 
-    def _check_synergy(self, card_a: Card, card_b: Card) -> Dict | None:
-        """Check if two cards have synergy"""
-
-        # Attribute synergy (e.g., "Slash" attribute boost)
-        if card_a.attribute and card_b.attribute == card_a.attribute:
-            if card_a.attribute in (card_a.text or "") or card_a.attribute in (
-                card_b.text or ""
-            ):
-                return {
-                    "type": "attribute_synergy",
-                    "cards": [card_a.id, card_b.id],
-                    "card_names": [card_a.name, card_b.name],
-                    "explanation": f"{card_a.attribute} attribute tribal synergy",
-                    "attribute": card_a.attribute,
-                }
-
-        # Category synergy (e.g., "Straw Hat Crew")
-        if card_a.category and card_a.category == card_b.category:
-            return {
-                "type": "category_synergy",
-                "cards": [card_a.id, card_b.id],
-                "card_names": [card_a.name, card_b.name],
-                "explanation": f"{card_a.category} tribal synergy",
-                "category": card_a.category,
-            }
-
-        # Cost curve synergy (smooth progression)
-        if card_a.cost is not None and card_b.cost is not None:
-            if abs(card_a.cost - card_b.cost) == 1:
-                return {
-                    "type": "curve_synergy",
-                    "cards": [card_a.id, card_b.id],
-                    "card_names": [card_a.name, card_b.name],
-                    "explanation": f"Smooth cost progression ({card_a.cost} -> {card_b.cost})",
-                }
-
-        # Search effect synergy
-        if card_a.text and card_b.text:
-            card_a_text_lower = card_a.text.lower()
-            card_b_text_lower = card_b.text.lower()
-
-            # Card A searches for something, Card B benefits from being searched
-            if "search" in card_a_text_lower and card_b.name.lower() in card_a_text_lower:
-                return {
-                    "type": "search_synergy",
-                    "cards": [card_a.id, card_b.id],
-                    "card_names": [card_a.name, card_b.name],
-                    "explanation": f"{card_a.name} can search for {card_b.name}",
-                }
-
-        return None
+    def _references(self, cards: List[Any]) -> CardReferenceIndex:
+        if self.references is not None:
+            return self.references
+        catalog = get_catalog()
+        if catalog is not None:
+            return catalog.references
+        return CardReferenceIndex((c.id, c.name, c.category) for c in cards)
 
     def get_synergy_summary(self, synergies: List[Dict]) -> Dict:
         """Generate a summary of synergies"""
@@ -0,0 +1,346 @@
+"""SynergyGraph — catalog-wide card-to-card synergy, precomputed after each sync.
+
+Cards and leaders are nodes; an edge means two cards work together. Edges come
+from shared traits, attribute references ("<Slash>" in a card's text), text
+that names another card or trait (searchers, "if you have [Nami]") and, as a
+tie-breaking bonus on existing edges, adjacent costs. Each node keeps only its
+``top_k`` strongest edges, stored as CSR arrays so the neighbours of a card are
+one contiguous slice and scoring a whole deck is a single ``bincount``.
+
+The graph is saved as an ``.npz`` next to the app and reloaded at startup when
+it matches the current catalog version, so a restart does not rebuild it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+from collections import defaultdict
+from typing import Iterable
+
+import numpy as np
+
+from app.config import settings
+from app.services.card_catalog import CardCatalog
+from app.services.card_references import split_traits
+from app.services.colors import color_mask
+
+logger = logging.getLogger(__name__)
+
+# Edge kinds (bit flags, OR-ed when a pair is related in several ways)
+TRAIT = 1
+ATTRIBUTE = 2
+REFERENCE = 4
+COST = 8
+KIND_NAMES = {TRAIT: "trait", ATTRIBUTE: "attribute", REFERENCE: "reference", COST: "cost"}
+
+REFERENCE_WEIGHT = 1.0
+ATTRIBUTE_WEIGHT = 0.5
+COST_BONUS = 0.1
+
+
+def kinds_to_names(kinds: int) -> list[str]:
+    return [name for bit, name in KIND_NAMES.items() if kinds & bit]
+
+
+class SynergyGraph:
+    """Immutable CSR adjacency over the catalog's cards followed by its leaders."""
+
+    def __init__(
+        self,
+        node_ids: list[str],
+        card_count: int,
+        color_masks: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+        kinds: np.ndarray,
+        version: int = 0,
+    ):
+        self.node_ids = node_ids
+        self.card_count = card_count
+        self.color_masks = color_masks
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.kinds = kinds
+        self.version = version
+        self._index = {node_id: i for i, node_id in enumerate(node_ids)}
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def neighbours(self, node_id: str) -> list[tuple[str, float, list[str]]]:
+        """All stored edges of one card or leader, strongest first."""
+        row = self._index.get(node_id)
+        if row is None:
+            return []
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return [
+            (self.node_ids[j], float(w), kinds_to_names(int(k)))
+            for j, w, k in zip(
+                self.indices[start:end], self.weights[start:end], self.kinds[start:end]
+            )
+        ]
+
+    def scores(self, card_ids: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Total synergy of every card to ``card_ids``, with the edge kinds seen.
+
+        Both arrays cover the card nodes only (leaders can't be added to a
+        deck); members of the input set keep their score.
+        """
+        rows = [self._index[cid] for cid in dict.fromkeys(card_ids) if cid in self._index]
+        n = len(self.node_ids)
+        if not rows:
+            return np.zeros(self.card_count), np.zeros(self.card_count, dtype=np.uint8)
+
+        slices = [slice(self.indptr[r], self.indptr[r + 1]) for r in rows]
+        neighbours = np.concatenate([self.indices[s] for s in slices])
+        scores = np.bincount(
+            neighbours,
+            weights=np.concatenate([self.weights[s] for s in slices]),
+            minlength=n,
+        )[: self.card_count]
+        reasons = np.zeros(n, dtype=np.uint8)
+        np.bitwise_or.at(reasons, neighbours, np.concatenate([self.kinds[s] for s in slices]))
+        return scores, reasons[: self.card_count]
+
+    def top_k(
+        self,
+        card_ids: Iterable[str],
+        k: int = 20,
+        leader_mask: int | None = None,
+    ) -> list[tuple[str, float, list[str]]]:
+        """Cards with the highest total synergy to ``card_ids``.
+
+        Members of the input set and leaders are never returned. With
+        ``leader_mask`` only cards legal under those leader colors are.
+        """
+        card_ids = list(dict.fromkeys(card_ids))
+        scores, reasons = self.scores(card_ids)
+        rows = [self._index[cid] for cid in card_ids if cid in self._index]
+        if not rows:
+            return []
+
+        scores[[r for r in rows if r < self.card_count]] = 0
+        if leader_mask is not None:
+            illegal = (self.color_masks == 0) | (
+                (self.color_masks & ~np.uint8(leader_mask)) != 0
+            )
+            scores[illegal] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if candidates.size > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [
+            (self.node_ids[j], round(float(scores[j]), 3), kinds_to_names(int(reasons[j])))
+            for j in candidates
+        ]
+
+    # ── Persistence ──
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp,
+            node_ids=np.array(self.node_ids, dtype=str),
+            card_count=np.array(self.card_count),
+            color_masks=self.color_masks,
+            indptr=self.indptr,
+            indices=self.indices,
+            weights=self.weights,
+            kinds=self.kinds,
+            version=np.array(self.version),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SynergyGraph":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                node_ids=data["node_ids"].tolist(),
+                card_count=int(data["card_count"]),
+                color_masks=data["color_masks"],
+                indptr=data["indptr"],
+                indices=data["indices"],
+                weights=data["weights"],
+                kinds=data["kinds"],
+                version=int(data["version"]),
+            )
+
+
+def build_synergy_graph(catalog: CardCatalog, top_k: int | None = None) -> SynergyGraph:
+    """Build the graph from a catalog snapshot. CPU-bound; run it off the loop."""
+    top_k = top_k or settings.synergy_graph_top_k
+    nodes = catalog.cards + catalog.leaders
+    n = len(nodes)
+    edges = _EdgeList()
+
+    # Shared traits, weighted down for big traits: sharing "Straw Hat Crew"
+    # says less than sharing a trait only a handful of cards have
+    traits: dict[str, list[int]] = defaultdict(list)
+    for i, node in enumerate(nodes):
+        for trait in split_traits(node["category"]):
+            traits[trait].append(i)
+    for members in traits.values():
+        if len(members) > 1:
+            edges.clique(members, 1.0 / math.log2(1 + len(members)), TRAIT)
+
+    # Attribute references: a card whose text mentions its own attribute
+    # pairs with every card of that attribute
+    attributes: dict[str, list[int]] = defaultdict(list)
+    for i, node in enumerate(nodes):
+        if node["attribute"]:
+            attributes[node["attribute"]].append(i)
+    for attribute, members in attributes.items():
+        mentions = [i for i in members if attribute in (nodes[i]["text"] or "")]
+        edges.star(mentions, members, ATTRIBUTE_WEIGHT, ATTRIBUTE)
+
+    # Text references: "[Name]" of another card or "{Trait}" of a group
+    index = {node["id"]: i for i, node in enumerate(nodes)}
+    for i, node in enumerate(nodes):
+        refs = catalog.references.find(node["text"], exclude=node["id"])
+        targets = [index[cid] for cid in refs.card_ids]
+        for trait in refs.traits:
+            targets.extend(traits.get(trait, ()))
+        edges.star([i], targets, REFERENCE_WEIGHT, REFERENCE)
+
+    src, dst, weights, kinds = edges.coalesce(n)
+
+    # Cost adjacency only strengthens pairs that are already related;
+    # on its own it would connect a fifth of the catalog
+    costs = np.array(
+        [np.nan if node.get("cost") is None else node["cost"] for node in nodes],
+        dtype=np.float32,
+    )
+    adjacent = np.abs(costs[src] - costs[dst]) == 1
+    weights[adjacent] += COST_BONUS
+    kinds[adjacent] |= COST
+
+    # Keep each node's strongest top_k edges, strongest first
+    order = np.lexsort((-weights, src))
+    src, dst, weights, kinds = src[order], dst[order], weights[order], kinds[order]
+    counts = np.bincount(src, minlength=n)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    keep = (np.arange(len(src)) - starts[src]) < top_k
+    src, dst, weights, kinds = src[keep], dst[keep], weights[keep], kinds[keep]
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return SynergyGraph(
+        node_ids=[node["id"] for node in nodes],
+        card_count=len(catalog.cards),
+        color_masks=np.array(
+            [color_mask(card["color"]) for card in catalog.cards], dtype=np.uint8
+        ),
+        indptr=indptr,
+        indices=dst.astype(np.int32),
+        weights=weights.astype(np.float32),
+        kinds=kinds.astype(np.uint8),
+        version=catalog.version,
+    )
+
+
+class _EdgeList:
+    """Accumulates directed edges as NumPy blocks; duplicates merge in coalesce."""
+
+    def __init__(self):
+        self.blocks: list[tuple[np.ndarray, np.ndarray, float, int]] = []
+
+    def clique(self, members: list[int], weight: float, kind: int) -> None:
+        """Every ordered pair of distinct members."""
+        m = np.asarray(members, dtype=np.int64)
+        src = np.repeat(m, len(m))
+        dst = np.tile(m, len(m))
+        self._add(src, dst, weight, kind)
+
+    def star(self, centres: list[int], members: list[int], weight: float, kind: int) -> None:
+        """Each centre with each member, in both directions."""
+        if not centres or not members:
+            return
+        c = np.asarray(centres, dtype=np.int64)
+        m = np.asarray(members, dtype=np.int64)
+        src = np.repeat(c, len(m))
+        dst = np.tile(m, len(c))
+        self._add(np.concatenate([src, dst]), np.concatenate([dst, src]), weight, kind)
+
+    def _add(self, src: np.ndarray, dst: np.ndarray, weight: float, kind: int) -> None:
+        distinct = src != dst
+        self.blocks.append((src[distinct], dst[distinct], weight, kind))
+
+    def coalesce(self, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Merge parallel edges: weights are summed, kinds OR-ed.
+
+        Within one kind a pair counts once (e.g. a card naming another twice),
+        so weights are summed across kinds, not across repeats.
+        """
+        if not self.blocks:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.uint8)
+
+        keys, weights, kinds = [], [], []
+        for src, dst, weight, kind in self.blocks:
+            key = src * n + dst
+            keys.append(key)
+            weights.append(np.full(len(key), weight))
+            kinds.append(np.full(len(key), kind, dtype=np.uint8))
+        keys = np.concatenate(keys)
+        weights = np.concatenate(weights)
+        kinds = np.concatenate(kinds)
+
+        # Collapse repeats of the same (pair, kind), keeping the highest weight
+        order = np.lexsort((-weights, kinds, keys))
+        keys, weights, kinds = keys[order], weights[order], kinds[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = (keys[1:] != keys[:-1]) | (kinds[1:] != kinds[:-1])
+        keys, weights, kinds = keys[first], weights[first], kinds[first]
+
+        # Then merge the kinds of each pair
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        keys = keys[starts]
+        weights = np.add.reduceat(weights, starts)
+        kinds = np.bitwise_or.reduceat(kinds, starts)
+        return keys // n, keys % n, weights, kinds
+
+
+# ── Process-wide graph ──
+
+_graph: SynergyGraph | None = None
+
+
+def get_synergy_graph() -> SynergyGraph | None:
+    """Return the current graph, or None if it has not been built yet."""
+    return _graph
+
+
+async def refresh_synergy_graph(catalog: CardCatalog, rebuild: bool = False) -> SynergyGraph:
+    """Load the saved graph for this catalog version, or build and save one."""
+    global _graph
+    path = settings.synergy_graph_path
+    graph = None
+    if not rebuild and os.path.exists(path):
+        try:
+            saved = await asyncio.to_thread(SynergyGraph.load, path)
+            if saved.version == catalog.version:
+                graph = saved
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable synergy graph at {path}: {e}")
+
+    if graph is None:
+        graph = await asyncio.to_thread(build_synergy_graph, catalog)
+        try:
+            await asyncio.to_thread(graph.save, path)
+        except OSError as e:
+            logger.warning(f"Synergy graph not saved to {path}: {e}")
+
+    _graph = graph
+    logger.info(
+        f"Synergy graph v{graph.version} ready: {len(graph.node_ids)} nodes, "
+        f"{graph.edge_count} edges"
+    )
+    return graph
@@ -0,0 +1,74 @@
+"""Multi-pattern substring matching (Aho-Corasick).
+
+Finding which of N card names occur in a card's text by testing each name with
+``in`` costs O(N * len(text)) per card. The automaton walks the text once and
+reports every occurrence, overlapping ones included, in
+O(len(text) + matches) regardless of how many patterns it holds.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Iterator
+
+
+class AhoCorasick:
+    """Immutable automaton over a fixed list of patterns.
+
+    Matching is exact and case-sensitive; lowercase patterns and text first for
+    case-insensitive lookups. Results refer to patterns by their index in the
+    list given to the constructor.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(patterns)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(index)
+
+        # Breadth-first so a node's failure target is final before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit the matches of the longest proper suffix
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """Yield (end_offset, pattern_index) for every occurrence in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for pos, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in out[node]:
+                yield pos + 1, index
+
+    def find(self, text: str) -> set[int]:
+        """Indices of the patterns that occur anywhere in ``text``."""
+        return {index for _, index in self.iter_matches(text)}
@@ -2,6 +2,7 @@ import asyncio
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.models import Card, Leader
+from app.services.colors import color_mask
 from datetime import datetime
 
 async def insert_sample_data():
@@ -22,6 +23,7 @@ async def insert_sample_data():
                 life=5,
                 power=5000,
                 colors=["Red"],
+                color_mask=color_mask(["Red"]),
                 attribute="Slash",
                 text="[Activate: Main] [Once Per Turn] Give this Leader or 1 of your Characters up to 1 rested DON!! card",
                 featured_character="Monkey D. Luffy",
@@ -35,6 +37,7 @@ async def insert_sample_data():
                 life=4,
                 power=6000,
                 colors=["Green"],
+                color_mask=color_mask(["Green"]),
                 attribute="Slash",
                 text="[Activate: Main] [Once Per Turn] You may trash 1 card from your hand: Add up to 1 DON!! card from your DON!! deck and set it as active.",
                 featured_character="Roronoa Zoro",
@@ -51,6 +54,7 @@ async def insert_sample_data():
                 name="Monkey D. Luffy",
                 type="Character",
                 color="Red",
+                color_mask=color_mask("Red"),
                 cost=5,
                 power=6000,
                 counter=1000,
@@ -65,6 +69,7 @@ async def insert_sample_data():
                 name="Portgas D. Ace",
                 type="Character",
                 color="Red",
+                color_mask=color_mask("Red"),
                 cost=7,
                 power=7000,
                 counter=0,
@@ -79,6 +84,7 @@ async def insert_sample_data():
                 name="Gum-Gum Red Hawk",
                 type="Event",
                 color="Red",
+                color_mask=color_mask("Red"),
                 cost=5,
                 power=0,
                 counter=0,
@@ -92,6 +98,7 @@ async def insert_sample_data():
                 name="Roronoa Zoro",
                 type="Character",
                 color="Green",
+                color_mask=color_mask("Green"),
                 cost=3,
                 power=4000,
                 counter=1000,
@@ -106,6 +113,7 @@ async def insert_sample_data():
                 name="Nami",
                 type="Character",
                 color="Blue",
+                color_mask=color_mask("Blue"),
                 cost=1,
                 power=2000,
                 counter=1000,
@@ -0,0 +1,163 @@
+"""
+Benchmark SynergyDetector against the original all-pairs scan.
+
+Runs on a 50-card deck and on the whole catalog. Cards come from the database
+with --db, otherwise from a seeded synthetic catalog shaped like the real one.
+
+Usage:
+    cd backend
+    uv run python -m scripts.benchmark_synergy
+    uv run python -m scripts.benchmark_synergy --db
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+
+from app.services.synergy_detector import SynergyDetector
+from app.services.card_references import CardReferenceIndex
+
+ATTRIBUTES = ["Slash", "Strike", "Ranged", "Special", "Wisdom"]
+
+
+def pair_scan(deck_cards):
+    """The pre-index implementation: every pair, first matching type only."""
+    synergies = []
+    for i, (card_a, qty_a) in enumerate(deck_cards):
+        for card_b, qty_b in deck_cards[i + 1 :]:
+            synergy = _check_pair(card_a, card_b)
+            if synergy:
+                synergy["strength"] = min(qty_a, qty_b)
+                synergies.append(synergy)
+    return synergies
+
+
+def _check_pair(card_a, card_b):
+    if card_a.attribute and card_b.attribute == card_a.attribute:
+        if card_a.attribute in (card_a.text or "") or card_a.attribute in (
+            card_b.text or ""
+        ):
+            return {
+                "type": "attribute_synergy",
+                "cards": [card_a.id, card_b.id],
+                "card_names": [card_a.name, card_b.name],
+                "explanation": f"{card_a.attribute} attribute tribal synergy",
+                "attribute": card_a.attribute,
+            }
+    if card_a.category and card_a.category == card_b.category:
+        return {
+            "type": "category_synergy",
+            "cards": [card_a.id, card_b.id],
+            "card_names": [card_a.name, card_b.name],
+            "explanation": f"{card_a.category} tribal synergy",
+            "category": card_a.category,
+        }
+    if card_a.cost is not None and card_b.cost is not None:
+        if abs(card_a.cost - card_b.cost) == 1:
+            return {
+                "type": "curve_synergy",
+                "cards": [card_a.id, card_b.id],
+                "card_names": [card_a.name, card_b.name],
+                "explanation": f"Smooth cost progression ({card_a.cost} -> {card_b.cost})",
+            }
+    if card_a.text and card_b.text:
+        card_a_text_lower = card_a.text.lower()
+        card_b_text_lower = card_b.text.lower()
+        if "search" in card_a_text_lower and card_b.name.lower() in card_a_text_lower:
+            return {
+                "type": "search_synergy",
+                "cards": [card_a.id, card_b.id],
+                "card_names": [card_a.name, card_b.name],
+                "explanation": f"{card_a.name} can search for {card_b.name}",
+            }
+    return None
+
+
+def synthetic_catalog(size: int, seed: int) -> list:
+    rng = random.Random(seed)
+    names = [f"Character {n}" for n in range(size // 3)]
+    categories = [f"Crew {n}" for n in range(150)]
+    cards = []
+    for n in range(size):
+        attribute = rng.choice(ATTRIBUTES)
+        text = rng.choice(["", "[Blocker]", f"[On Play] Give your {attribute} cards +1000."])
+        if rng.random() < 0.15:
+            text = f"[On Play] Look at 5 cards and search for a [{rng.choice(names)}]."
+        cards.append(
+            SimpleNamespace(
+                id=f"OP{n // 120 + 1:02d}-{n % 120 + 1:03d}",
+                name=rng.choice(names),
+                attribute=attribute,
+                category=rng.choice(categories),
+                cost=rng.randint(0, 10),
+                text=text,
+            )
+        )
+    return cards
+
+
+async def database_catalog() -> list:
+    from app.database import AsyncSessionLocal
+    from app.services.card_catalog import load_catalog
+
+    async with AsyncSessionLocal() as db:
+        catalog = await load_catalog(db)
+    return [SimpleNamespace(**card) for card in catalog.cards]
+
+
+def timed(fn, *args, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def compare(label: str, deck_cards: list, repeat: int, detector: SynergyDetector) -> None:
+    old_time, old = timed(pair_scan, deck_cards, repeat=repeat)
+    new_time, new = timed(detector.find_synergies, deck_cards, repeat=repeat)
+
+    # Every synergy the scan found must also be reported by the index. Search
+    # synergies are exempt: the scan matched bare substrings ("Ace" in
+    # "place"), the index only bracketed names and braced traits.
+    found = {(tuple(s["cards"]), s["type"]) for s in new}
+    found |= {((b, a), kind) for (a, b), kind in found}
+    missing = [
+        s for s in old
+        if s["type"] != "search_synergy" and (tuple(s["cards"]), s["type"]) not in found
+    ]
+    assert not missing, f"index missed {len(missing)} synergies, e.g. {missing[0]}"
+
+    print(
+        f"{label:<22} {len(deck_cards):>6} cards | "
+        f"pair scan {old_time * 1000:9.1f} ms ({len(old):>8} synergies) | "
+        f"indexed {new_time * 1000:9.1f} ms ({len(new):>8} synergies) | "
+        f"{old_time / new_time:6.1f}x"
+    )
+
+
+async def main(args: argparse.Namespace):
+    if args.db:
+        catalog = await database_catalog()
+    else:
+        catalog = synthetic_catalog(args.catalog_size, args.seed)
+
+    rng = random.Random(args.seed)
+    deck = [(card, rng.randint(1, 4)) for card in rng.sample(catalog, min(50, len(catalog)))]
+    # Names and traits are matched with one index built for the whole catalog
+    references = CardReferenceIndex((c.id, c.name, c.category) for c in catalog)
+    detector = SynergyDetector(references=references)
+    compare("50-card deck", deck, args.repeat, detector)
+    compare("whole catalog", [(card, 1) for card in catalog], 1, detector)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", action="store_true", help="Use the cards in the database")
+    parser.add_argument("--catalog-size", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -4,29 +4,70 @@ Standalone script to sync cards from optcgapi.com into the database.
 Usage:
     cd backend
     uv run python -m scripts.sync_cards
+    uv run python -m scripts.sync_cards --force            # ignore stored ETags
+    uv run python -m scripts.sync_cards --record fixtures  # save API payloads
+    uv run python -m scripts.sync_cards --fixtures fixtures  # replay offline
+    uv run python -m scripts.sync_cards --no-stream        # buffer whole payloads
 """
 
+import argparse
 import asyncio
 import logging
 from app.database import AsyncSessionLocal
+from app.services.card_catalog import load_catalog
 from app.services.card_sync import OPTCGAPIClient
+from app.services.fixture_transport import FixtureTransport, RecordingTransport
+from app.services.synergy_graph import refresh_synergy_graph
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 
-async def main():
+async def main(args: argparse.Namespace):
     logger.info("Starting card sync from optcgapi.com...")
 
-    client = OPTCGAPIClient()
+    transport = None
+    if args.fixtures:
+        transport = FixtureTransport(args.fixtures)
+    elif args.record:
+        transport = RecordingTransport(args.record)
+
+    client = OPTCGAPIClient(transport=transport)
     async with AsyncSessionLocal() as db:
-        stats = await client.sync_to_database(db)
+        stats = await client.sync_to_database(db, force=args.force, stream=args.stream)
+        if stats.get("catalog_changed"):
+            # Saved to disk; the API picks it up at its next startup or sync
+            catalog = await load_catalog(db)
+            graph = await refresh_synergy_graph(catalog, rebuild=True)
+            logger.info(f"  Synergy graph: {graph.edge_count} edges")
 
     logger.info(f"Sync complete!")
     logger.info(f"  Cards synced: {stats['cards_synced']}")
     logger.info(f"  Leaders synced: {stats['leaders_synced']}")
     logger.info(f"  Errors: {stats.get('errors', 0)}")
+    if stats.get("not_modified"):
+        logger.info(f"  Unchanged upstream: {', '.join(stats['not_modified'])}")
+    diff = stats.get("diff")
+    if diff:
+        logger.info(
+            f"  Diff: {len(diff['added'])} added, {len(diff['changed'])} changed, "
+            f"{len(diff['removed'])} removed, {stats.get('unchanged', 0)} unchanged"
+        )
+    logger.info(f"  Time: {stats.get('seconds')}s (streamed: {stats.get('streamed')})")
+    if stats.get("rows_per_sec"):
+        logger.info(f"  Throughput: {stats['rows_per_sec']} rows/sec")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--force", action="store_true", help="Refetch even if unchanged")
+    parser.add_argument(
+        "--stream",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Parse and write payloads incrementally (default: CARD_SYNC_STREAMING)",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--fixtures", help="Replay API payloads from this directory")
+    source.add_argument("--record", help="Save fetched API payloads to this directory")
+    asyncio.run(main(parser.parse_args()))
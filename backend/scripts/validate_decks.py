@@ -0,0 +1,87 @@
+"""
+Validate and profile NDJSON decklists in bulk.
+
+Reads one decklist per line, {"ref": ..., "leader_id": ..., "cards":
+[{"card_id": ..., "quantity": ...}]}, and writes one NDJSON result per line in
+the same order. All referenced cards are fetched in a single query.
+
+Usage:
+    cd backend
+    uv run python -m scripts.validate_decks decks.ndjson
+    cat decks.ndjson | uv run python -m scripts.validate_decks - -o results.ndjson
+    uv run python -m scripts.validate_decks decks.ndjson --no-stats --invalid-only
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+import time
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.card_catalog import load_catalog_subset
+from app.services.deck_batch import (
+    Decklist,
+    parse_decklists,
+    referenced_ids,
+    run_batch,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _open(path: str, mode: str):
+    """Open ``path``; "-" is stdin/stdout, left open when the block exits"""
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin if mode == "r" else sys.stdout)
+    return open(path, mode, encoding="utf-8")
+
+
+async def main(args: argparse.Namespace):
+    with _open(args.input, "r") as source:
+        items = list(parse_decklists(source))
+    decklists = [item for item in items if isinstance(item, Decklist)]
+
+    async with AsyncSessionLocal() as db:
+        catalog = await load_catalog_subset(db, *referenced_ids(decklists))
+
+    started = time.perf_counter()
+    counts = {"valid": 0, "invalid": 0, "malformed": 0}
+    with _open(args.output, "w") as out:
+        for result in run_batch(
+            catalog, items, args.chunk_size, with_stats=args.stats
+        ):
+            if "error" in result:
+                counts["malformed"] += 1
+            elif result["is_valid"]:
+                counts["valid"] += 1
+                if args.invalid_only:
+                    continue
+            else:
+                counts["invalid"] += 1
+            out.write(json.dumps(result) + "\n")
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"{len(decklists)} decklists in {elapsed:.3f}s: {counts['valid']} valid, "
+        f"{counts['invalid']} invalid, {counts['malformed']} malformed lines"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="NDJSON file of decklists, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output file (default stdout)")
+    parser.add_argument(
+        "--stats", action=argparse.BooleanOptionalAction, default=True,
+        help="Include deck stats in each result",
+    )
+    parser.add_argument(
+        "--invalid-only", action="store_true", help="Only write decks that fail validation"
+    )
+    parser.add_argument("--chunk-size", type=int, default=settings.deck_batch_chunk_size)
+    asyncio.run(main(parser.parse_args()))